@@ -0,0 +1,177 @@
+"""
+File: rlcard29/agents/batched_inference.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Batched policy inference for many concurrent 29 games.
+# A network forward pass costs about the same for 1 row as for a few hundred on CPU, so
+# InferenceServer gathers the pending decisions of many in-flight games and runs one
+# predict call per batch. Games are either rows of a SubprocVectorEnv (act) or TwentyNineEnv
+# rounds driven from threads whose BatchedAgent seats submit to the server.
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, LEGAL_OFFSET, BID_OFFSET
+
+def predict_fn_from_agent(agent):
+    """Batch predict function of a trained agent: rlcard DQNAgent (Q-values) or NFSPAgent (average policy)."""
+    if hasattr(agent, 'q_estimator'):
+        return agent.q_estimator.predict_nograd
+    if hasattr(agent, 'policy_network'):
+        import torch
+
+        def predict(obs):
+            with torch.no_grad():
+                tensor = torch.from_numpy(np.asarray(obs, dtype=np.float32)).to(agent.device)
+                return agent.policy_network(tensor).cpu().numpy()
+        return predict
+    raise ValueError(f"No batch predict function for {type(agent).__name__}; pass predict_fn directly")
+
+def masked_argmax(scores, mask):
+    """Best legal action of every row of (N, 51) scores under the (N, 51) legal-action mask."""
+    return np.where(mask.astype(bool), scores, -np.inf).argmax(axis=1)
+
+class InferenceServer:
+    """
+    Runs predict_fn(obs) -> (N, 51) scores on batches of pending decisions.
+
+    submit() queues one decision and returns a Future of its action id. A background thread
+    runs a batch once max_batch_size decisions are pending or the oldest one has waited
+    max_latency seconds, then scatters the masked-argmax actions back.
+    """
+    def __init__(self, predict_fn, max_batch_size=256, max_latency=0.002):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.num_batches = 0
+        self.num_decisions = 0
+        self._pending = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def act(self, obs, action_mask=None, epsilon=0.0, np_random=None):
+        """
+        Synchronous batched actions for (N, 128) observations, e.g. SubprocVectorEnv.obs,
+        split into chunks of max_batch_size. The mask defaults to the one inside obs. With
+        epsilon > 0 each row takes a uniformly random legal action drawn from np_random with
+        that probability (epsilon-greedy collection).
+        """
+        if action_mask is None:
+            action_mask = obs[:, LEGAL_OFFSET:BID_OFFSET]
+        actions = np.empty(len(obs), dtype=np.int64)
+        for start in range(0, len(obs), self.max_batch_size):
+            stop = start + self.max_batch_size
+            scores = self.predict_fn(obs[start:stop])
+            actions[start:stop] = masked_argmax(scores, action_mask[start:stop])
+            self.num_batches += 1
+        self.num_decisions += len(obs)
+        if epsilon > 0:
+            np_random = np_random if np_random is not None else np.random
+            explore = np_random.random_sample(len(obs)) < epsilon
+            if explore.any():
+                random_scores = np_random.random_sample((int(explore.sum()), action_mask.shape[1]))
+                actions[explore] = masked_argmax(random_scores, action_mask[explore])
+        return actions
+
+    def submit(self, obs, action_mask=None):
+        """Queue one (128,) observation; returns a Future of the chosen action id."""
+        if action_mask is None:
+            action_mask = obs[LEGAL_OFFSET:BID_OFFSET]
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("InferenceServer is closed")
+            self._pending.append((time.perf_counter(), obs, action_mask, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._condition.notify()
+        return future
+
+    def _serve(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending[0][0] + self.max_latency
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            try:
+                obs = np.stack([item[1] for item in batch])
+                mask = np.stack([item[2] for item in batch])
+                actions = masked_argmax(self.predict_fn(obs), mask)
+            except Exception as error:
+                for item in batch:
+                    item[3].set_exception(error)
+                continue
+            self.num_batches += 1
+            self.num_decisions += len(batch)
+            for item, action in zip(batch, actions):
+                item[3].set_result(int(action))
+
+    def close(self):
+        """Finish the pending decisions and stop the server thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class BatchedAgent:
+    """
+    Agent whose decisions go through an InferenceServer; one instance can sit in the seats of
+    many envs played from different threads. eval_step is greedy; step plays a uniformly
+    random legal action with probability epsilon (set it from the training schedule) and is
+    greedy otherwise.
+    """
+    def __init__(self, server, num_actions=len(ACTION_LIST), epsilon=0.0, seed=None):
+        self.use_raw = False
+        self.server = server
+        self.num_actions = num_actions
+        self.epsilon = epsilon
+        self.np_random = np.random.RandomState(seed)
+
+    def step(self, state):
+        if self.epsilon > 0 and self.np_random.random_sample() < self.epsilon:
+            legal_actions = list(state['legal_actions'])
+            return legal_actions[self.np_random.randint(len(legal_actions))]
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        return self.server.submit(state['obs'], state['action_mask']).result(), {}
+
+def _play_rounds(env, num_rounds):
+    """Play num_rounds rounds in env with its agents' eval_step; returns summed payoffs."""
+    totals = np.zeros(env.num_players)
+    for _ in range(num_rounds):
+        state, player_id = env.reset()
+        while not env.is_over():
+            action, _ = env.agents[player_id].eval_step(state)
+            state, player_id = env.step(action)
+        totals += env.get_payoffs()
+    return totals
+
+def batched_tournament(envs, num_rounds):
+    """
+    Play num_rounds rounds spread over envs, one thread per env, so BatchedAgent seats see
+    many pending decisions at once. Returns the average payoff of every seat.
+    """
+    shares = [num_rounds // len(envs) + (i < num_rounds % len(envs)) for i in range(len(envs))]
+    with ThreadPoolExecutor(len(envs)) as pool:
+        totals = sum(pool.map(_play_rounds, envs, shares))
+    return [float(total) / num_rounds for total in totals]
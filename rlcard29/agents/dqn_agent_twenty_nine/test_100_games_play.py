@@ -7,6 +7,7 @@ Date: 2025-06-28
 import rlcard
 from rlcard.agents import RandomAgent, DQNAgent
 import rlcard29
+from rlcard29.games.twenty_nine.encoding import check_encoding_version
 import time
 import os
 import sys
@@ -67,17 +68,16 @@ if __name__ == '__main__':
 
         try:
             checkpoint = torch.load(model_path, weights_only=True, map_location=device)
-            dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
-            print("DQN agent loaded successfully")
         except Exception as e:
             print(f"Error loading checkpoint with weights_only=True: {e}")
             try:
                 checkpoint = torch.load(model_path, weights_only=False, map_location=device)
-                dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
-                print("DQN agent loaded with weights_only=False")
             except Exception as e2:
                 print(f"Failed to load checkpoint: {e2}")
                 raise
+        check_encoding_version(checkpoint)
+        dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
+        print("DQN agent loaded successfully")
         env.set_agents([
             dqn_agent,
             RandomAgent(num_actions=env.action_num),
@@ -0,0 +1,324 @@
+"""
+File: rlcard29/agents/ismcts_agent_twenty_nine/ismcts_agent.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Single-observer information-set MCTS agent for the 29 card game.
+# Every iteration samples a deal consistent with what the agent has seen
+# (DeterminizationSampler), restores it into a TwentyNineGame without logging and walks
+# one shared tree, choosing only among actions legal in that deal (UCB with availability
+# counts). Leaves are finished with a cheap default policy and every node on the path is
+# credited with the round payoff of the player who moved into it.
+#
+# The tree is kept between moves of a round and re-rooted on the actions seen since.
+# With num_workers > 1 extra processes search independent trees from the same position
+# and their root visit counts are added to the agent's own (root parallelism).
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from rlcard29.games.twenty_nine import DeterminizationSampler
+from rlcard29.games.twenty_nine.bitboard import CARD_INDEX, NUM_CARDS, SUIT_MASKS, mask_to_indices
+from rlcard29.games.twenty_nine.encoding import ACTION_IDS, ACTION_LIST, PASS_ACTION, TRUMP_ACTION_OFFSET
+from rlcard29.games.twenty_nine.encoding import action_mask_to_ids
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+from rlcard29.games.twenty_nine.utils import SUITS
+
+_SAMPLE_BATCH = 64
+_NO_PAYOFFS = (0, 0, 0, 0)
+
+class _Node:
+    __slots__ = ('player_id', 'children', 'visits', 'value', 'available')
+
+    def __init__(self, player_id):
+        self.player_id = player_id # Player who moved into this node
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+        self.available = 0
+
+class ISMCTSSearch:
+    """
+    One search tree for one agent seat, reused across the searches of a round.
+
+    Args:
+        exploration (float): UCB exploration constant
+        seed (int): seed for determinizations, tree policy and rollouts
+    """
+    def __init__(self, exploration=0.7, seed=None):
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.np_random = np.random.RandomState(self.rng.getrandbits(31))
+        self.game = TwentyNineGame(event_log=NullEventLog(), np_random=self.np_random)
+        self.root = None
+        self._root_history = None
+        self._root_cards = 0
+
+    def search(self, state, trump_suit=None, num_iterations=None, time_limit=None):
+        """
+        Search from a raw TwentyNineGame state and return {action_id: root visits}.
+        trump_suit is the agent's own trump while it is unrevealed, if the agent holds the bid.
+        Stops after num_iterations or time_limit seconds, whichever comes first.
+        """
+        self._set_root(state, trump_suit)
+        sampler = DeterminizationSampler.from_state(state, trump_suit, self.np_random)
+        template = _public_snapshot(state)
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        iterations = 0
+        while ((num_iterations is None or iterations < num_iterations)
+               and (deadline is None or time.perf_counter() < deadline)):
+            hands, trumps = sampler.sample(_SAMPLE_BATCH)
+            for hand_masks, trump in zip(hands.tolist(), trumps.tolist()):
+                self._iterate(_determinize(template, state, hand_masks, trump, self.rng))
+                iterations += 1
+                if num_iterations is not None and iterations >= num_iterations:
+                    break
+        return {action_id: child.visits for action_id, child in self.root.children.items()}
+
+    def _set_root(self, state, trump_suit):
+        # Reuse the subtree reached by the actions seen since the last search of this round
+        history = _action_history(state, trump_suit)
+        own_cards = _own_round_cards(state)
+        node = None
+        if (self.root is not None and own_cards & self._root_cards == self._root_cards
+                and history[:len(self._root_history)] == self._root_history):
+            node = self.root
+            for action_id in history[len(self._root_history):]:
+                node = None if action_id is None else node.children.get(action_id)
+                if node is None:
+                    break
+        self.root = node if node is not None else _Node(None)
+        self._root_history = history
+        self._root_cards = own_cards
+
+    def _iterate(self, snapshot):
+        game = self.game
+        game.restore(snapshot)
+        rng = self.rng
+        exploration = self.exploration
+        node = self.root
+        path = []
+        live = True # False once the round ends in a redeal
+        # Selection, until a move not tried yet is expanded
+        while live and game.phase != 'end':
+            legal = action_mask_to_ids(game.get_legal_action_mask())
+            children = node.children
+            untried = []
+            for action_id in legal:
+                child = children.get(action_id)
+                if child is None:
+                    untried.append(action_id)
+                else:
+                    child.available += 1
+            if untried:
+                action_id = rng.choice(untried)
+                node = children[action_id] = _Node(game.current_player)
+                node.available = 1
+                path.append(node)
+                live = _apply(game, action_id)
+                break
+            best_score = -math.inf
+            for action_id in legal:
+                child = children[action_id]
+                score = (child.value / child.visits
+                         + exploration * math.sqrt(math.log(child.available) / child.visits))
+                if score > best_score:
+                    best_score, node, best_action = score, child, action_id
+            path.append(node)
+            live = _apply(game, best_action)
+        # Simulation
+        while live and game.phase != 'end':
+            live = _apply(game, _default_action(game, rng))
+        payoffs = game.get_payoffs() if live else _NO_PAYOFFS
+        for child in path:
+            child.visits += 1
+            child.value += payoffs[child.player_id]
+
+def _apply(game, action_id):
+    """Step the game; False when the round ended in a redeal."""
+    game.step(ACTION_LIST[action_id])
+    return not (game.phase == 'bidding' and not game.bid_history)
+
+def _default_action(game, rng):
+    if game.phase == 'play':
+        return rng.choice(mask_to_indices(game.get_legal_card_mask()))
+    if game.phase == 'bidding':
+        # Open at the minimum half of the time, then mostly pass
+        if rng.random() < (0.5 if game.bid_winner is None else 0.8) or game.bid_value >= 29:
+            return PASS_ACTION
+        return ACTION_IDS[str(game.bid_value + 1)]
+    # Trump: the suit with most cards in hand
+    hand_mask = game.players[game.current_player].hand_mask
+    counts = [(hand_mask & SUIT_MASKS[s]).bit_count() for s in range(len(SUITS))]
+    return TRUMP_ACTION_OFFSET + counts.index(max(counts))
+
+def _action_history(state, trump_suit):
+    """Action ids seen so far this round; an opponent's hidden trump choice is None."""
+    history = [PASS_ACTION if bid == 'pass' else ACTION_IDS[str(bid)] for _, bid in state['bid_history']]
+    if state['phase'] == 'play':
+        trump = state['trump_suit'] or trump_suit
+        history.append(None if trump is None else ACTION_IDS[trump])
+        for trick, _, _ in state['trick_history']:
+            history.extend(CARD_INDEX[card] for _, card in trick)
+        history.extend(CARD_INDEX[card] for _, card in state['trick'])
+    return tuple(history)
+
+def _own_round_cards(state):
+    player_id = state['player_id']
+    mask = 0
+    for card in state['hand']:
+        mask |= 1 << CARD_INDEX[card]
+    for trick, _, _ in state['trick_history']:
+        for seat, card in trick:
+            if seat == player_id:
+                mask |= 1 << CARD_INDEX[card]
+    for seat, card in state['trick']:
+        if seat == player_id:
+            mask |= 1 << CARD_INDEX[card]
+    return mask
+
+def _public_snapshot(state):
+    """Public part of a TwentyNineGame snapshot rebuilt from a raw state."""
+    bid_history = tuple(state['bid_history'])
+    trick_history = tuple(state['trick_history'])
+    trick = tuple(state['trick'])
+    first_player = bid_history[0][0] if bid_history else state['player_id']
+    if trick:
+        trick_leader = trick[0][0]
+    elif trick_history:
+        trick_leader = trick_history[-1][1]
+    else:
+        trick_leader = first_player
+    played_mask = 0
+    team_points = [0, 0]
+    for past_trick, winner_id, points in trick_history:
+        team_points[winner_id % 2] += points
+        for _, card in past_trick:
+            played_mask |= 1 << CARD_INDEX[card]
+    for _, card in trick:
+        played_mask |= 1 << CARD_INDEX[card]
+    return {
+        'dealer_id': (first_player - 1) % 4, 'match_scores': tuple(state['match_scores']),
+        'bid_history': bid_history, 'trick': trick, 'trick_leader': trick_leader,
+        'trick_history': trick_history, 'played_mask': played_mask, 'team_points': tuple(team_points),
+    }
+
+def _determinize(template, state, hand_masks, trump, rng):
+    """Build a TwentyNineGame snapshot for one sampled deal."""
+    phase = state['phase']
+    deck = list(range(NUM_CARDS))
+    top = 0
+    hands = hand_masks
+    if phase != 'play':
+        # Hold back 4 cards per seat for the second deal, dealt from the end of the deck
+        own_id = state['player_id']
+        own_first = 0
+        for card in state['hand']:
+            own_first |= 1 << CARD_INDEX[card]
+        hands, second = [], []
+        for player_id, hand_mask in enumerate(hand_masks):
+            cards = mask_to_indices(hand_mask)
+            if player_id == own_id:
+                first = [c for c in cards if own_first >> c & 1]
+                later = [c for c in cards if not own_first >> c & 1]
+            else:
+                rng.shuffle(cards)
+                first, later = cards[:4], cards[4:]
+            hands.append(sum(1 << c for c in first))
+            second.append(later)
+        top = 16
+        undealt = [card for later in reversed(second) for card in later]
+        undealt_mask = sum(1 << card for card in undealt)
+        deck = undealt + [card for card in deck if not undealt_mask >> card & 1]
+    trump_suit = None if phase != 'play' else SUITS[trump]
+    trump_revealed = state['trump_suit'] is not None
+    return (tuple(hands), tuple(deck), top, template['dealer_id'], template['match_scores'],
+            template['bid_history'], state['bid_value'], state['bid_winner'], trump_suit, trump_revealed,
+            phase, state['player_id'], template['trick'], template['trick_leader'],
+            template['trick_history'], template['played_mask'], template['team_points'])
+
+def _search_worker(args):
+    state, trump_suit, num_iterations, time_limit, exploration, seed = args
+    return ISMCTSSearch(exploration, seed).search(state, trump_suit, num_iterations, time_limit)
+
+class ISMCTSAgent:
+    """
+    Information-set MCTS agent for TwentyNineEnv.
+
+    Args:
+        num_actions (int): size of the action space
+        num_iterations (int): iterations per decision (default 1000 when time_limit is None)
+        time_limit (float): seconds per decision; the search stops at whichever budget ends first
+        num_workers (int): processes searching in parallel, including this one
+        exploration (float): UCB exploration constant
+        seed (int): random seed
+
+    With num_workers > 1 call close(), or use the agent as a context manager, to stop the pool.
+    """
+    def __init__(self, num_actions, num_iterations=None, time_limit=None, num_workers=1,
+                 exploration=0.7, seed=None):
+        self.use_raw = False
+        self.num_actions = num_actions
+        self.num_iterations = 1000 if num_iterations is None and time_limit is None else num_iterations
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.exploration = exploration
+        self._seeds = random.Random(seed)
+        self.searcher = ISMCTSSearch(exploration, self._seeds.getrandbits(63))
+        self._pool = None
+
+    def step(self, state):
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        raw_state = state['raw_obs']
+        legal_actions = list(state['legal_actions'])
+        if len(legal_actions) == 1:
+            return legal_actions[0], {}
+        # The bid winner's own trump, also when it was chosen outside the agent (e.g. a trump_policy)
+        visits = self._search(raw_state, raw_state.get('own_trump'))
+        total = sum(visits.get(action_id, 0) for action_id in legal_actions) or 1
+        action = max(legal_actions, key=lambda action_id: visits.get(action_id, 0))
+        info = {'probs': {ACTION_LIST[a]: visits.get(a, 0) / total for a in legal_actions}}
+        return action, info
+
+    def _search(self, raw_state, trump_suit):
+        if self.num_workers <= 1:
+            return self.searcher.search(raw_state, trump_suit, self.num_iterations, self.time_limit)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.num_workers - 1)
+        portable = _portable_state(raw_state)
+        per_worker = None if self.num_iterations is None else -(-self.num_iterations // self.num_workers)
+        futures = [self._pool.submit(_search_worker, (portable, trump_suit, per_worker, self.time_limit,
+                                                      self.exploration, self._seeds.getrandbits(63)))
+                   for _ in range(self.num_workers - 1)]
+        visits = dict(self.searcher.search(raw_state, trump_suit, per_worker, self.time_limit))
+        for future in futures:
+            for action_id, count in future.result().items():
+                visits[action_id] = visits.get(action_id, 0) + count
+        return visits
+
+    def close(self):
+        """Shut down the worker processes of num_workers > 1."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown(wait=False)
+
+def _portable_state(state):
+    keys = ('player_id', 'hand', 'phase', 'bid_value', 'bid_winner', 'bid_history', 'trick',
+            'trick_history', 'trump_suit', 'match_scores')
+    return {key: state[key] for key in keys}
@@ -0,0 +1,416 @@
+"""
+File: rlcard29/agents/mccfr_agent_twenty_nine/mccfr_agent.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# External-sampling Monte Carlo CFR for the bidding and trump-selection phases of 29.
+#
+# Abstraction:
+#   - bidding infosets: canonical 4-card hand (suit isomorphism), current bid value, seat
+#     of the current bid holder relative to the player, passes since the last bid and
+#     seat relative to the dealer, packed into one integer
+#   - bidding actions: pass or raise the bid by 1, 2, 3 or 5 (up to 29)
+#   - trump infosets: canonical hand and bid value; actions are canonical suits
+#   - the play phase is not learned: every sampled deal is played out with random legal
+#     moves in VectorTwentyNineGame for each trump suit, and a bid is worth the expected
+#     round payoff of its team given those playouts
+#
+# Regrets and average-strategy sums live in growable NumPy tables indexed through a
+# key -> row dict. Multiprocess training runs in epochs: workers memory-map the last
+# checkpoint, train on private copies and send back regret / strategy deltas, which the
+# trainer adds up. Checkpoints are plain .npy files with sorted keys, so MCCFRAgent can
+# memory-map them and look infosets up with a binary search.
+
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from rlcard29.games.twenty_nine.canonical import canonical_hand, canonical_index, inverse_permutation
+from rlcard29.games.twenty_nine.bitboard import CARD_INDEX
+from rlcard29.games.twenty_nine.dealer import shuffled_decks
+from rlcard29.games.twenty_nine.encoding import ACTION_IDS, ACTION_LIST, PASS_ACTION, TRUMP_ACTION_OFFSET
+from rlcard29.games.twenty_nine.utils import SUITS
+from rlcard29.games.twenty_nine.vector_game import VectorTwentyNineGame
+
+BID_RAISES = (1, 2, 3, 5)
+NUM_BID_ACTIONS = 1 + len(BID_RAISES) # pass, then each raise
+NUM_TRUMP_ACTIONS = len(SUITS)
+MAX_BID = 29
+_BID_VALUES = 15 # bid_value 15 (no bid) .. 29
+_TABLES = ('bidding', 'trump')
+
+def bidding_key(player_id, dealer_id, hand_mask, bid_value, bid_winner, bid_history):
+    """Integer key of a bidding infoset; bid_history is a sequence of (player_id, bid or 'pass')."""
+    holder = 0 if bid_winner is None else (bid_winner - player_id) % 4
+    passes = 0
+    for _, bid in reversed(bid_history):
+        if bid != 'pass':
+            break
+        passes += 1
+    return _pack_bidding_key(canonical_index(hand_mask), bid_value, holder, min(passes, 3),
+                             (player_id - dealer_id) % 4)
+
+def _pack_bidding_key(canonical, bid_value, holder, passes, seat):
+    return (((canonical * _BID_VALUES + bid_value - 15) * 4 + holder) * 4 + passes) * 4 + seat
+
+def trump_key(hand_mask, bid_value):
+    """Integer key of a trump-selection infoset; returns (key, perm) with perm the canonical suit map."""
+    _, perm = canonical_hand(hand_mask)
+    return canonical_index(hand_mask) * _BID_VALUES + bid_value - 15, perm
+
+def legal_bid_actions(bid_value):
+    """Abstract bidding actions legal over bid_value: 0 is pass, i > 0 raises by BID_RAISES[i - 1]."""
+    return [0] + [i + 1 for i, raise_by in enumerate(BID_RAISES) if bid_value + raise_by <= MAX_BID]
+
+def bid_action_id(abstract_action, bid_value):
+    """Env action id of an abstract bidding action."""
+    if abstract_action == 0:
+        return PASS_ACTION
+    return ACTION_IDS[str(bid_value + BID_RAISES[abstract_action - 1])]
+
+def _regret_matching(regrets, legal):
+    positive = [max(regrets[a], 0.0) for a in legal]
+    total = sum(positive)
+    if total > 0:
+        return [p / total for p in positive]
+    return [1.0 / len(legal)] * len(legal)
+
+class RegretTable:
+    """Growable regret and strategy-sum arrays with an integer key -> row index."""
+    def __init__(self, num_actions, capacity=1024):
+        self.num_actions = num_actions
+        self.index = {}
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self.regrets = np.zeros((capacity, num_actions), dtype=np.float64)
+        self.strategy_sums = np.zeros((capacity, num_actions), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.index)
+
+    def row(self, key):
+        row = self.index.get(key)
+        if row is None:
+            row = self.index[key] = len(self.index)
+            if row == len(self.keys):
+                self._grow()
+            self.keys[row] = key
+        return row
+
+    def _grow(self):
+        capacity = 2 * len(self.keys)
+        self.keys = np.resize(self.keys, capacity)
+        for name in ('regrets', 'strategy_sums'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, self.num_actions), dtype=np.float64)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, keys, regrets, strategy_sums):
+        """Add deltas for the given keys, creating rows as needed."""
+        rows = np.array([self.row(int(key)) for key in keys], dtype=np.int64)
+        np.add.at(self.regrets, rows, regrets)
+        np.add.at(self.strategy_sums, rows, strategy_sums)
+
+    def copy(self):
+        table = RegretTable(self.num_actions, max(len(self.keys), 1))
+        table.index = dict(self.index)
+        table.keys[:] = self.keys
+        table.regrets[:] = self.regrets
+        table.strategy_sums[:] = self.strategy_sums
+        return table
+
+    def save(self, path, name):
+        size = len(self.index)
+        order = np.argsort(self.keys[:size], kind='stable')
+        np.save(os.path.join(path, f'{name}_keys.npy'), self.keys[:size][order])
+        np.save(os.path.join(path, f'{name}_regrets.npy'), self.regrets[:size][order])
+        np.save(os.path.join(path, f'{name}_strategy.npy'), self.strategy_sums[:size][order])
+
+    @classmethod
+    def load(cls, path, name, num_actions):
+        keys = np.load(os.path.join(path, f'{name}_keys.npy'), mmap_mode='r')
+        table = cls(num_actions, max(len(keys), 1))
+        table.keys[:len(keys)] = keys
+        table.regrets[:len(keys)] = np.load(os.path.join(path, f'{name}_regrets.npy'), mmap_mode='r')
+        table.strategy_sums[:len(keys)] = np.load(os.path.join(path, f'{name}_strategy.npy'), mmap_mode='r')
+        table.index = {int(key): row for row, key in enumerate(keys.tolist())}
+        return table
+
+class MCCFRTrainer:
+    """
+    External-sampling MCCFR over the abstracted bidding and trump-selection game.
+
+    Args:
+        seed (int): random seed
+        deal_batch (int): deals generated (and played out) at once
+        playouts (int): random playouts per deal and trump suit
+    """
+    def __init__(self, seed=None, deal_batch=256, playouts=4):
+        self.rng = random.Random(seed)
+        self.np_random = np.random.RandomState(self.rng.getrandbits(31))
+        self.deal_batch = deal_batch
+        self.playouts = playouts
+        self.tables = {'bidding': RegretTable(NUM_BID_ACTIONS), 'trump': RegretTable(NUM_TRUMP_ACTIONS)}
+        self.iterations = 0
+        self._playout_game = VectorTwentyNineGame(4 * playouts * deal_batch,
+                                                  np_random=np.random.RandomState(self.rng.getrandbits(31)))
+
+    def iterate(self, num_iterations):
+        """Run num_iterations sampled deals, traversing once for every seat on each."""
+        done = 0
+        while done < num_iterations:
+            batch = min(self.deal_batch, num_iterations - done)
+            decks, dealers, success = self._sample_deals(batch)
+            for deck, dealer_id, bid_success in zip(decks, dealers, success):
+                self._set_deal(deck, dealer_id)
+                self._bid_success = bid_success
+                for traverser in range(4):
+                    self._traverse(traverser)
+            done += batch
+        self.iterations += num_iterations
+
+    def _sample_deals(self, batch):
+        """Shuffle decks and estimate, for every trump suit, how often each team reaches every bid."""
+        decks = shuffled_decks(self.np_random, batch).astype(np.int64)
+        dealers = self.np_random.randint(4, size=batch)
+        bits = np.int64(1) << decks
+        hands = np.zeros((batch, 4), dtype=np.int64)
+        for player_id in range(4):
+            # deal() gives each player 4 cards from the end of the deck, twice
+            first = bits[:, 28 - 4 * player_id:32 - 4 * player_id]
+            second = bits[:, 12 - 4 * player_id:16 - 4 * player_id]
+            hands[:, player_id] = first.sum(axis=1) + second.sum(axis=1)
+
+        repeats = 4 * self.playouts
+        game = self._playout_game
+        num_games = batch * repeats
+        if len(game.hands) != num_games:
+            game = VectorTwentyNineGame(num_games, np_random=game.np_random)
+        trumps = np.tile(np.repeat(np.arange(4), self.playouts), batch)
+        game.reset()
+        _, legal_mask, _ = game.start_play(np.repeat(hands, repeats, axis=0), trumps, 0, 16,
+                                           np.repeat((dealers + 1) % 4, repeats))
+        for _ in range(32):
+            actions = np.argmax(self.np_random.random_sample(legal_mask.shape) * legal_mask, axis=1)
+            _, legal_mask, _, _, _ = game.step(actions)
+        points = game.final_team_points.reshape(batch, 4, self.playouts, 2)
+        # success[i, trump, team, bid - 15]: share of playouts where team took at least bid points
+        bids = np.arange(15, MAX_BID + 1)
+        success = (points[..., None] >= bids).mean(axis=2)
+        return decks, dealers, success
+
+    def _set_deal(self, deck, dealer_id):
+        self._dealer_id = int(dealer_id)
+        self._canonical, self._trump_keys, self._trump_suits = [], [], []
+        for player_id in range(4):
+            hand_mask = 0
+            for card_index in deck[28 - 4 * player_id:32 - 4 * player_id].tolist():
+                hand_mask |= 1 << card_index
+            key, perm = trump_key(hand_mask, 15)
+            self._canonical.append(canonical_index(hand_mask))
+            self._trump_keys.append(key)
+            self._trump_suits.append(inverse_permutation(perm))
+
+    def _traverse(self, traverser):
+        return self._bid(traverser, (self._dealer_id + 1) % 4, 15, None, 0, 0)
+
+    def _bid(self, traverser, player_id, bid_value, bid_winner, passes, num_actions):
+        table = self.tables['bidding']
+        holder = 0 if bid_winner is None else (bid_winner - player_id) % 4
+        row = table.row(_pack_bidding_key(self._canonical[player_id], bid_value, holder, passes,
+                                          (player_id - self._dealer_id) % 4))
+        legal = legal_bid_actions(bid_value)
+        sigma = _regret_matching(table.regrets[row], legal)
+        if player_id == traverser:
+            values = [self._after_bid(traverser, player_id, a, bid_value, bid_winner, passes, num_actions)
+                      for a in legal]
+            return self._update_regrets(table, row, legal, sigma, values)
+        self._update_strategy(table, row, legal, sigma)
+        action = legal[self.rng.choices(range(len(legal)), weights=sigma)[0]]
+        return self._after_bid(traverser, player_id, action, bid_value, bid_winner, passes, num_actions)
+
+    def _after_bid(self, traverser, player_id, action, bid_value, bid_winner, passes, num_actions):
+        # Same end-of-bidding rules as TwentyNineGame._step_bidding
+        num_actions += 1
+        if action == 0:
+            passes += 1
+        else:
+            bid_value += BID_RAISES[action - 1]
+            bid_winner = player_id
+            passes = 0
+        if bid_winner is None:
+            if num_actions == 4: # Everyone passed: redeal, worth 0
+                return 0.0
+        elif passes == 3:
+            return self._choose_trump(traverser, bid_winner, bid_value)
+        return self._bid(traverser, (player_id + 1) % 4, bid_value, bid_winner, passes, num_actions)
+
+    def _choose_trump(self, traverser, bid_winner, bid_value):
+        table = self.tables['trump']
+        row = table.row(self._trump_keys[bid_winner] + bid_value - 15)
+        legal = list(range(NUM_TRUMP_ACTIONS))
+        sigma = _regret_matching(table.regrets[row], legal)
+        suits = self._trump_suits[bid_winner]
+        team = bid_winner % 2
+        success = self._bid_success[:, team, bid_value - 15]
+        sign = 1.0 if traverser % 2 == team else -1.0
+        if bid_winner == traverser:
+            values = [sign * (2.0 * success[suits[a]] - 1.0) for a in legal]
+            return self._update_regrets(table, row, legal, sigma, values)
+        self._update_strategy(table, row, legal, sigma)
+        action = self.rng.choices(legal, weights=sigma)[0]
+        return sign * (2.0 * success[suits[action]] - 1.0)
+
+    @staticmethod
+    def _update_regrets(table, row, legal, sigma, values):
+        node_value = sum(s * v for s, v in zip(sigma, values))
+        regrets = table.regrets[row]
+        for a, value in zip(legal, values):
+            regrets[a] += value - node_value
+        return node_value
+
+    @staticmethod
+    def _update_strategy(table, row, legal, sigma):
+        strategy_sums = table.strategy_sums[row]
+        for a, s in zip(legal, sigma):
+            strategy_sums[a] += s
+
+    def train(self, num_iterations, num_workers=1, epoch_iterations=10000, checkpoint_dir=None, verbose=False):
+        """
+        Train for num_iterations deals. With num_workers > 1 every epoch splits epoch_iterations
+        over worker processes that start from the last checkpoint in checkpoint_dir.
+        """
+        if num_workers <= 1:
+            while num_iterations > 0:
+                step = min(epoch_iterations, num_iterations)
+                self.iterate(step)
+                num_iterations -= step
+                if checkpoint_dir is not None:
+                    self.save(checkpoint_dir)
+                if verbose:
+                    print(f"Iterations: {self.iterations}, infosets: {self.num_infosets()}")
+            return
+        if checkpoint_dir is None:
+            raise ValueError("Multiprocess training needs a checkpoint_dir to share tables")
+        with ProcessPoolExecutor(num_workers) as pool:
+            while num_iterations > 0:
+                step = min(epoch_iterations, num_iterations)
+                self.save(checkpoint_dir)
+                shares = [step // num_workers + (i < step % num_workers) for i in range(num_workers)]
+                tasks = [(checkpoint_dir, share, self.rng.getrandbits(63), self.deal_batch, self.playouts)
+                         for share in shares if share]
+                for deltas in pool.map(_train_worker, tasks):
+                    for name in _TABLES:
+                        self.tables[name].add(*deltas[name])
+                self.iterations += step
+                num_iterations -= step
+                if verbose:
+                    print(f"Iterations: {self.iterations}, infosets: {self.num_infosets()}")
+            self.save(checkpoint_dir)
+
+    def num_infosets(self):
+        return sum(len(table) for table in self.tables.values())
+
+    def save(self, path):
+        """Write a checkpoint directory that MCCFRAgent can memory-map."""
+        os.makedirs(path, exist_ok=True)
+        for name in _TABLES:
+            self.tables[name].save(path, name)
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'iterations': self.iterations, 'bid_raises': BID_RAISES}, f)
+
+    def load(self, path):
+        """Resume from a checkpoint written by save()."""
+        self.tables = {'bidding': RegretTable.load(path, 'bidding', NUM_BID_ACTIONS),
+                       'trump': RegretTable.load(path, 'trump', NUM_TRUMP_ACTIONS)}
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.iterations = json.load(f)['iterations']
+
+def _train_worker(args):
+    checkpoint_dir, num_iterations, seed, deal_batch, playouts = args
+    trainer = MCCFRTrainer(seed, deal_batch, playouts)
+    trainer.load(checkpoint_dir)
+    base = {name: trainer.tables[name].copy() for name in _TABLES}
+    trainer.iterate(num_iterations)
+    deltas = {}
+    for name in _TABLES:
+        table, start = trainer.tables[name], base[name]
+        size, known = len(table), len(start)
+        regrets = table.regrets[:size].copy()
+        strategy_sums = table.strategy_sums[:size].copy()
+        regrets[:known] -= start.regrets[:known]
+        strategy_sums[:known] -= start.strategy_sums[:known]
+        deltas[name] = (table.keys[:size].copy(), regrets, strategy_sums)
+    return deltas
+
+class MCCFRAgent:
+    """
+    Plays bidding and trump selection from the average strategy of an MCCFR checkpoint
+    and hands play-phase decisions to play_agent (uniformly random legal cards if None).
+
+    Args:
+        num_actions (int): size of the action space
+        checkpoint_dir (str): directory written by MCCFRTrainer.save
+        play_agent: agent with eval_step used in the play phase
+        greedy (bool): take the most likely action instead of sampling
+        seed (int): random seed
+    """
+    def __init__(self, num_actions, checkpoint_dir, play_agent=None, greedy=False, seed=None):
+        self.use_raw = False
+        self.num_actions = num_actions
+        self.play_agent = play_agent
+        self.greedy = greedy
+        self.rng = random.Random(seed)
+        self.tables = {}
+        for name in _TABLES:
+            self.tables[name] = (np.load(os.path.join(checkpoint_dir, f'{name}_keys.npy'), mmap_mode='r'),
+                                 np.load(os.path.join(checkpoint_dir, f'{name}_strategy.npy'), mmap_mode='r'))
+
+    def step(self, state):
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        raw_state = state['raw_obs']
+        phase = raw_state['phase']
+        if phase == 'play' or phase == 'end':
+            if self.play_agent is not None:
+                return self.play_agent.eval_step(state)
+            return self.rng.choice(list(state['legal_actions'])), {}
+
+        player_id = raw_state['player_id']
+        hand_mask = 0
+        for card in raw_state['hand']:
+            hand_mask |= 1 << CARD_INDEX[card]
+        bid_value = raw_state['bid_value']
+        if phase == 'bidding':
+            bid_history = raw_state['bid_history']
+            first_player = bid_history[0][0] if bid_history else player_id
+            key = bidding_key(player_id, (first_player - 1) % 4, hand_mask, bid_value,
+                              raw_state['bid_winner'], bid_history)
+            legal = legal_bid_actions(bid_value)
+            action_ids = [bid_action_id(a, bid_value) for a in legal]
+            probs = self._policy('bidding', key, legal)
+        else:
+            key, perm = trump_key(hand_mask, bid_value)
+            inverse = inverse_permutation(perm)
+            legal = list(range(NUM_TRUMP_ACTIONS))
+            action_ids = [TRUMP_ACTION_OFFSET + inverse[a] for a in legal]
+            probs = self._policy('trump', key, legal)
+        if self.greedy:
+            choice = max(range(len(legal)), key=probs.__getitem__)
+        else:
+            choice = self.rng.choices(range(len(legal)), weights=probs)[0]
+        info = {'probs': {ACTION_LIST[a]: p for a, p in zip(action_ids, probs)}}
+        return action_ids[choice], info
+
+    def _policy(self, name, key, legal):
+        keys, strategy_sums = self.tables[name]
+        row = int(np.searchsorted(keys, key))
+        if row < len(keys) and keys[row] == key:
+            sums = [float(strategy_sums[row, a]) for a in legal]
+            total = sum(sums)
+            if total > 0:
+                return [s / total for s in sums]
+        return [1.0 / len(legal)] * len(legal)
@@ -0,0 +1,10 @@
+"""
+File: rlcard29/benchmarks/__init__.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Performance benchmarks for rlcard29: python -m rlcard29.benchmarks run|compare
+# 'run' writes results/current.json, 'run --baseline' the committed baselines/baseline.json.
+
+from rlcard29.benchmarks.suite import BENCHMARKS, run_suite, compare_results, save_results, load_results
@@ -0,0 +1,58 @@
+"""
+File: rlcard29/benchmarks/__main__.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+import argparse
+import sys
+from rlcard29.benchmarks.suite import BENCHMARKS, run_suite, compare_results, save_results, load_results
+
+DEFAULT_OUT = "rlcard29/benchmarks/results/current.json"
+BASELINE_PATH = "rlcard29/benchmarks/baselines/baseline.json"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m rlcard29.benchmarks',
+                                     description='Benchmark the 29 engine, env and training loops.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='run benchmarks and save the results as JSON')
+    destination = run.add_mutually_exclusive_group()
+    destination.add_argument('--out', default=DEFAULT_OUT)
+    destination.add_argument('--baseline', action='store_true',
+                             help=f'save the results as the new reference baseline ({BASELINE_PATH})')
+    run.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='benchmarks to run (default: all)')
+    run.add_argument('--scale', type=float, default=1.0, help='multiplier on the number of rounds')
+    run.add_argument('--repeats', type=int, default=3)
+    run.add_argument('--seed', type=int, default=0)
+    compare = commands.add_parser('compare', help='compare results against a baseline')
+    compare.add_argument('baseline', nargs='?', default=BASELINE_PATH)
+    compare.add_argument('current', nargs='?', default=DEFAULT_OUT)
+    compare.add_argument('--threshold', type=float, default=0.1,
+                         help='relative throughput drop reported as a regression')
+    compare.add_argument('--allow-missing', action='store_true',
+                         help='do not fail on baseline benchmarks missing from the current results')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        document = run_suite(args.only, args.scale, args.repeats, args.seed, verbose=True)
+        out = BASELINE_PATH if args.baseline else args.out
+        save_results(document, out)
+        print(f"Results saved to {out}")
+        return 0
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    regressions = missing = 0
+    for name, base, now, change, status in rows:
+        if change is None:
+            print(f"{name:28s} {status:>14s}")
+            missing += status == 'missing'
+            continue
+        marker = '  <-- REGRESSION' if status == 'regression' else ''
+        print(f"{name:28s} {base:14,.0f} -> {now:14,.0f}  {change:+7.1%}{marker}")
+        regressions += status == 'regression'
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}, {missing} baseline benchmark(s) missing")
+    failed = regressions or (missing and not args.allow_missing)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
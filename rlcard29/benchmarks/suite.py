@@ -0,0 +1,259 @@
+"""
+File: rlcard29/benchmarks/suite.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Microbenchmarks for the 29 engine, env and training loops.
+# Every benchmark plays from a fixed seed and returns (operations, seconds); run_suite keeps
+# the fastest of a few repeats and reports operations per second.
+
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+import numpy as np
+from rlcard.agents import RandomAgent
+from rlcard29.envs.twenty_nine import TwentyNineEnv, random_policy
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+from rlcard29.games.twenty_nine.events import NullEventLog
+
+# Pure calls are repeated this many times inside one timer so its overhead is negligible
+_PURE_REPEATS = 20
+
+def _random_rounds(num_rounds, seed, on_step=None):
+    """Play random rounds in a log-free game, calling on_step(game, action) to make each move."""
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(seed))
+    policy_rng = np.random.RandomState(seed)
+    for _ in range(num_rounds):
+        game.init_game()
+        while not game.is_over():
+            action = ACTION_LIST[random_policy(game, policy_rng)]
+            if on_step is None:
+                game.step(action)
+            else:
+                on_step(game, action)
+    return game
+
+def bench_game_step(num_rounds, seed, phase):
+    """TwentyNineGame.step calls made in one phase."""
+    timer = time.perf_counter
+    totals = [0, 0.0]
+
+    def on_step(game, action):
+        if game.phase == phase:
+            start = timer()
+            game.step(action)
+            totals[1] += timer() - start
+            totals[0] += 1
+        else:
+            game.step(action)
+    _random_rounds(num_rounds, seed, on_step)
+    return totals[0], totals[1]
+
+def bench_get_legal_actions(num_rounds, seed):
+    """get_legal_actions at every decision point of random rounds."""
+    timer = time.perf_counter
+    totals = [0, 0.0]
+
+    def on_step(game, action):
+        get_legal_actions = game.get_legal_actions
+        start = timer()
+        for _ in range(_PURE_REPEATS):
+            get_legal_actions()
+        totals[1] += timer() - start
+        totals[0] += _PURE_REPEATS
+        game.step(action)
+    _random_rounds(num_rounds, seed, on_step)
+    return totals[0], totals[1]
+
+def bench_resolve_trick(num_rounds, seed):
+    """TwentyNineGame._resolve_trick on every completed trick of random rounds."""
+    timer = time.perf_counter
+    totals = [0, 0.0]
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(seed))
+    policy_rng = np.random.RandomState(seed)
+    resolve_trick = game._resolve_trick
+
+    def timed_resolve_trick():
+        start = timer()
+        for _ in range(_PURE_REPEATS):
+            winner_id = resolve_trick()
+        totals[1] += timer() - start
+        totals[0] += _PURE_REPEATS
+        return winner_id
+    game._resolve_trick = timed_resolve_trick
+    for _ in range(num_rounds):
+        game.init_game()
+        while not game.is_over():
+            game.step(ACTION_LIST[random_policy(game, policy_rng)])
+    return totals[0], totals[1]
+
+def bench_extract_state(num_rounds, seed):
+    """TwentyNineEnv._extract_state on the raw states of random rounds."""
+    env = TwentyNineEnv({'seed': seed, 'game_log_mode': 'off'})
+    states = []
+    _random_rounds(num_rounds, seed, lambda game, action: states.append(game.step(action)[0]))
+    start = time.perf_counter()
+    for state in states:
+        env._extract_state(state)
+    return len(states), time.perf_counter() - start
+
+def bench_random_round(num_rounds, seed):
+    """Full rounds of RandomAgents through TwentyNineEnv reset/step, as the training scripts play them."""
+    np.random.seed(seed)
+    env = TwentyNineEnv({'seed': seed, 'game_log_mode': 'off'})
+    agents = [RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)]
+    start = time.perf_counter()
+    for _ in range(num_rounds):
+        state, player_id = env.reset()
+        while not env.is_over():
+            action, _ = agents[player_id].eval_step(state)
+            state, player_id = env.step(action)
+    return num_rounds, time.perf_counter() - start
+
+def _random_lineup():
+    return [RandomAgent(num_actions=len(ACTION_LIST)) for _ in range(4)]
+
+def bench_tournament(num_rounds, seed, num_workers=1):
+    """Games per second of run_tournament with four RandomAgents."""
+    from rlcard29.evaluate_agents.tournament import run_tournament
+    start = time.perf_counter()
+    run_tournament(_random_lineup, num_rounds, num_workers=num_workers, seed=seed)
+    return num_rounds, time.perf_counter() - start
+
+def bench_vector_env(num_rounds, seed, num_workers=1, envs_per_worker=64):
+    """Env steps per second of SubprocVectorEnv under random legal actions."""
+    from rlcard29.envs.vector_env import SubprocVectorEnv
+    rng = np.random.RandomState(seed)
+    num_steps = max(num_rounds // 2, 1)
+    with SubprocVectorEnv(num_workers, envs_per_worker, config={'seed': seed}) as env:
+        env.reset()
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            env.step((env.action_mask * rng.random_sample(env.action_mask.shape)).argmax(axis=1))
+        seconds = time.perf_counter() - start
+    return num_steps * env.num_envs, seconds
+
+def bench_dqn_collection(num_rounds, seed):
+    """
+    Learner steps per second of the DQN trainer's collection loop (fast-forward env, forced
+    moves auto-played, agent step and feed), with training disabled. Needs torch.
+    """
+    from rlcard.agents import DQNAgent
+    env = TwentyNineEnv({'seed': seed, 'game_log_mode': 'off', 'auto_forced_moves': True,
+                         'fixed_policies': {1: 'random', 2: 'random', 3: 'random'}})
+    agent = DQNAgent(num_actions=env.num_actions, state_shape=env.state_shape[0], mlp_layers=[128] * 5,
+                     replay_memory_init_size=1 << 30, device='cpu')
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(num_rounds):
+        state, _ = env.reset()
+        while True:
+            action = agent.step(state)
+            next_state, _ = env.step(action)
+            done = env.is_over()
+            agent.feed((state, action, env.get_payoffs()[0] if done else 0, next_state, done))
+            steps += 1
+            state = next_state
+            if done:
+                break
+    return steps, time.perf_counter() - start
+
+# name -> (function, kwargs, unit, rounds at scale 1)
+BENCHMARKS = {
+    'game_step_bidding': (bench_game_step, {'phase': 'bidding'}, 'steps', 2000),
+    'game_step_trump_selection': (bench_game_step, {'phase': 'trump_selection'}, 'steps', 2000),
+    'game_step_play': (bench_game_step, {'phase': 'play'}, 'steps', 2000),
+    'get_legal_actions': (bench_get_legal_actions, {}, 'calls', 500),
+    'resolve_trick': (bench_resolve_trick, {}, 'calls', 1000),
+    'extract_state': (bench_extract_state, {}, 'states', 1000),
+    'random_round': (bench_random_round, {}, 'rounds', 500),
+    'tournament': (bench_tournament, {}, 'games', 500),
+    'vector_env': (bench_vector_env, {}, 'steps', 400),
+    'dqn_collection': (bench_dqn_collection, {}, 'steps', 200),
+}
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(names=None, scale=1.0, repeats=3, seed=0, verbose=False):
+    """
+    Run the named benchmarks (all by default) and return the results document.
+    Each benchmark runs repeats times on int(rounds * scale) rounds and keeps the fastest.
+    A benchmark whose dependencies are missing is recorded as skipped.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        function, kwargs, unit, rounds = BENCHMARKS[name]
+        num_rounds = max(int(rounds * scale), 1)
+        try:
+            best = None
+            for _ in range(repeats):
+                ops, seconds = function(num_rounds, seed, **kwargs)
+                if best is None or seconds / max(ops, 1) < best[1] / max(best[0], 1):
+                    best = (ops, seconds)
+        except ImportError as error:
+            results[name] = {'skipped': str(error)}
+        else:
+            ops, seconds = best
+            results[name] = {'unit': unit, 'ops': ops, 'seconds': seconds,
+                             'ops_per_sec': ops / seconds if seconds > 0 else float('inf')}
+        if verbose:
+            print(format_result(name, results[name]))
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': scale,
+            'repeats': repeats,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+def format_result(name, result):
+    if 'skipped' in result:
+        return f"{name:28s} skipped ({result['skipped']})"
+    return f"{name:28s} {result['ops_per_sec']:14,.0f} {result['unit']}/s"
+
+def save_results(document, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare_results(baseline, current, threshold=0.1):
+    """
+    Compare two results documents benchmark by benchmark.
+    Returns rows (name, baseline ops/s, current ops/s, relative change, status) where status is
+    'regression' when throughput dropped by more than threshold, 'improvement' when it rose by
+    more than threshold, 'ok' otherwise, 'missing' when the baseline has a number but the
+    current run does not (not run, crashed or skipped) and 'no_baseline' when the baseline has none.
+    """
+    rows = []
+    base_results, current_results = baseline['results'], current['results']
+    for name in list(dict.fromkeys(list(base_results) + list(current_results))):
+        base = base_results.get(name, {}).get('ops_per_sec')
+        now = current_results.get(name, {}).get('ops_per_sec')
+        if base is None or now is None:
+            rows.append((name, base, now, None, 'no_baseline' if base is None else 'missing'))
+            continue
+        change = now / base - 1
+        status = 'regression' if change < -threshold else 'improvement' if change > threshold else 'ok'
+        rows.append((name, base, now, change, status))
+    return rows
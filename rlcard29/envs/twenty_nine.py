@@ -8,7 +8,29 @@ Date: 2025-06-28
 import numpy as np
 from rlcard.envs import Env
 from rlcard29.games.twenty_nine.game import TwentyNineGame
-from rlcard29.games.twenty_nine.utils import encode_card, decode_card
+from rlcard29.games.twenty_nine.utils import SUITS, worker_seed
+from rlcard29.games.twenty_nine.events import make_event_log
+from rlcard29.games.twenty_nine.profiling import StepProfiler
+from rlcard29.games.twenty_nine.bitboard import SUIT_MASKS, mask_points
+from rlcard29.games.twenty_nine.encoding import ACTION_IDS, ACTION_LIST, ObservationEncoder, OBS_SIZE, action_mask_to_ids
+
+# Spawn key of the fixed policies' generator, see TwentyNineEnv.seed
+_POLICY_STREAM = 29
+
+def random_policy(game, np_random):
+    """Fixed-seat policy playing a uniformly random legal action drawn from np_random."""
+    action_ids = action_mask_to_ids(game.get_legal_action_mask())
+    return action_ids[np_random.randint(len(action_ids))]
+
+def longest_suit_trump(game):
+    """Trump policy naming the bid winner's longest suit, ties going to the one with more points."""
+    hand_mask = game.players[game.bid_winner].hand_mask
+    suit_cards = [hand_mask & suit_mask for suit_mask in SUIT_MASKS]
+    best = max(range(len(SUITS)), key=lambda i: (bin(suit_cards[i]).count('1'), mask_points(suit_cards[i])))
+    return SUITS[best]
+
+FIXED_POLICIES = {'random': random_policy}
+TRUMP_POLICIES = {'longest': longest_suit_trump}
 
 class TwentyNineEnv(Env):
     def __init__(self, config=None):
@@ -19,70 +41,168 @@ class TwentyNineEnv(Env):
         if 'seed' not in config:
             config['seed'] = None
         self.name = 'twenty_nine'
-        self.game = TwentyNineGame()
+        # Parallel workers sharing one config['seed'] each get an independent stream
+        self.worker_id = config.get('worker_id')
+        # 'game_log_mode': 'structured' (current round), 'ring' (last game_log_capacity events) or 'off'
+        event_log = make_event_log(config.get('game_log_mode', 'structured'),
+                                   config.get('game_log_capacity', 1024))
+        self.game = TwentyNineGame(event_log=event_log)
+        # 'fixed_policies': {seat: policy} played inside the env; policy(game, self.policy_rng) returns
+        # an action id or raw action ('random' names random_policy). reset/step then only stop at the
+        # other seats.
+        self.fixed_policies = {seat: FIXED_POLICIES.get(policy, policy)
+                               for seat, policy in config.get('fixed_policies', {}).items()}
+        # 'auto_forced_moves': play every decision with a single legal action inside the env;
+        # 'trump_policy': trump_policy(game) -> suit also settles trump selection ('longest' names
+        # longest_suit_trump). Both are listed per round in forced_moves as (player_id, raw action).
+        self.auto_forced_moves = config.get('auto_forced_moves', False)
+        self.trump_policy = TRUMP_POLICIES.get(config.get('trump_policy'), config.get('trump_policy'))
+        # 'episode': 'round' (default) or 'match'; a match episode deals round after round until
+        # get_match_winner() decides it, and its payoffs are +1/-1 for the match winner's team
+        self.match_episodes = config.get('episode', 'round') == 'match'
+        self._plays_internally = (bool(self.fixed_policies) or self.auto_forced_moves
+                                  or self.trump_policy is not None or self.match_episodes)
+        self.forced_moves = []
+        self.num_rounds = 0 # Rounds finished in the current match episode
+        self._last_learner = None
+        self.encoder = ObservationEncoder()
+        # 'profile': time env.step, state extraction, encoding and the game's step pipeline per
+        # phase; read it with self.profiler.snapshot()
+        self.profiler = StepProfiler().attach_env(self) if config.get('profile', False) else None
         super().__init__(config)
         self.action_num = self.game.get_num_actions()
-        self.state_shape = [[128]] * self.game.num_players
+        self.state_shape = [[OBS_SIZE]] * self.game.num_players
         self.action_shape = [None for _ in range(self.game.num_players)]
 
+    def seed(self, seed=None):
+        if seed is not None and self.worker_id is not None:
+            seed = worker_seed(seed, self.worker_id)
+        # Fixed policies draw from their own generator, so the learner's play never shifts the deals
+        self.policy_rng = np.random.RandomState(None if seed is None else worker_seed(seed, _POLICY_STREAM))
+        return super().seed(seed)
+
+    def reset(self):
+        if not self._plays_internally:
+            return super().reset()
+        self.action_recorder = []
+        self.forced_moves = []
+        if self.match_episodes:
+            self.game.init_match()
+            self.num_rounds = 0
+        self.game.init_game()
+        self._last_learner = None
+        return self._fast_forward()
+
+    def step(self, action, raw_action=False):
+        """
+        With fixed_policies, auto_forced_moves or trump_policy, play action for the current seat
+        and then the fixed seats and forced moves until some seat has a real decision. When the
+        round ends first, the returned state is that of the seat that acted last, so a learner's
+        (state, action, reward, next_state, done) transition pairs its own consecutive decisions;
+        the reward is get_payoffs() once is_over(), else 0.
+        """
+        if not self._plays_internally:
+            return super().step(action, raw_action)
+        if not raw_action:
+            action = self._decode_action(action)
+        self.timestep += 1
+        self._last_learner = self.game.current_player
+        self.action_recorder.append((self._last_learner, action))
+        self.game.apply(action)
+        return self._fast_forward()
+
+    def _fast_forward(self):
+        game = self.game
+        while True:
+            if game.is_over():
+                if not self.match_episodes:
+                    break
+                self.num_rounds += 1
+                if game.get_match_winner() is not None:
+                    break
+                game.init_game()
+                continue
+            player_id = game.current_player
+            if player_id in self.fixed_policies:
+                action = self.fixed_policies[player_id](game, self.policy_rng)
+            else:
+                action = self._forced_action(game)
+                if action is None:
+                    break
+            if not isinstance(action, str):
+                action = ACTION_LIST[action]
+            if player_id not in self.fixed_policies:
+                self.forced_moves.append((player_id, action))
+            self.action_recorder.append((player_id, action))
+            game.apply(action)
+        player_id = game.current_player
+        if game.is_over() and self._last_learner is not None:
+            player_id = self._last_learner
+        return self._extract_state(game.get_state(player_id)), player_id
+
+    def step_back(self):
+        """
+        rlcard's Env.step_back, one game action at a time. The game's undo journal only covers
+        the current round (init_game clears it), so in a match episode stepping back past the
+        first action of a later round raises instead of quietly returning False.
+        """
+        if not self.match_episodes:
+            return super().step_back()
+        was_over = self.game.is_over()
+        result = super().step_back()
+        if result is False and self.num_rounds > 0:
+            raise RuntimeError('step_back cannot undo past the start of a round in a match episode')
+        if result is not False and was_over:
+            self.num_rounds -= 1
+        return result
+
+    def _forced_action(self, game):
+        """The raw action the current seat is forced into, or None if it has a real decision."""
+        if game.phase == 'trump_selection' and self.trump_policy is not None:
+            return self.trump_policy(game)
+        if self.auto_forced_moves:
+            mask = game.get_legal_action_mask()
+            if mask & (mask - 1) == 0:
+                return ACTION_LIST[mask.bit_length() - 1]
+        return None
+
     def _extract_state(self, state):
-        obs = np.zeros(128, dtype=int)
         if 'hand' not in state or state['hand'] is None:
             print(f"Warning: Invalid state['hand']: {state}")
             state['hand'] = []
-        hand_cards = np.zeros(32)
-        for card in state['hand']:
-            try:
-                hand_cards[encode_card(card)] = 1
-            except Exception as e:
-                print(f"Error encoding card {card}: {e}")
-        obs[0:32] = hand_cards
-        raw_legal_actions = state.get('legal_actions', [])
-        legal_actions = self._get_legal_actions_id(raw_legal_actions)
-        action_mask = np.zeros(self.action_num, dtype=int)
-        for action_id in legal_actions.keys():
-            action_mask[action_id] = 1
-        obs[32:32+self.action_num] = action_mask
-        obs[0] = state.get('bid_value', 0)  # Fixed indexing bug
+        obs, legal_actions, action_mask = self.encoder.encode(state)
         return {
             'obs': obs,
             'legal_actions': legal_actions,
+            'action_mask': action_mask,
             'raw_obs': state,
-            'raw_legal_actions': raw_legal_actions  # Ensure consistency
-        }                                                                       
+            'raw_legal_actions': state.get('legal_actions', [])  # Ensure consistency
+        }
+
+    def extract_states(self, states, out=None):
+        """Encode many raw states at once; returns (N, 128) observations and (N, 51) legal-action masks."""
+        return self.encoder.encode_batch(states, out)
 
     def _get_legal_actions_id(self, legal_actions):
-        legal_actions_ids = {}
-        for action in legal_actions:
-            legal_actions_ids[self._encode_action(action)] = action
-        return legal_actions_ids
+        return {ACTION_IDS[action]: action for action in legal_actions}
 
     def _decode_action(self, action_id):
-        if 32 <= action_id < 47:
-            if action_id == 46:
-                return 'pass'
-            return str(action_id - 16)
-        elif 47 <= action_id < 51:
-            return {47: 'S', 48: 'H', 49: 'D', 50: 'C'}[action_id]
-        else:
-            return decode_card(action_id)
+        return ACTION_LIST[action_id]
 
     def _encode_action(self, action):
         if isinstance(action, int):
             return action
-        if action == 'pass':
-            return 46
-        elif action in ['S', 'H', 'D', 'C']:
-            return {'S': 47, 'H': 48, 'D': 49, 'C': 50}[action]
-        elif isinstance(action, str) and action.isdigit():
-            return int(action) + 16
-        else:
-            return encode_card(action)
+        return ACTION_IDS[action]
 
     def _get_payoffs(self):
-        return self.game.get_payoffs()
+        return self.get_payoffs()
 
     def get_payoffs(self):
+        if self.match_episodes:
+            winner = self.game.get_match_winner()
+            if winner is None:
+                return [0, 0, 0, 0]
+            return [1 if player_id % 2 == winner else -1 for player_id in range(self.num_players)]
         return self.game.get_payoffs()
 
     def get_detailed_result(self):
@@ -92,21 +212,22 @@ class TwentyNineEnv(Env):
         }
 
     def get_perfect_information(self):
-        return {}
+        """Return every hand and the hidden trump; DoubleDummySolver.solve_game values such positions."""
+        game = self.game
+        return {
+            'hand_cards': [sorted(player.hand) for player in game.players],
+            'current_player': game.current_player,
+            'legal_actions': game.get_legal_actions(),
+            'phase': game.phase,
+            'bid_value': game.bid_value,
+            'bid_winner': game.bid_winner,
+            'trump_suit': game.trump_suit,
+            'trump_revealed': game.trump_revealed,
+            'trick': list(game.trick),
+            'team_points': list(game.team_points),
+        }
 
     def run(self, is_training=False):
-        trajectories = [[] for _ in range(self.num_players)]
-        state, player_id = self.reset()
-        while not self.is_over():
-            extracted_state = self._extract_state(state)
-            if is_training:
-                action, info = self.agents[player_id].step(extracted_state)
-            else:
-                action = self.agents[player_id].eval_step(extracted_state)
-            trajectories[player_id].append([state, action])
-            next_state, next_player_id = self.step(action)
-            state, player_id = next_state, next_player_id
-        payoffs = self.get_payoffs()
-        for player_id in range(self.num_players):
-            trajectories[player_id].append(payoffs[player_id])
-        return trajectories, payoffs
\ No newline at end of file
+        """rlcard's Env.run, with the payoffs as an array as rlcard.utils.tournament expects."""
+        trajectories, payoffs = super().run(is_training)
+        return trajectories, np.array(payoffs)
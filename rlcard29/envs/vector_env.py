@@ -0,0 +1,221 @@
+"""
+File: rlcard29/envs/vector_env.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Subprocess vector environment for the 29 card game.
+# num_workers processes each step envs_per_worker TwentyNineEnv instances. Actions, observations,
+# current players, payoffs and done flags live in shared-memory NumPy buffers, so a step only
+# sends one command byte to each worker and reads one byte back.
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from rlcard29.envs.twenty_nine import TwentyNineEnv
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, OBS_SIZE, LEGAL_OFFSET, BID_OFFSET
+
+_STEP = b's'
+_RESET = b'r'
+_CLOSE = b'c'
+
+def _buffer_specs(num_envs, obs_dtype):
+    """Name, shape and dtype of every shared buffer."""
+    return (
+        ('obs', (num_envs, OBS_SIZE), np.dtype(obs_dtype)),
+        ('player_id', (num_envs,), np.dtype(np.int64)),
+        ('actions', (num_envs,), np.dtype(np.int64)),
+        ('rewards', (num_envs, 4), np.dtype(np.float32)),
+        ('dones', (num_envs,), np.dtype(bool)),
+    )
+
+def _attach(segments, specs):
+    return {name: np.ndarray(shape, dtype=dtype, buffer=segments[name].buf) for name, shape, dtype in specs}
+
+def _worker(conn, segment_names, specs, start, stop, config):
+    """Step envs start..stop-1 of the shared buffers on every command until told to close."""
+    segments = {name: shared_memory.SharedMemory(name=segment_name)
+                for name, segment_name in segment_names.items()}
+    buffers = _attach(segments, specs)
+    obs, player_id, actions = buffers['obs'][start:stop], buffers['player_id'][start:stop], buffers['actions'][start:stop]
+    rewards, dones = buffers['rewards'][start:stop], buffers['dones'][start:stop]
+    envs = []
+    for env_id in range(start, stop):
+        env_config = dict(config)
+        env_config['worker_id'] = env_id
+        envs.append(TwentyNineEnv(env_config))
+    games = [env.game for env in envs]
+    encoder = envs[0].encoder if envs else None
+    # fixed_policies, forced moves and match episodes are played by TwentyNineEnv.reset/step
+    internal = bool(envs) and envs[0]._plays_internally
+
+    def reset(i):
+        if internal:
+            state, player_id[i] = envs[i].reset()
+            obs[i] = state['obs']
+            return
+        game = games[i]
+        game.init_game()
+        encoder.encode_game(game, obs[i])
+        player_id[i] = game.current_player
+
+    def step_internal(i):
+        env = envs[i]
+        state, next_player_id = env.step(int(actions[i]))
+        if env.is_over():
+            rewards[i] = env.get_payoffs()
+            dones[i] = True
+            reset(i)
+        else:
+            dones[i] = False
+            obs[i] = state['obs']
+            player_id[i] = next_player_id
+
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                rewards.fill(0)
+                for i, game in enumerate(games):
+                    if internal:
+                        step_internal(i)
+                        continue
+                    game.apply(ACTION_LIST[actions[i]])
+                    if game.is_over():
+                        rewards[i] = game.get_payoffs()
+                        dones[i] = True
+                        reset(i)
+                    else:
+                        dones[i] = False
+                        encoder.encode_game(game, obs[i])
+                        player_id[i] = game.current_player
+            elif command == _RESET:
+                rewards.fill(0)
+                dones.fill(False)
+                for i in range(len(games)):
+                    reset(i)
+            else:
+                break
+            conn.send_bytes(command)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del obs, player_id, actions, rewards, dones, buffers
+        for segment in segments.values():
+            segment.close()
+        conn.close()
+
+class SubprocVectorEnv:
+    """
+    num_workers * envs_per_worker TwentyNineEnv rounds stepped in lockstep by worker processes.
+
+    Every env always has a player to move, so step takes one action id per env. A finished
+    round reports its payoffs in rewards and done=True, and the env is reset in the same step:
+    the returned observation is then the first one of the next round. The returned arrays are
+    the shared buffers themselves and are overwritten by the next step, so copy what you keep.
+
+    Env i is seeded like a parallel TwentyNineEnv with worker_id=i, so config['seed'] gives a
+    reproducible, independent stream per env. With 'fixed_policies', 'auto_forced_moves',
+    'trump_policy' or 'episode': 'match' the workers step through TwentyNineEnv.reset/step:
+    observations and player ids are then those of the decisions the env hands out, and an
+    episode (round or match) ends with its env payoffs. 'profile' is rejected, since the
+    profilers live in the worker processes.
+    """
+    def __init__(self, num_workers=None, envs_per_worker=1, config=None, obs_dtype=int, start_method=None):
+        self.num_workers = num_workers or mp.cpu_count() or 1
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = self.num_workers * envs_per_worker
+        self.num_players = 4
+        self.num_actions = len(ACTION_LIST)
+        self.state_shape = [[OBS_SIZE]] * self.num_players
+        config = dict(config or {})
+        config.setdefault('game_log_mode', 'off')
+        config.pop('worker_id', None)
+        if config.get('profile'):
+            raise ValueError("SubprocVectorEnv does not support 'profile'; profile a TwentyNineEnv instead")
+
+        specs = _buffer_specs(self.num_envs, obs_dtype)
+        self._segments = {name: shared_memory.SharedMemory(create=True, size=max(dtype.itemsize * int(np.prod(shape)), 1))
+                          for name, shape, dtype in specs}
+        buffers = _attach(self._segments, specs)
+        self.obs = buffers['obs']
+        self.action_mask = self.obs[:, LEGAL_OFFSET:BID_OFFSET]
+        self.player_id = buffers['player_id']
+        self.actions = buffers['actions']
+        self.rewards = buffers['rewards']
+        self.dones = buffers['dones']
+
+        context = mp.get_context(start_method)
+        segment_names = {name: segment.name for name, segment in self._segments.items()}
+        self._conns = []
+        self._processes = []
+        for worker_id in range(self.num_workers):
+            parent_conn, child_conn = context.Pipe()
+            start = worker_id * envs_per_worker
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child_conn, segment_names, specs, start, start + envs_per_worker, config))
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self._waiting = False
+        self.closed = False
+
+    def _broadcast(self, command):
+        for conn in self._conns:
+            conn.send_bytes(command)
+
+    def _wait(self):
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self):
+        """Start a new round in every env; returns (obs, player_id)."""
+        self._broadcast(_RESET)
+        self._wait()
+        return self.obs, self.player_id
+
+    def step_async(self, actions):
+        """Send one action id per env to the workers without waiting for them."""
+        self.actions[:] = actions
+        self._broadcast(_STEP)
+        self._waiting = True
+
+    def step_wait(self):
+        """Wait for step_async; returns (obs, player_id, rewards, dones)."""
+        self._wait()
+        self._waiting = False
+        return self.obs, self.player_id, self.rewards, self.dones
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        if self.closed:
+            return
+        if self._waiting:
+            self._wait()
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        del self.obs, self.action_mask, self.player_id, self.actions, self.rewards, self.dones
+        for segment in self._segments.values():
+            segment.close()
+            segment.unlink()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
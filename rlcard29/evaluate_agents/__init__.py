@@ -0,0 +1,7 @@
+"""
+File: rlcard29/evaluate_agents/__init__.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Evaluation tools and scripts for rlcard29
@@ -0,0 +1,147 @@
+"""
+File: rlcard29/evaluate_agents/duplicate.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Duplicate-deal evaluation for the 29 card game.
+# Every deal of a fixed DealBank is played twice, once with team A in seats (0, 2) and once in
+# seats (1, 3), so both teams hold the same cards in turn and card luck cancels out of the
+# paired score (A's payoff in the first game + A's payoff in the second) / 2.
+
+import math
+from multiprocessing import Pool
+from statistics import NormalDist
+import numpy as np
+from rlcard29.envs.twenty_nine import TwentyNineEnv
+from rlcard29.games.twenty_nine.dealer import Dealer
+from rlcard29.games.twenty_nine.utils import worker_seed
+
+DEFAULT_BANK_SEED = 29
+
+_worker_teams = None
+_worker_config = None
+_worker_bank = None
+
+class DealBank:
+    """
+    Fixed set of deals. Deal i is the dealer seat dealer_ids[i] plus a Dealer generator seeded
+    with seeds[i]: its first deck fixes both 4-card deals, and the decks of any redeals after
+    four passes come from the same generator, so every replay of the deal is identical.
+    """
+    def __init__(self, seeds, dealer_ids):
+        self.seeds = np.asarray(seeds, dtype=np.int64)
+        self.dealer_ids = np.asarray(dealer_ids, dtype=np.int8)
+
+    @classmethod
+    def generate(cls, num_deals, seed=DEFAULT_BANK_SEED):
+        seeds = [worker_seed(seed, deal_id) for deal_id in range(num_deals)]
+        return cls(seeds, np.arange(num_deals) % 4)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data['seeds'], data['dealer_ids'])
+
+    def save(self, path):
+        np.savez(path, seeds=self.seeds, dealer_ids=self.dealer_ids)
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def deck(self, deal_id):
+        """First deck of a deal as card indices; the last 16 cards are the first 4-card deal."""
+        dealer = Dealer(np.random.RandomState(self.seeds[deal_id]))
+        dealer.shuffle()
+        return dealer.deck
+
+    def set_deal(self, game, deal_id):
+        """Make the next game.init_game() deal deal_id."""
+        game.np_random = np.random.RandomState(self.seeds[deal_id])
+        game.dealer_id = (int(self.dealer_ids[deal_id]) - 1) % game.num_players
+
+def _team_pair(team):
+    return tuple(team) if isinstance(team, (list, tuple)) else (team, team)
+
+def play_deal(env, team_a, team_b, bank, deal_id):
+    """
+    Play deal_id with team A in seats (0, 2), then with the teams swapped.
+    Returns team A's payoff in both games.
+    """
+    a0, a1 = _team_pair(team_a)
+    b0, b1 = _team_pair(team_b)
+    results = []
+    for swapped, agents in enumerate(([a0, b0, a1, b1], [b0, a0, b1, a1])):
+        # Agents such as rlcard's RandomAgent draw from the global generator
+        np.random.seed(worker_seed(int(bank.seeds[deal_id]), swapped) % (1 << 32))
+        env.set_agents(agents)
+        bank.set_deal(env.game, deal_id)
+        state, player_id = env.reset()
+        while not env.is_over():
+            action, _ = agents[player_id].eval_step(state)
+            state, player_id = env.step(action, agents[player_id].use_raw)
+        results.append(env.get_payoffs()[swapped])
+    return results
+
+def _play_deals(team_a, team_b, config, bank, deal_ids):
+    env = TwentyNineEnv(dict(config))
+    return np.array([play_deal(env, team_a, team_b, bank, deal_id) for deal_id in deal_ids], dtype=np.int8)
+
+def _init_worker(team_factory, config, bank):
+    global _worker_teams, _worker_config, _worker_bank
+    _worker_teams = team_factory()
+    _worker_config = config
+    _worker_bank = bank
+
+def _worker_deals(deal_ids):
+    return _play_deals(*_worker_teams, _worker_config, _worker_bank, deal_ids)
+
+def summarize_duplicate(results, alpha=0.05):
+    """
+    Paired statistics of (N, 2) team A payoffs (A in seats (0, 2), A in seats (1, 3)).
+    'efficiency' estimates how many times more unpaired games the same interval would take.
+    """
+    results = np.asarray(results, dtype=float)
+    num_deals = len(results)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    paired = results.mean(axis=1)
+    mean = float(paired.mean()) if num_deals else 0.0
+    paired_var = float(paired.var(ddof=1)) if num_deals > 1 else 0.0
+    single_var = float(results.var(ddof=1)) if num_deals > 1 else 0.0
+    half_width = z * math.sqrt(paired_var / max(num_deals, 1))
+    return {
+        'num_deals': num_deals,
+        'num_games': 2 * num_deals,
+        'mean': mean,
+        'ci': (mean - half_width, mean + half_width),
+        'seat_means': [float(m) for m in results.mean(axis=0)] if num_deals else [0.0, 0.0],
+        'efficiency': single_var / (2 * paired_var) if paired_var > 0 else math.inf,
+    }
+
+def duplicate_evaluate(team_factory, bank=None, num_workers=None, config=None, chunk_size=25, alpha=0.05):
+    """
+    Duplicate-evaluate team A against team B over every deal of bank (DealBank.generate(1000)
+    by default).
+
+    Args:
+        team_factory (callable): picklable function returning (team_a, team_b); a team is one
+            agent sitting in both partner seats or a pair of agents
+        num_workers (int): processes to spread the deals over; 1 plays in this process
+
+    Returns:
+        (dict): summarize_duplicate() of the results plus 'results', the (N, 2) payoffs of team A
+    """
+    bank = bank if bank is not None else DealBank.generate(1000)
+    config = dict(config or {})
+    config.setdefault('game_log_mode', 'off')
+    chunks = [range(start, min(start + chunk_size, len(bank))) for start in range(0, len(bank), chunk_size)]
+    if num_workers == 1:
+        team_a, team_b = team_factory()
+        parts = [_play_deals(team_a, team_b, config, bank, deal_ids) for deal_ids in chunks]
+    else:
+        with Pool(num_workers, initializer=_init_worker, initargs=(team_factory, config, bank)) as pool:
+            parts = pool.map(_worker_deals, chunks)
+    results = np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.int8)
+    summary = summarize_duplicate(results, alpha)
+    summary['results'] = results
+    return summary
@@ -6,8 +6,10 @@ Date: 2025-06-28
     
 import rlcard
 from rlcard.agents import RandomAgent, DQNAgent
-from rlcard.utils import tournament, get_device
+from rlcard.utils import get_device
 import rlcard29
+from rlcard29.agents.batched_inference import InferenceServer, BatchedAgent, predict_fn_from_agent, batched_tournament
+from rlcard29.games.twenty_nine.encoding import check_encoding_version
 import os
 import torch
 
@@ -24,11 +26,14 @@ def main():
     device = get_device()
     print(f"Using device: {device}")
 
-    # Create the environment
-    env = rlcard.make('twenty_nine')
+    # Create the environments; rounds are played concurrently so the DQN forward passes are batched
+    envs = [rlcard.make('twenty_nine', config={'game_log_mode': 'off'}) for _ in range(16)]
+    env = envs[0]
 
     # Load the trained DQN agent
-    dqn_agent = DQNAgent.from_checkpoint(checkpoint=torch.load(model_path))
+    checkpoint = torch.load(model_path)
+    check_encoding_version(checkpoint)
+    dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
     
     print("DQN agent loaded successfully.")
 
@@ -38,10 +43,14 @@ def main():
     # Set up the agents in the environment to match the training configuration.
     # Player 0 will be the DQN agent.
     # Players 1, 2 & 3 will be Random agents.
-    env.set_agents([dqn_agent, random_agent, random_agent, random_agent])
+    server = InferenceServer(predict_fn_from_agent(dqn_agent), max_batch_size=64, max_latency=0.002)
+    batched_dqn_agent = BatchedAgent(server, env.action_num)
+    for round_env in envs:
+        round_env.set_agents([batched_dqn_agent, random_agent, random_agent, random_agent])
 
     print("Starting tournament: DQN agent vs. three Random agents...")
-    rewards = tournament(env, 1000)
+    rewards = batched_tournament(envs, 1000)
+    server.close()
     
     # Print out the results
     print("\nTournament Results:")
@@ -7,7 +7,8 @@ Date: 2025-06-28
 import rlcard
 from rlcard.agents import RandomAgent, DQNAgent
 from rlcard.agents.dqn_agent import Transition
-from rlcard.utils import tournament, get_device
+from rlcard.utils import get_device
+from functools import partial
 import os
 import torch
 import numpy as np
@@ -17,6 +18,43 @@ try:
 except ImportError as e:
     print(f"Error importing rlcard29: {e}")
     raise
+from rlcard29.evaluate_agents.tournament import run_tournament, format_summary
+from rlcard29.evaluate_agents.duplicate import DealBank, duplicate_evaluate
+from rlcard29.games.twenty_nine.encoding import check_encoding_version
+
+def load_dqn_agent(model_path, device):
+    try:
+        torch.serialization.add_safe_globals([
+            Transition,
+            np.ndarray,
+            np._core.multiarray._reconstruct,
+            np.dtypes.Int64DType,
+            np.dtype,
+            np._core.multiarray.scalar,
+            np.dtypes.Float64DType
+        ])
+    except AttributeError as e:
+        print(f"Error setting safe globals: {e}")
+        raise
+
+    try:
+        checkpoint = torch.load(model_path, weights_only=True, map_location=device)
+    except Exception as e:
+        print(f"Error loading checkpoint with weights_only=True: {e}")
+        checkpoint = torch.load(model_path, weights_only=False, map_location=device)
+    check_encoding_version(checkpoint)
+    return DQNAgent.from_checkpoint(checkpoint=checkpoint)
+
+def make_agents(model_path, device):
+    """Player 0 is the DQN agent, players 1, 2 & 3 are Random agents; built once per tournament worker."""
+    dqn_agent = load_dqn_agent(model_path, device)
+    random_agent = RandomAgent(num_actions=dqn_agent.num_actions)
+    return [dqn_agent, random_agent, random_agent, random_agent]
+
+def make_teams(model_path, device):
+    """The DQN team against the Random team for duplicate evaluation."""
+    dqn_agent = load_dqn_agent(model_path, device)
+    return dqn_agent, RandomAgent(num_actions=dqn_agent.num_actions)
 
 def main():
     save_dir = "rlcard29/models/dqn_model_twenty_nine"
@@ -40,92 +78,46 @@ def main():
         raise
 
     try:
-        torch.serialization.add_safe_globals([
-            Transition,
-            np.ndarray,
-            np._core.multiarray._reconstruct,
-            np.dtypes.Int64DType,
-            np.dtype,
-            np._core.multiarray.scalar,
-            np.dtypes.Float64DType
-        ])
-    except AttributeError as e:
-        print(f"Error setting safe globals: {e}")
-        raise
-
-    try:
-        checkpoint = torch.load(model_path, weights_only=True, map_location=device)
-        dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
+        load_dqn_agent(model_path, device)
         print("DQN agent loaded successfully")
     except Exception as e:
-        print(f"Error loading checkpoint with weights_only=True: {e}")
-        try:
-            checkpoint = torch.load(model_path, weights_only=False, map_location=device)
-            dqn_agent = DQNAgent.from_checkpoint(checkpoint=checkpoint)
-            print("DQN agent loaded with weights_only=False")
-        except Exception as e2:
-            print(f"Failed to load checkpoint: {e2}")
-            raise
-
-    try:
-        random_agent = RandomAgent(num_actions=env.num_actions)
-        env.set_agents([dqn_agent, random_agent, random_agent, random_agent])
-        print("Agents set successfully")
-    except Exception as e:
-        print(f"Error setting agents: {e}")
+        print(f"Failed to load checkpoint: {e}")
         raise
 
+    state, player_id = env.reset()
+    print(f"Initial state raw_legal_actions: {state['raw_legal_actions']}")
+
+    # Up to 1000 games over all cores, stopping early once the SPRT decides which team is stronger
     print("Starting tournament: DQN agent vs. three Random agents...")
     try:
-        state, player_id = env.reset()
-        print(f"Initial state raw_legal_actions: {state['raw_legal_actions']}")
-        rewards = tournament(env, 1000)
-        print("\nTournament Results:")
-        print("="*20)
-        dqn_reward = rewards[0]
-        random_rewards_avg = (rewards[1] + rewards[2] + rewards[3]) / 3
-        print(f"DQN Agent (Player 0) average reward: {dqn_reward}")
-        print(f"Random Agents (Players 1, 2, 3) average reward: {random_rewards_avg}")
-        if dqn_reward > random_rewards_avg:
-            print("\nDQN Agent wins!")
-        else:
-            print("\nRandom Agents win!")
+        summary = run_tournament(partial(make_agents, model_path, device), 1000, early_stop=True)
     except Exception as e:
         print(f"Error during tournament: {e}")
         print("Stack trace:")
         traceback.print_exc()
-        print("Falling back to custom tournament loop...")
-        try:
-            payoffs = [0] * env.num_players
-            num_games = 1000
-            for game in range(num_games):
-                state, _ = env.reset()
-                if game == 0:
-                    print(f"First game raw_legal_actions: {state['raw_legal_actions']}")
-                while not env.is_over():
-                    player_id = env.get_player_id()
-                    state = env.get_state(player_id)
-                    action = env.agents[player_id].step(state)
-                    env.step(action)
-                _p = env.get_payoffs()
-                for i in range(len(payoffs)):
-                    payoffs[i] += _p[i]
-            rewards = [p / num_games for p in payoffs]
-            print("\nTournament Results:")
-            print("="*20)
-            dqn_reward = rewards[0]
-            random_rewards_avg = (rewards[1] + rewards[2] + rewards[3]) / 3
-            print(f"DQN Agent (Player 0) average reward: {dqn_reward}")
-            print(f"Random Agents (Players 1, 2, 3) average reward: {random_rewards_avg}")
-            if dqn_reward > random_rewards_avg:
-                print("\nDQN Agent wins!")
-            else:
-                print("\nRandom Agents win!")
-        except Exception as e2:
-            print(f"Custom tournament failed: {e2}")
-            print("Stack trace:")
-            traceback.print_exc()
-            raise
+        raise
+
+    print("\nTournament Results:")
+    print("="*20)
+    labels = ('DQN Agent (Player 0)', 'Random Agent (Player 1)', 'Random Agent (Player 2, DQN partner)', 'Random Agent (Player 3)')
+    for line in format_summary(summary, labels):
+        print(line)
+    # The verdict is the SPRT's alone; the intervals above are for information
+    if summary['decision'] == 'team0':
+        print("\nDQN Agent wins!")
+    elif summary['decision'] == 'team1':
+        print("\nRandom Agents win!")
+    elif summary['decision'] == 'no_difference':
+        print("\nNo significant difference between the DQN Agent and the Random Agents.")
+    else:
+        print("\nUndecided: play more games to separate the DQN Agent from the Random Agents.")
+
+    # The same 1000 deals for every checkpoint, each played with the teams in both seat pairs
+    print("\nDuplicate evaluation: DQN team vs. Random team...")
+    duplicate = duplicate_evaluate(partial(make_teams, model_path, device), DealBank.generate(1000))
+    low, high = duplicate['ci']
+    print(f"DQN team paired payoff over {duplicate['num_deals']} deals: {duplicate['mean']:+.3f}  [{low:+.3f}, {high:+.3f}]")
+    print(f"Variance reduction vs. unpaired games: {duplicate['efficiency']:.1f}x")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+File: rlcard29/evaluate_agents/match_runner.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Headless full-match simulation for the 29 card game.
+# Matches are played in TwentyNineEnv match episodes (config 'episode': 'match') and chunked
+# over a process pool like run_tournament, chunk i seeded with worker_seed(seed, i). The result
+# is the match-win probability of each team and the distribution of match length in rounds.
+
+import argparse
+import math
+from collections import Counter
+from multiprocessing import Pool
+from statistics import NormalDist
+import numpy as np
+from rlcard.agents import RandomAgent
+from rlcard29.envs.twenty_nine import TwentyNineEnv
+from rlcard29.games.twenty_nine.utils import worker_seed
+
+_worker_agents = None
+_worker_config = None
+
+def play_matches(env, agents, num_matches):
+    """Play num_matches full matches; returns (num_matches, 2) rows of (winning team, rounds)."""
+    env.set_agents(agents)
+    results = np.zeros((num_matches, 2), dtype=np.int32)
+    for match_id in range(num_matches):
+        state, player_id = env.reset()
+        while not env.is_over():
+            action, _ = agents[player_id].eval_step(state)
+            state, player_id = env.step(action, agents[player_id].use_raw)
+        results[match_id] = env.game.get_match_winner(), env.num_rounds
+    return results
+
+def _play_chunk(agents, config, seed, chunk_id, num_matches):
+    chunk_seed = worker_seed(seed, chunk_id)
+    # Agents such as rlcard's RandomAgent draw from the global generator
+    np.random.seed(chunk_seed % (1 << 32))
+    env_config = dict(config)
+    env_config['seed'] = chunk_seed
+    env_config['episode'] = 'match'
+    env_config.pop('worker_id', None)
+    return play_matches(TwentyNineEnv(env_config), agents, num_matches)
+
+def _init_worker(agent_factory, config):
+    global _worker_agents, _worker_config
+    _worker_agents = agent_factory()
+    _worker_config = config
+
+def _worker_chunk(task):
+    seed, chunk_id, num_matches = task
+    return _play_chunk(_worker_agents, _worker_config, seed, chunk_id, num_matches)
+
+def summarize_matches(results, alpha=0.05):
+    """Match-win probabilities with Wilson intervals and match-length statistics of play_matches rows."""
+    results = np.asarray(results)
+    num_matches = len(results)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    win_prob, win_ci = [], []
+    for team_id in range(2):
+        wins = int((results[:, 0] == team_id).sum())
+        p = wins / max(num_matches, 1)
+        denominator = 1 + z * z / max(num_matches, 1)
+        centre = (p + z * z / (2 * max(num_matches, 1))) / denominator
+        half_width = z * math.sqrt(p * (1 - p) / max(num_matches, 1) + z * z / (4 * max(num_matches, 1) ** 2)) / denominator
+        win_prob.append(p)
+        win_ci.append((centre - half_width, centre + half_width))
+    lengths = results[:, 1]
+    return {
+        'num_matches': num_matches,
+        'win_prob': win_prob,
+        'win_ci': win_ci,
+        'mean_rounds': float(lengths.mean()) if num_matches else 0.0,
+        'median_rounds': float(np.median(lengths)) if num_matches else 0.0,
+        'rounds_distribution': dict(sorted(Counter(lengths.tolist()).items())),
+    }
+
+def run_matches(agent_factory, num_matches, num_workers=None, config=None, seed=0, chunk_size=10, alpha=0.05):
+    """
+    Play num_matches full matches of agent_factory()'s four agents over num_workers processes
+    (1 plays in this process); agent_factory must be picklable. Returns summarize_matches()
+    plus 'results', the (N, 2) rows of (winning team, rounds).
+    """
+    config = dict(config or {})
+    config.setdefault('game_log_mode', 'off')
+    tasks = [(seed, chunk_id, min(chunk_size, num_matches - start))
+             for chunk_id, start in enumerate(range(0, num_matches, chunk_size))]
+    if num_workers == 1:
+        agents = agent_factory()
+        parts = [_play_chunk(agents, config, *task) for task in tasks]
+    else:
+        with Pool(num_workers, initializer=_init_worker, initargs=(agent_factory, config)) as pool:
+            parts = list(pool.imap(_worker_chunk, tasks))
+    results = np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.int32)
+    summary = summarize_matches(results, alpha)
+    summary['results'] = results
+    return summary
+
+def random_lineup():
+    return [RandomAgent(num_actions=51) for _ in range(4)]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate full 29 matches between random agents.')
+    parser.add_argument('--matches', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    summary = run_matches(random_lineup, args.matches, num_workers=args.workers, seed=args.seed)
+    for team_id in range(2):
+        low, high = summary['win_ci'][team_id]
+        print(f"Team {team_id} match-win probability: {summary['win_prob'][team_id]:.3f}  [{low:.3f}, {high:.3f}]")
+    print(f"Match length: mean {summary['mean_rounds']:.1f} rounds, median {summary['median_rounds']:.0f}")
+    print(f"Rounds distribution: {summary['rounds_distribution']}")
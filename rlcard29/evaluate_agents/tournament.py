@@ -0,0 +1,166 @@
+"""
+File: rlcard29/evaluate_agents/tournament.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Parallel tournament engine for the 29 card game.
+# Games are played in chunks; chunk i runs in a TwentyNineEnv seeded with worker_seed(seed, i),
+# so results only depend on the seed, never on the number of processes. Per-game payoffs are
+# streamed back chunk by chunk, summarised with normal confidence intervals per seat and per
+# team, and an optional pair of SPRTs on team 0's win rate stops the tournament once it is
+# decided: one team is stronger, or neither is by more than the margin.
+
+import math
+from multiprocessing import Pool
+from statistics import NormalDist
+import numpy as np
+from rlcard29.envs.twenty_nine import TwentyNineEnv
+from rlcard29.games.twenty_nine.utils import worker_seed
+
+_worker_agents = None
+_worker_config = None
+
+def play_games(env, agents, num_games):
+    """Play num_games rounds with the agents' eval_step; returns the (num_games, 4) payoffs."""
+    env.set_agents(agents)
+    payoffs = np.zeros((num_games, env.num_players), dtype=np.int8)
+    for game_id in range(num_games):
+        state, player_id = env.reset()
+        while not env.is_over():
+            action, _ = agents[player_id].eval_step(state)
+            state, player_id = env.step(action, agents[player_id].use_raw)
+        payoffs[game_id] = env.get_payoffs()
+    return payoffs
+
+def _play_chunk(agents, config, seed, chunk_id, num_games):
+    chunk_seed = worker_seed(seed, chunk_id)
+    # Agents such as rlcard's RandomAgent draw from the global generator
+    np.random.seed(chunk_seed % (1 << 32))
+    env_config = dict(config)
+    env_config['seed'] = chunk_seed
+    env_config.pop('worker_id', None)
+    return play_games(TwentyNineEnv(env_config), agents, num_games)
+
+def _init_worker(agent_factory, config):
+    global _worker_agents, _worker_config
+    _worker_agents = agent_factory()
+    _worker_config = config
+
+def _worker_chunk(task):
+    seed, chunk_id, num_games = task
+    return _play_chunk(_worker_agents, _worker_config, seed, chunk_id, num_games)
+
+def sprt_llr(wins, losses, p0, p1):
+    """Log-likelihood ratio of team 0 win rate p1 (H1) against p0 (H0)."""
+    return wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+
+def sprt_decision(wins, losses, margin, alpha=0.05, beta=0.05):
+    """
+    Two one-sided SPRTs of team 0 win rate 0.5 (H0) against 0.5 + margin and 0.5 - margin
+    (H1), each with type I error alpha / 2 and type II error beta. Returns (decision, llrs):
+    'team0' or 'team1' once that side accepts H1, 'no_difference' once both accept H0,
+    otherwise None. llrs holds the (up, down) log-likelihood ratios.
+    """
+    upper, lower = math.log((1 - beta) / (alpha / 2)), math.log(beta / (1 - alpha / 2))
+    llrs = (sprt_llr(wins, losses, 0.5, 0.5 + margin), sprt_llr(wins, losses, 0.5, 0.5 - margin))
+    if llrs[0] >= upper:
+        return 'team0', llrs
+    if llrs[1] >= upper:
+        return 'team1', llrs
+    if llrs[0] <= lower and llrs[1] <= lower:
+        return 'no_difference', llrs
+    return None, llrs
+
+def summarize(payoffs, alpha=0.05):
+    """
+    Means and (1 - alpha) normal confidence intervals of (N, 4) per-game payoffs.
+    Team t's payoff is that of seat t; partners always score the same.
+    """
+    payoffs = np.asarray(payoffs, dtype=float)
+    num_games = len(payoffs)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    mean = payoffs.mean(axis=0) if num_games else np.zeros(payoffs.shape[1])
+    std = payoffs.std(axis=0, ddof=1) if num_games > 1 else np.zeros(payoffs.shape[1])
+    half_width = z * std / math.sqrt(max(num_games, 1))
+    seat_ci = [(float(m - h), float(m + h)) for m, h in zip(mean, half_width)]
+    wins = int((payoffs[:, 0] > 0).sum())
+    losses = int((payoffs[:, 0] < 0).sum())
+    return {
+        'num_games': num_games,
+        'seat_mean': [float(m) for m in mean],
+        'seat_ci': seat_ci,
+        'team_mean': [float(mean[0]), float(mean[1])],
+        'team_ci': seat_ci[:2],
+        'team0_wins': wins,
+        'team0_losses': losses,
+        'team0_win_rate': wins / max(wins + losses, 1),
+    }
+
+def run_tournament(agent_factory, num_games, num_workers=None, config=None, seed=0, chunk_size=50,
+                   alpha=0.05, early_stop=False, margin=0.05, beta=0.05, min_games=100, callback=None):
+    """
+    Play up to num_games rounds of agent_factory()'s four agents, one chunk of chunk_size games
+    per task, over num_workers processes (1 plays in this process).
+
+    Args:
+        agent_factory (callable): picklable function returning the list of 4 agents; every
+            process builds its own agents once
+        config (dict): TwentyNineEnv config; 'seed' is set per chunk
+        alpha (float): confidence level of the intervals and type I error of the SPRT
+        early_stop (bool): stop once sprt_decision() decides, after at least min_games games
+        callback (callable): called with the summary after every chunk
+
+    Returns:
+        (dict): summarize() of all payoffs plus 'payoffs' (N, 4), 'llr' (up, down) and
+            'decision' of sprt_decision() on the games played ('team0', 'team1',
+            'no_difference' or None if undecided)
+    """
+    config = dict(config or {})
+    config.setdefault('game_log_mode', 'off')
+    tasks = [(seed, chunk_id, min(chunk_size, num_games - start))
+             for chunk_id, start in enumerate(range(0, num_games, chunk_size))]
+    all_payoffs = np.zeros((num_games, 4), dtype=np.int8)
+    played = 0
+    summary = summarize(all_payoffs[:0], alpha)
+    decision = None
+    llr = (0.0, 0.0)
+
+    def consume(results):
+        nonlocal summary, decision, llr, played
+        for payoffs in results:
+            all_payoffs[played:played + len(payoffs)] = payoffs
+            played += len(payoffs)
+            summary = summarize(all_payoffs[:played], alpha)
+            decision, llr = sprt_decision(summary['team0_wins'], summary['team0_losses'], margin, alpha, beta)
+            if callback is not None:
+                callback(summary)
+            if early_stop and summary['num_games'] >= min_games and decision is not None:
+                return
+
+    if num_workers == 1:
+        agents = agent_factory()
+        consume(_play_chunk(agents, config, *task) for task in tasks)
+    else:
+        with Pool(num_workers, initializer=_init_worker, initargs=(agent_factory, config)) as pool:
+            consume(pool.imap(_worker_chunk, tasks))
+    summary['payoffs'] = all_payoffs[:played]
+    summary['llr'] = llr
+    summary['decision'] = decision
+    return summary
+
+def format_summary(summary, labels=('Player 0', 'Player 1', 'Player 2', 'Player 3')):
+    """Human-readable lines for a tournament summary."""
+    lines = [f"Games played: {summary['num_games']}"]
+    for label, mean, (low, high) in zip(labels, summary['seat_mean'], summary['seat_ci']):
+        lines.append(f"{label}: {mean:+.3f}  [{low:+.3f}, {high:+.3f}]")
+    for team_id in range(2):
+        low, high = summary['team_ci'][team_id]
+        lines.append(f"Team {team_id}: {summary['team_mean'][team_id]:+.3f}  [{low:+.3f}, {high:+.3f}]")
+    if summary.get('decision') in ('team0', 'team1'):
+        lines.append(f"SPRT after {summary['num_games']} games: Team {summary['decision'][-1]} is stronger")
+    elif summary.get('decision') == 'no_difference':
+        lines.append(f"SPRT after {summary['num_games']} games: no significant difference between the teams")
+    else:
+        lines.append(f"SPRT undecided after {summary['num_games']} games")
+    return lines
@@ -5,4 +5,6 @@ Date: 2025-06-28
 """
     
 # RLCard29: 29 card game Bangladeshi variant
-# This package implements the 29 card game logic for RLCard 
\ No newline at end of file
+# This package implements the 29 card game logic for RLCard 
+
+from rlcard29.games.twenty_nine.determinization import DeterminizationSampler
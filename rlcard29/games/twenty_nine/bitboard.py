@@ -0,0 +1,92 @@
+"""
+File: rlcard29/games/twenty_nine/bitboard.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Bitboard primitives for the 29 card game.
+# A set of cards is a 32-bit integer where bit i is the card encode_card() maps to i,
+# so every suit occupies one byte and, inside a suit, lower bits are higher ranks.
+
+from rlcard29.games.twenty_nine.utils import SUITS, RANKS, CARD_POINTS, decode_card
+
+NUM_CARDS = 32
+FULL_MASK = (1 << NUM_CARDS) - 1
+
+CARD_NAMES = tuple(decode_card(i) for i in range(NUM_CARDS))
+CARD_INDEX = {card: i for i, card in enumerate(CARD_NAMES)}
+CARD_BITS = tuple(1 << i for i in range(NUM_CARDS))
+CARD_POINTS_BY_INDEX = tuple(CARD_POINTS[RANKS[i % 8]] for i in range(NUM_CARDS))
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+SUIT_MASKS = tuple(0xFF << (8 * i) for i in range(len(SUITS)))
+
+# Card points, card indices and card strings held by every possible one-suit byte
+_BYTE_POINTS = tuple(
+    sum(CARD_POINTS[RANKS[r]] for r in range(8) if byte >> r & 1) for byte in range(256)
+)
+_BYTE_INDICES = tuple(
+    tuple(tuple(8 * s + r for r in range(8) if byte >> r & 1) for byte in range(256))
+    for s in range(len(SUITS))
+)
+_BYTE_CARDS = tuple(
+    tuple(tuple(CARD_NAMES[i] for i in indices) for indices in suit_table)
+    for suit_table in _BYTE_INDICES
+)
+
+def cards_to_mask(cards):
+    """Convert an iterable of card strings (e.g., ['SJ', 'H9']) to a card mask."""
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[CARD_INDEX[card]]
+    return mask
+
+def mask_to_indices(mask):
+    """Return the card indices set in mask, in encode_card order."""
+    return [*_BYTE_INDICES[0][mask & 0xFF], *_BYTE_INDICES[1][(mask >> 8) & 0xFF],
+            *_BYTE_INDICES[2][(mask >> 16) & 0xFF], *_BYTE_INDICES[3][mask >> 24]]
+
+def mask_to_cards(mask):
+    """Return the card strings set in mask, in encode_card order."""
+    return [*_BYTE_CARDS[0][mask & 0xFF], *_BYTE_CARDS[1][(mask >> 8) & 0xFF],
+            *_BYTE_CARDS[2][(mask >> 16) & 0xFF], *_BYTE_CARDS[3][mask >> 24]]
+
+def lowest_card(mask):
+    """Return the index of the lowest set bit (the highest ranked card of the lowest suit)."""
+    return (mask & -mask).bit_length() - 1
+
+def mask_points(mask):
+    """Return the total card points of the cards in mask."""
+    return (_BYTE_POINTS[mask & 0xFF] + _BYTE_POINTS[(mask >> 8) & 0xFF]
+            + _BYTE_POINTS[(mask >> 16) & 0xFF] + _BYTE_POINTS[mask >> 24])
+
+def legal_play_mask(hand_mask, led_suit, trump_suit, trump_revealed):
+    """
+    Return the cards of hand_mask that may be played.
+    led_suit and trump_suit are suit indices; led_suit is None when leading the trick.
+    """
+    if led_suit is None:
+        return hand_mask
+    follow = hand_mask & SUIT_MASKS[led_suit]
+    if follow:
+        return follow
+    if trump_revealed:
+        trumps = hand_mask & SUIT_MASKS[trump_suit]
+        if trumps:
+            return trumps
+    return hand_mask
+
+def trick_winning_card(trick_mask, led_card, trump_suit, trump_revealed):
+    """
+    Return the index of the card that wins a complete trick.
+    Follows TwentyNineGame's rules: once revealed the highest trump wins, otherwise the
+    highest card of the led suit wins, and an unrevealed trump lead cannot be beaten.
+    """
+    led_suit = led_card >> 3
+    if trump_revealed:
+        trumps = trick_mask & SUIT_MASKS[trump_suit]
+        if trumps:
+            return lowest_card(trumps)
+    elif led_suit == trump_suit:
+        return led_card
+    return lowest_card(trick_mask & SUIT_MASKS[led_suit])
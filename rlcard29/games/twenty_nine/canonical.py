@@ -0,0 +1,137 @@
+"""
+File: rlcard29/games/twenty_nine/canonical.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Suit-isomorphism canonicalization for the 29 card game.
+# Until trump is chosen the game is symmetric under the 24 permutations of SUITS, so hands
+# and bidding-phase information sets can be keyed by one canonical representative.
+# A permutation `perm` is a tuple where perm[s] is the canonical suit of original suit s.
+
+from functools import lru_cache
+from itertools import permutations
+from math import comb
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import NUM_CARDS, mask_to_indices
+from rlcard29.games.twenty_nine.encoding import TRUMP_ACTION_OFFSET
+from rlcard29.games.twenty_nine.utils import SUITS
+
+NUM_SUITS = len(SUITS)
+SUIT_PERMUTATIONS = tuple(permutations(range(NUM_SUITS)))
+IDENTITY = SUIT_PERMUTATIONS[0]
+
+# BINOMIAL[n][k] = C(n, k), used for the colex rank of a hand
+BINOMIAL = tuple(tuple(comb(n, k) for k in range(NUM_CARDS + 1)) for n in range(NUM_CARDS + 1))
+
+def inverse_permutation(perm):
+    """Return the permutation that undoes perm."""
+    inverse = [0] * NUM_SUITS
+    for suit, canonical_suit in enumerate(perm):
+        inverse[canonical_suit] = suit
+    return tuple(inverse)
+
+def permute_mask(mask, perm):
+    """Move every suit byte s of a card mask to byte perm[s]."""
+    return ((mask & 0xFF) << (8 * perm[0]) | ((mask >> 8) & 0xFF) << (8 * perm[1])
+            | ((mask >> 16) & 0xFF) << (8 * perm[2]) | ((mask >> 24) & 0xFF) << (8 * perm[3]))
+
+def permute_card(card_index, perm):
+    """Map a card index through perm."""
+    return 8 * perm[card_index >> 3] + (card_index & 7)
+
+def permute_action_id(action_id, perm):
+    """Map an action id through perm; cards and trump suits move, bids and pass do not."""
+    if action_id < NUM_CARDS:
+        return permute_card(action_id, perm)
+    if action_id >= TRUMP_ACTION_OFFSET:
+        return TRUMP_ACTION_OFFSET + perm[action_id - TRUMP_ACTION_OFFSET]
+    return action_id
+
+def unpermute_action_id(action_id, perm):
+    """Map an action id chosen in the canonical frame back to the original suits."""
+    return permute_action_id(action_id, inverse_permutation(perm))
+
+def canonical_hand(mask):
+    """
+    Return (canonical_mask, perm) for a hand mask.
+    The canonical hand orders its suit bytes from largest to smallest, so the suit holding the
+    highest cards becomes suit 0; ties keep the original suit order.
+    """
+    suit_bytes = ((mask & 0xFF, 0), ((mask >> 8) & 0xFF, 1), ((mask >> 16) & 0xFF, 2), (mask >> 24, 3))
+    ordered = sorted(suit_bytes, key=lambda item: (-item[0], item[1]))
+    perm = [0] * NUM_SUITS
+    canonical_mask = 0
+    for canonical_suit, (byte, suit) in enumerate(ordered):
+        perm[suit] = canonical_suit
+        canonical_mask |= byte << (8 * canonical_suit)
+    return canonical_mask, tuple(perm)
+
+def canonical_bidding_infoset(hand_mask, bid_history, player_id):
+    """
+    Canonicalize a bidding-phase information set (own hand, public bid history, seat).
+    Bids carry no suit, so only the hand is permuted.
+    Returns ((canonical_mask, bid_history tuple, player_id), perm).
+    """
+    canonical_mask, perm = canonical_hand(hand_mask)
+    return (canonical_mask, tuple(bid_history), player_id), perm
+
+def hand_rank(mask):
+    """Return the colex rank of a hand among all hands with the same number of cards."""
+    rank = 0
+    for i, card_index in enumerate(mask_to_indices(mask)):
+        rank += BINOMIAL[card_index][i + 1]
+    return rank
+
+@lru_cache(maxsize=None)
+def canonical_index_table(num_cards):
+    """
+    Precompute the canonical class of every num_cards-card hand.
+    Returns (classes, representatives): classes[hand_rank(mask)] is the dense canonical index
+    of the hand and representatives[index] is the canonical mask of that class.
+    Built on first use for each hand size (about 10.5M hands for 8 cards) and cached.
+    """
+    byte_values = np.arange(256, dtype=np.int64)
+    byte_sizes = np.array([bin(b).count('1') for b in range(256)])
+    bytes_of_size = [byte_values[byte_sizes == size] for size in range(9)]
+
+    num_hands = comb(NUM_CARDS, num_cards)
+    canonical_by_rank = np.zeros(num_hands, dtype=np.uint32)
+    for sizes in _suit_compositions(num_cards):
+        grids = np.meshgrid(*[bytes_of_size[size] for size in sizes], indexing='ij')
+        suit_bytes = np.stack([grid.ravel() for grid in grids], axis=1)
+        masks = (suit_bytes[:, 0] | suit_bytes[:, 1] << 8 | suit_bytes[:, 2] << 16
+                 | suit_bytes[:, 3] << 24)
+        ordered = -np.sort(-suit_bytes, axis=1)
+        canonical = ordered[:, 0] | ordered[:, 1] << 8 | ordered[:, 2] << 16 | ordered[:, 3] << 24
+        canonical_by_rank[_colex_ranks(masks, num_cards)] = canonical
+
+    representatives, classes = np.unique(canonical_by_rank, return_inverse=True)
+    return classes.astype(np.int32), representatives
+
+def canonical_index(mask):
+    """Return the dense canonical index of a hand among hands of the same size."""
+    classes, _ = canonical_index_table(mask.bit_count())
+    return int(classes[hand_rank(mask)])
+
+def num_canonical_hands(num_cards):
+    """Return the number of suit-isomorphism classes of num_cards-card hands."""
+    return len(canonical_index_table(num_cards)[1])
+
+def _suit_compositions(num_cards):
+    for s0 in range(min(8, num_cards) + 1):
+        for s1 in range(min(8, num_cards - s0) + 1):
+            for s2 in range(min(8, num_cards - s0 - s1) + 1):
+                s3 = num_cards - s0 - s1 - s2
+                if s3 <= 8:
+                    yield s0, s1, s2, s3
+
+def _colex_ranks(masks, num_cards):
+    binomial = np.array(BINOMIAL, dtype=np.int64)
+    ranks = np.zeros(len(masks), dtype=np.int64)
+    seen = np.zeros(len(masks), dtype=np.int64)
+    for card_index in range(NUM_CARDS):
+        held = (masks >> card_index) & 1
+        ranks += held * binomial[card_index, np.minimum(seen + 1, num_cards)]
+        seen += held
+    return ranks
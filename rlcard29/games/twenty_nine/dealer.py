@@ -5,27 +5,52 @@ Date: 2025-06-28
 """
     
 import random
+import numpy as np
 from rlcard29.games.twenty_nine.utils import get_deck
 
+NUM_CARDS = len(get_deck())
+
+def shuffled_decks(np_random, num_decks):
+    """Return a (num_decks, 32) int8 array of shuffled decks of card indices drawn from np_random."""
+    return np.argsort(np_random.random_sample((num_decks, NUM_CARDS)), axis=1).astype(np.int8)
+
 class Dealer:
     """
     Handles dealing, bidding, and trump selection for the 29 card game.
     """
-    def __init__(self):
-        self.deck = []
+    def __init__(self, np_random=None):
+        self.np_random = np_random if np_random is not None else np.random.RandomState()
+        self.deck = ()
+        self.top = 0  # Cards are dealt from the end: deck[:top] is still undealt
         self.trump_suit = None
         self.bid_winner = None
         self.bid_value = None
 
     def shuffle(self):
-        self.deck = get_deck()
-        random.shuffle(self.deck)
+        self.deck = tuple(self.np_random.permutation(NUM_CARDS).tolist())  # Card indices in encode_card order
+        self.top = NUM_CARDS
+
+    def shuffled_decks(self, num_decks):
+        """Pre-generate num_decks shuffled decks from this dealer's generator as a (num_decks, 32) array."""
+        return shuffled_decks(self.np_random, num_decks)
 
     def deal(self, players, num_cards=4):
         """Deal num_cards to each player."""
         for player in players:
-            cards = [self.deck.pop() for _ in range(num_cards)]
-            player.receive_cards(cards)
+            mask = 0
+            for _ in range(num_cards):
+                self.top -= 1
+                mask |= 1 << self.deck[self.top]
+            player.receive_mask(mask)
+
+    def undeal(self, players, num_cards=4):
+        """Take back the cards of the last deal(players, num_cards) and return them to the deck."""
+        for player in reversed(players):
+            mask = 0
+            for i in range(self.top, self.top + num_cards):
+                mask |= 1 << self.deck[i]
+            player.hand_mask &= ~mask
+            self.top += num_cards
 
     def conduct_bidding(self, players, min_bid=16, max_bid=28):
         """Conduct the bidding phase (Bangladeshi rules). Returns (winner, bid_value)."""
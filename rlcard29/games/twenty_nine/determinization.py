@@ -0,0 +1,239 @@
+"""
+File: rlcard29/games/twenty_nine/determinization.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Determinization sampler for the 29 card game.
+# Draws full deals (8 cards per seat, minus the cards already played) that agree with
+# everything one player has seen:
+#   - the player's own cards (4 before trump selection, 8 afterwards)
+#   - cards played so far and how many cards each seat still holds
+#   - suits a seat showed void in by not following suit, and the trump suit once a seat
+#     discarded something else after the reveal
+#   - the trump suit: known to the bidder and after the reveal; before the reveal a trick
+#     the leader won with a lower card shows the led suit is trump, and one the leader
+#     lost rules the led suit out
+# Deals are sampled exactly uniformly among consistent deals: per-suit card counts are
+# drawn seat by seat from a counting DP over suits, then cards are shuffled within suits.
+
+from functools import lru_cache
+from math import comb
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import (
+    CARD_INDEX, FULL_MASK, SUIT_INDEX, SUIT_MASKS, cards_to_mask, mask_to_indices,
+)
+
+NUM_PLAYERS = 4
+NUM_SUITS = 4
+HAND_SIZE = 8
+ALL_TRUMPS = 0b1111
+
+@lru_cache(maxsize=None)
+def _suit_splits(suit_count, capacities):
+    """Every way to split suit_count cards among seats holding at most capacities[i] each."""
+    if not capacities:
+        return ((),) if suit_count == 0 else ()
+    splits = []
+    for first in range(min(suit_count, capacities[0]) + 1):
+        for rest in _suit_splits(suit_count - first, capacities[1:]):
+            splits.append((first,) + rest)
+    return tuple(splits)
+
+@lru_cache(maxsize=65536)
+def _split_options(suit_counts, allowed, suit, needs):
+    """Return (splits, weights) for one suit given the cards each seat still needs."""
+    if suit == NUM_SUITS:
+        return ((), ()) if any(needs) else (((),), (1,))
+    capacities = tuple(need if allowed[i] >> suit & 1 else 0 for i, need in enumerate(needs))
+    splits, weights = [], []
+    for split in _suit_splits(suit_counts[suit], capacities):
+        rest = tuple(need - taken for need, taken in zip(needs, split))
+        ways = _count_deals(suit_counts, allowed, suit + 1, rest)
+        if ways:
+            multinomial, left = 1, suit_counts[suit]
+            for taken in split:
+                multinomial *= comb(left, taken)
+                left -= taken
+            splits.append(split)
+            weights.append(multinomial * ways)
+    return tuple(splits), tuple(weights)
+
+@lru_cache(maxsize=65536)
+def _count_deals(suit_counts, allowed, suit, needs):
+    """Number of card assignments of suits suit..3 that give every seat exactly its need."""
+    return sum(_split_options(suit_counts, allowed, suit, needs)[1])
+
+class DeterminizationSampler:
+    """
+    Tracks one player's public and private information during a round and samples full
+    deals consistent with it. Feed it with reset() / observe_cards() / observe_trump() /
+    observe_play() as the round goes on, or rebuild it with from_game().
+    """
+    def __init__(self, player_id, np_random=None):
+        self.player_id = player_id
+        self.np_random = np_random if np_random is not None else np.random.RandomState()
+        self.reset(0)
+
+    def reset(self, hand_mask):
+        """Start a new round holding hand_mask (the first 4 cards)."""
+        self.hand_mask = hand_mask
+        self.played_mask = 0
+        self.num_played = [0] * NUM_PLAYERS
+        self.allowed_suits = [ALL_TRUMPS] * NUM_PLAYERS # Bit s: the seat may still hold suit s
+        self.possible_trumps = ALL_TRUMPS
+        self.trump_revealed = False
+        self.trick = [] # (player_id, card_index) of the current trick
+        self._unresolved_trick = None # Last trick, waiting for its winner to lead
+        self._late_discards = [] # (player_id, suit) discarded off-suit after the reveal
+
+    def observe_cards(self, hand_mask):
+        """Update the player's own cards (e.g. after the second deal)."""
+        self.hand_mask = hand_mask
+
+    def observe_trump(self, suit):
+        """Record the trump suit once the player knows it (own trump choice or the reveal)."""
+        if isinstance(suit, str):
+            suit = SUIT_INDEX[suit]
+        self.possible_trumps = 1 << suit
+        for player_id, discard_suit in self._late_discards:
+            if discard_suit != suit:
+                self.allowed_suits[player_id] &= ~(1 << suit)
+        self._late_discards = []
+
+    def observe_play(self, player_id, card):
+        """Record a card played by any seat, in play order."""
+        card_index = CARD_INDEX[card] if isinstance(card, str) else card
+        if self._unresolved_trick is not None: # The winner of the last trick leads
+            self.observe_trick_winner(player_id)
+        if self.trick:
+            led_suit = self.trick[0][1] >> 3
+            suit = card_index >> 3
+            if suit != led_suit:
+                self.allowed_suits[player_id] &= ~(1 << led_suit)
+                if self.trump_revealed:
+                    # A seat holding trump must play it once the trump is revealed
+                    if self.possible_trumps & (self.possible_trumps - 1):
+                        self._late_discards.append((player_id, suit))
+                    elif not self.possible_trumps >> suit & 1:
+                        self.allowed_suits[player_id] &= ~self.possible_trumps
+                self.trump_revealed = True
+
+        self.trick.append((player_id, card_index))
+        self.played_mask |= 1 << card_index
+        self.num_played[player_id] += 1
+        if player_id == self.player_id:
+            self.hand_mask &= ~(1 << card_index)
+        if len(self.trick) == NUM_PLAYERS:
+            if not self.trump_revealed:
+                self._unresolved_trick = self.trick
+            self.trick = []
+
+    def observe_trick_winner(self, winner_id):
+        """
+        Record who won the last trick. Optional: observe_play() infers it from the next lead,
+        so this is only needed after the last trick played so far.
+        """
+        trick, self._unresolved_trick = self._unresolved_trick, None
+        if trick is None:
+            return
+        # Unrevealed trick: everyone followed, and the leader keeps it only when the led suit is trump
+        leader_id, led_card = trick[0]
+        best_card = min(card_index for _, card_index in trick)
+        if best_card == led_card:
+            return
+        led_suit_bit = 1 << (led_card >> 3)
+        if winner_id == leader_id:
+            self.possible_trumps &= led_suit_bit
+        else:
+            self.possible_trumps &= ~led_suit_bit
+
+    @classmethod
+    def from_game(cls, game, player_id, np_random=None):
+        """Build the sampler for player_id from a TwentyNineGame's public history."""
+        sampler = cls(player_id, np_random)
+        sampler.reset(game.players[player_id].hand_mask)
+        if game.trump_index is not None and (game.trump_revealed or player_id == game.bid_winner):
+            sampler.observe_trump(game.trump_index)
+        sampler._replay(game.trick_history, game.trick)
+        return sampler
+
+    @classmethod
+    def from_state(cls, state, trump_suit=None, np_random=None):
+        """
+        Build the sampler from a raw TwentyNineGame state. trump_suit is the player's own
+        trump choice, which the state only shows once it is revealed.
+        """
+        sampler = cls(state['player_id'], np_random)
+        sampler.reset(cards_to_mask(state['hand']))
+        trump_suit = state['trump_suit'] or trump_suit
+        if trump_suit is not None:
+            sampler.observe_trump(trump_suit)
+        sampler._replay(state['trick_history'], state['trick'])
+        return sampler
+
+    def _replay(self, trick_history, trick):
+        for past_trick, _, _ in trick_history:
+            for seat, card in past_trick:
+                self.observe_play(seat, card)
+        if trick_history:
+            self.observe_trick_winner(trick_history[-1][1])
+        for seat, card in trick:
+            self.observe_play(seat, card)
+
+    def sample(self, num_samples):
+        """
+        Draw num_samples consistent deals.
+
+        Returns:
+            hands (np.ndarray): (num_samples, 4) int64 card masks of the cards every seat holds
+            trumps (np.ndarray): (num_samples,) trump suit index, uniform over the suits still possible
+        """
+        rng = self.np_random
+        own = self.player_id
+        known = [0] * NUM_PLAYERS
+        known[own] = self.hand_mask
+        needs = [HAND_SIZE - self.num_played[p] - known[p].bit_count() for p in range(NUM_PLAYERS)]
+        unknown_mask = FULL_MASK & ~self.played_mask & ~self.hand_mask
+        seats = tuple(p for p in range(NUM_PLAYERS) if needs[p] > 0)
+        suit_counts = tuple((unknown_mask & SUIT_MASKS[s]).bit_count() for s in range(NUM_SUITS))
+        allowed = tuple(ALL_TRUMPS if p == own else self.allowed_suits[p] for p in seats)
+        seat_needs = tuple(needs[p] for p in seats)
+        if _count_deals(suit_counts, allowed, 0, seat_needs) == 0:
+            raise ValueError("No deal is consistent with the observed play")
+
+        # Draw the (seat, suit) count matrix of every sample, suit by suit
+        counts = np.zeros((num_samples, len(seats), NUM_SUITS), dtype=np.int64)
+        states = {seat_needs: np.arange(num_samples)}
+        for suit in range(NUM_SUITS):
+            next_states = {}
+            for state, rows in states.items():
+                splits, weights = _split_options(suit_counts, allowed, suit, state)
+                weights = np.array(weights, dtype=np.float64)
+                choice = rng.choice(len(splits), size=len(rows), p=weights / weights.sum())
+                for option in np.unique(choice):
+                    split = splits[option]
+                    chosen = rows[choice == option]
+                    counts[chosen, :, suit] = split
+                    rest = tuple(need - taken for need, taken in zip(state, split))
+                    next_states.setdefault(rest, []).append(chosen)
+            states = {state: np.concatenate(parts) for state, parts in next_states.items()}
+
+        # Shuffle the unknown cards within suits and hand them out by the counts
+        pool = np.array(mask_to_indices(unknown_mask), dtype=np.int64)
+        pool_suits = pool >> 3
+        order = np.argsort(rng.random((num_samples, len(pool))) + 2 * pool_suits, axis=1)
+        card_bits = np.left_shift(np.int64(1), pool[order])
+        suit_starts = np.concatenate(([0], np.cumsum(suit_counts)[:-1]))
+        rank_in_suit = np.arange(len(pool)) - suit_starts[pool_suits]
+        boundaries = np.cumsum(counts, axis=1)[:, :, pool_suits] # (n, seats, pool)
+        labels = (boundaries <= rank_in_suit).sum(axis=1)
+
+        hands = np.zeros((num_samples, NUM_PLAYERS), dtype=np.int64)
+        hands[:, own] = self.hand_mask
+        for i, seat in enumerate(seats):
+            hands[:, seat] |= np.where(labels == i, card_bits, 0).sum(axis=1)
+
+        trump_choices = np.array([s for s in range(NUM_SUITS) if self.possible_trumps >> s & 1])
+        trumps = trump_choices[rng.randint(len(trump_choices), size=num_samples)]
+        return hands, trumps
@@ -0,0 +1,144 @@
+"""
+File: rlcard29/games/twenty_nine/encoding.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Observation encoding for the 29 card game, shared by TwentyNineEnv and VectorTwentyNineGame.
+# Layout of the 128-long observation:
+#   [0:32]   cards in hand, bit i is the card encode_card() maps to i
+#   [32:83]  legal-action mask over the 51 action ids
+#   [83]     current bid value
+#   [84:128] unused
+
+from types import MappingProxyType
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import CARD_NAMES, CARD_INDEX, NUM_CARDS
+from rlcard29.games.twenty_nine.utils import SUITS
+
+OBS_SIZE = 128
+NUM_ACTIONS = 51
+LEGAL_OFFSET = NUM_CARDS
+BID_OFFSET = LEGAL_OFFSET + NUM_ACTIONS
+
+# Bumped whenever the layout changes; stored in DQN checkpoints as 'encoding_version'.
+# Version 1 (checkpoints without the key) wrote the bid over obs[0].
+ENCODING_VERSION = 2
+
+# Action ids: cards 0-31 (encode_card order), bids '16'-'29' 32-45, 'pass' 46, trump suits 47-50
+BID_ACTION_OFFSET = 16
+PASS_ACTION = 46
+TRUMP_ACTION_OFFSET = 47
+ACTION_LIST = CARD_NAMES + tuple(str(bid) for bid in range(16, 30)) + ('pass',) + tuple(SUITS)
+ACTION_IDS = MappingProxyType({action: action_id for action_id, action in enumerate(ACTION_LIST)})
+
+# Observation position set by each hand card / legal raw action
+_HAND_POSITIONS = dict(CARD_INDEX)
+_LEGAL_POSITIONS = {action: LEGAL_OFFSET + action_id for action, action_id in ACTION_IDS.items()}
+
+# Bit positions set in every byte value
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+def check_encoding_version(checkpoint):
+    """Raise ValueError if a model checkpoint dict was trained on another observation layout."""
+    version = checkpoint.get('encoding_version', 1)
+    if version != ENCODING_VERSION:
+        raise ValueError(f"Checkpoint was trained on observation encoding version {version}, but this "
+                         f"build encodes version {ENCODING_VERSION}; retrain the model")
+
+def action_mask_to_ids(mask):
+    """Return the action ids set in an action bitmask, in increasing order."""
+    ids = []
+    offset = 0
+    while mask:
+        ids.extend(offset + bit for bit in _BYTE_BITS[mask & 0xFF])
+        mask >>= 8
+        offset += 8
+    return ids
+
+class ObservationEncoder:
+    """
+    Table-driven encoder from raw game states to observations.
+    Every card and raw action maps to a precomputed observation position, so encoding is
+    a handful of dictionary lookups and element writes into one buffer.
+    """
+    def encode(self, state, out=None):
+        """
+        Encode one raw state.
+
+        Args:
+            state (dict): raw state from TwentyNineGame.get_state
+            out (np.ndarray): optional 128-long buffer to write into; a new one is allocated
+                otherwise, since agents keep references to the observations they are given
+
+        Returns:
+            obs (np.ndarray): the observation
+            legal_actions (dict): legal action id -> raw action
+            action_mask (np.ndarray): the 51-long legal-action mask, a view into obs
+        """
+        if out is None:
+            obs = np.zeros(OBS_SIZE, dtype=int)
+        else:
+            obs = out
+            obs.fill(0)
+        for card in state['hand']:
+            obs[_HAND_POSITIONS[card]] = 1
+        legal_actions = {}
+        for action in state['legal_actions']:
+            obs[_LEGAL_POSITIONS[action]] = 1
+            legal_actions[ACTION_IDS[action]] = action
+        obs[BID_OFFSET] = state['bid_value']
+        return obs, legal_actions, obs[LEGAL_OFFSET:BID_OFFSET]
+
+    def encode_batch(self, states, out=None):
+        """
+        Encode many raw states into one (N, 128) buffer.
+
+        Args:
+            states (list): raw states from TwentyNineGame.get_state
+            out (np.ndarray): optional preallocated buffer with at least N rows; the first N are written
+
+        Returns:
+            obs (np.ndarray): (N, 128) observations
+            action_mask (np.ndarray): (N, 51) legal-action masks, a view into obs
+        """
+        num_states = len(states)
+        if out is None:
+            obs = np.zeros((num_states, OBS_SIZE), dtype=int)
+        else:
+            obs = out[:num_states]
+            obs.fill(0)
+        rows, cols = [], []
+        for i, state in enumerate(states):
+            positions = [_HAND_POSITIONS[card] for card in state['hand']]
+            positions += [_LEGAL_POSITIONS[action] for action in state['legal_actions']]
+            rows += [i] * len(positions)
+            cols += positions
+        obs[rows, cols] = 1
+        obs[:, BID_OFFSET] = [state['bid_value'] for state in states]
+        return obs, obs[:, LEGAL_OFFSET:BID_OFFSET]
+
+    def encode_game(self, game, out=None):
+        """
+        Encode the current player's view straight from a TwentyNineGame's masks, skipping the
+        raw state dict. Returns the observation and its legal-action mask view.
+        """
+        if out is None:
+            obs = np.zeros(OBS_SIZE, dtype=int)
+        else:
+            obs = out
+            obs.fill(0)
+        for position in action_mask_to_ids(game.players[game.current_player].hand_mask):
+            obs[position] = 1
+        for action_id in action_mask_to_ids(game.get_legal_action_mask()):
+            obs[LEGAL_OFFSET + action_id] = 1
+        obs[BID_OFFSET] = game.bid_value
+        return obs, obs[LEGAL_OFFSET:BID_OFFSET]
+
+    def encode_games(self, games, out=None):
+        """Encode the current player's view of many games into one (N, 128) buffer."""
+        num_games = len(games)
+        obs = np.zeros((num_games, OBS_SIZE), dtype=int) if out is None else out[:num_games]
+        for i, game in enumerate(games):
+            self.encode_game(game, obs[i])
+        return obs, obs[:, LEGAL_OFFSET:BID_OFFSET]
@@ -0,0 +1,100 @@
+"""
+File: rlcard29/games/twenty_nine/events.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Event sinks for TwentyNineGame.
+# The game records events as plain tuples (event_type, *fields); messages are only
+# formatted when the log is read through get_game_log().
+
+from collections import deque
+
+MESSAGE = 0
+ROUND_STARTED = 1
+MATCH_SCORE = 2
+ACTION = 3
+REDEAL = 4
+BIDDING_FINISHED = 5
+TRUMP_CHOSEN = 6
+TRUMP_REVEALED = 7
+TRICK = 8
+NO_BID = 9
+BID_RESULT = 10
+
+def _format_bid_result(team_id, bid_value, bid_target, points, successful, game_point_value):
+    if successful:
+        return (f"Team {team_id} fulfilled their bid of {bid_value} (target {bid_target}) by scoring "
+                f"{points}. They WIN {game_point_value} point(s).")
+    return (f"Team {team_id} FAILED their bid of {bid_value} (target {bid_target}) by scoring "
+            f"{points}. They LOSE {game_point_value} point(s).")
+
+_FORMATTERS = {
+    MESSAGE: lambda message: message,
+    ROUND_STARTED: lambda dealer_id: f"--- New Round Started --- Dealer is Player {dealer_id} ---",
+    MATCH_SCORE: lambda team0, team1: f"Current Match Score: Team 0 (0,2): {team0}, Team 1 (1,3): {team1}",
+    ACTION: lambda player_id, action: f"Player {player_id} attempts action: {action}",
+    REDEAL: lambda: "All players passed. Redealing for a new round.",
+    BIDDING_FINISHED: lambda player_id, bid_value: f"Bidding finished. Player {player_id} wins with a bid of {bid_value}.",
+    TRUMP_CHOSEN: lambda player_id, suit: f"Player {player_id} chose {suit} as the trump suit (secretly).",
+    TRUMP_REVEALED: lambda player_id, suit: f"Player {player_id} cannot follow suit. Trump is revealed: {suit}",
+    TRICK: lambda trick, winner_id: f"Trick: {[f'P{p}:{c}' for p, c in trick]} -> Winner: P{winner_id}",
+    NO_BID: lambda: "Round ended before a bid was made. No score change.",
+    BID_RESULT: _format_bid_result,
+}
+
+def format_event(event):
+    """Format an event tuple as a log message."""
+    return _FORMATTERS[event[0]](*event[1:])
+
+class NullEventLog:
+    """Disabled log. The game checks `enabled` before building any event."""
+    enabled = False
+
+    def record(self, event):
+        pass
+
+    def clear(self):
+        pass
+
+    def events(self):
+        return []
+
+    def get_log(self):
+        return []
+
+class StructuredEventLog:
+    """Keeps every event of the current round as a typed tuple."""
+    enabled = True
+
+    def __init__(self):
+        self._events = []
+        self.record = self._events.append
+
+    def clear(self):
+        self._events.clear()
+
+    def events(self):
+        return list(self._events)
+
+    def get_log(self):
+        return [format_event(event) for event in self._events]
+
+class RingEventLog(StructuredEventLog):
+    """Keeps the last `capacity` events, across rounds."""
+    def __init__(self, capacity=1024):
+        self._events = deque(maxlen=capacity)
+        self.record = self._events.append
+
+    def clear(self):
+        pass
+
+def make_event_log(mode='structured', capacity=1024):
+    """Build an event sink: 'off', 'ring' (last `capacity` events) or 'structured' (current round)."""
+    if mode == 'off':
+        return NullEventLog()
+    if mode == 'ring':
+        return RingEventLog(capacity)
+    if mode == 'structured':
+        return StructuredEventLog()
+    raise ValueError(f"Unknown game log mode: {mode}")
@@ -5,24 +5,40 @@ Date: 2025-06-28
 """
     
 import random
+import numpy as np
 from rlcard29.games.twenty_nine.dealer import Dealer
 from rlcard29.games.twenty_nine.player import Player
 from rlcard29.games.twenty_nine.judger import Judger
 from rlcard29.games.twenty_nine.utils import get_deck
+from rlcard29.games.twenty_nine import events
+from rlcard29.games.twenty_nine import infoset
+from rlcard29.games.twenty_nine.encoding import (
+    BID_ACTION_OFFSET, PASS_ACTION, TRUMP_ACTION_OFFSET, action_mask_to_ids,
+)
+from rlcard29.games.twenty_nine.bitboard import (
+    CARD_BITS, CARD_INDEX, CARD_NAMES, CARD_POINTS_BY_INDEX, FULL_MASK, SUIT_INDEX, SUIT_MASKS,
+    cards_to_mask, legal_play_mask, mask_points, mask_to_cards, trick_winning_card,
+)
+
+# Undo journal entry types, see TwentyNineGame.step_back
+_BID, _REDEAL, _TRUMP, _PLAY = range(4)
 
 class TwentyNineGame:
     """
     Main game engine for the 29 card game (Bangladeshi variant).
     Handles state, actions, transitions, and scoring.
     """
-    def __init__(self, allow_step_back=False):
-        """Initialize the game."""
+    def __init__(self, allow_step_back=False, event_log=None, np_random=None):
+        """
+        Initialize the game. event_log is a sink from events.make_event_log (default 'structured');
+        np_random is the game's own generator (TwentyNineEnv seeds it from config['seed']).
+        """
         self.allow_step_back = allow_step_back
         self.num_players = 4
         # Actions: 32 cards + 14 bids (16-29) + pass + 4 trump suits
         self.num_actions = 32 + 14 + 1 + 4
         self.players = [Player(i) for i in range(self.num_players)]
-        self.dealer = Dealer()
+        self.dealer = Dealer(np_random)
         self.dealer_id = 3 # Start with Player 3 as dealer
         self.match_scores = [0, 0]
         self.game_points_for_round = [0, 0]
@@ -30,24 +46,62 @@ class TwentyNineGame:
         self.bid_winner = None
         self.bid_value = 15
         self.trump_suit = None
+        self.trump_index = None
         self.trump_revealed = False
         self.phase = 'deal'
         self.current_player = 0
         self.trick = []
+        self.trick_mask = 0
+        self.led_card = None
         self.trick_leader = 0
-        self.trick_history = []
-        self.played_cards = set()
+        self.trick_history = [] # (trick tuple, winner_id, points) of every completed trick
+        self.played_mask = 0
+        self.team_points = [0, 0] # Card points taken so far by Team 0 (0,2) and Team 1 (1,3)
+        self._round_summary = None
         self.winner = None
-        self.logs = []  # Store detailed logs
+        self.event_log = event_log if event_log is not None else events.StructuredEventLog()
+        self._journal = []  # Deltas of each step of the round, recorded when allow_step_back is set
+        self._public_key = 0 # Public part of infoset_key(), kept up to date by every step
+        self._key_journal = [] # _public_key before each journaled step
 
     def log(self, message):
-        self.logs.append(message)
+        if self.event_log.enabled:
+            self.event_log.record((events.MESSAGE, message))
+
+    @property
+    def logs(self):
+        return self.get_game_log()
+
+    @property
+    def np_random(self):
+        return self.dealer.np_random
+
+    @np_random.setter
+    def np_random(self, np_random):
+        self.dealer.np_random = np_random
+
+    @property
+    def played_cards(self):
+        return set(mask_to_cards(self.played_mask))
+
+    def init_match(self):
+        """Starts a new match by clearing the match scores; init_game then deals its first round."""
+        self.match_scores = [0, 0]
 
     def init_game(self):
         """Initializes a new round, rotating the dealer."""
+        self.event_log.clear()
+        self._journal = []
+        self._key_journal = []
+        self._start_round()
+        return self.get_state(self.current_player), self.current_player
+
+    def _start_round(self):
+        """Rotates the dealer and deals the first 4 cards; also used to redeal after four passes."""
         self.dealer_id = (self.dealer_id + 1) % self.num_players
-        self.log(f"--- New Round Started --- Dealer is Player {self.dealer_id} ---")
-        self.log(f"Current Match Score: Team 0 (0,2): {self.match_scores[0]}, Team 1 (1,3): {self.match_scores[1]}")
+        if self.event_log.enabled:
+            self.event_log.record((events.ROUND_STARTED, self.dealer_id))
+            self.event_log.record((events.MATCH_SCORE, self.match_scores[0], self.match_scores[1]))
 
         for p in self.players:
             p.reset()
@@ -60,28 +114,42 @@ class TwentyNineGame:
         self.bid_value = 15
         self.bid_winner = None
         self.trump_suit = None
+        self.trump_index = None
         self.trump_revealed = False
         self.trick = []
+        self.trick_mask = 0
+        self.led_card = None
         self.trick_history = []
+        self.played_mask = 0
+        self.team_points = [0, 0]
+        self._round_summary = None
+        self._public_key = 0
         
         self.current_player = (self.dealer_id + 1) % self.num_players
         self.trick_leader = self.current_player
-        
-        return self.get_state(self.current_player), self.current_player
 
     def step(self, action):
         """Processes an action based on the current game phase."""
-        self.log(f"Player {self.current_player} attempts action: {action}")
+        self.apply(action)
+        return self.get_state(self.current_player), self.current_player
+
+    def apply(self, action):
+        """Advances the game by one raw action without building the next state."""
+        if self.event_log.enabled:
+            self.event_log.record((events.ACTION, self.current_player, action))
         
         if self.phase == 'bidding':
-            return self._step_bidding(action)
+            self._step_bidding(action)
         elif self.phase == 'trump_selection':
-            return self._step_trump_selection(action)
+            self._step_trump_selection(action)
         elif self.phase == 'play':
-            return self._step_play(action)
-        return self.get_state(self.current_player), self.current_player
+            self._step_play(action)
 
     def _step_bidding(self, action):
+        if self.allow_step_back:
+            self._journal.append((_BID, self.current_player, self.bid_value, self.bid_winner))
+            self._key_journal.append(self._public_key)
+
         if action == 'pass':
             self.bid_history.append((self.current_player, 'pass'))
         else: # Is a bid
@@ -89,74 +157,103 @@ class TwentyNineGame:
             self.bid_value = bid_val
             self.bid_winner = self.current_player
             self.bid_history.append((self.current_player, bid_val))
+            self._public_key += infoset.BID_KEYS[bid_val][self.current_player]
 
         # Check for end of bidding
         if len(self.bid_history) == 4 and self.bid_winner is None:
-            self.log("All players passed. Redealing for a new round.")
-            return self.init_game()
+            if self.event_log.enabled:
+                self.event_log.record((events.REDEAL,))
+            if self.allow_step_back:
+                self._journal[-1] = (_REDEAL, self.current_player, self.dealer_id, self.dealer.deck,
+                                     self.dealer.top, [p.hand_mask for p in self.players], self.bid_history)
+            self._start_round()
+            return
             
         if len(self.bid_history) >= 4:
             last_three_actions = [a[1] for a in self.bid_history[-3:]]
             if last_three_actions == ['pass', 'pass', 'pass'] and self.bid_winner is not None:
                 self.phase = 'trump_selection'
                 self.current_player = self.bid_winner
-                self.log(f"Bidding finished. Player {self.bid_winner} wins with a bid of {self.bid_value}.")
-                return self.get_state(self.current_player), self.current_player
+                if self.event_log.enabled:
+                    self.event_log.record((events.BIDDING_FINISHED, self.bid_winner, self.bid_value))
+                return
 
         self.current_player = (self.current_player + 1) % self.num_players
-        return self.get_state(self.current_player), self.current_player
 
     def _step_trump_selection(self, action):
+        if self.allow_step_back:
+            self._journal.append((_TRUMP, self.current_player))
+            self._key_journal.append(self._public_key)
+
         self.trump_suit = action
-        self.log(f"Player {self.bid_winner} chose {action} as the trump suit (secretly).")
+        self.trump_index = SUIT_INDEX[action]
+        if self.event_log.enabled:
+            self.event_log.record((events.TRUMP_CHOSEN, self.bid_winner, action))
         self.dealer.deal(self.players, 4) # Deal remaining cards
         self.phase = 'play'
         self.current_player = self.trick_leader
-        return self.get_state(self.current_player), self.current_player
 
     def _step_play(self, action):
         player_id = self.current_player
         player = self.players[player_id]
+        revealed_now = False
 
         # This is not an action, but a game event triggered by a player's inability to follow suit
-        if not self.trump_revealed and len(self.trick) > 0:
-            led_suit = self.trick[0][1][0]
-            if not any(card[0] == led_suit for card in player.hand):
-                self.trump_revealed = True
-                self.log(f"Player {player_id} cannot follow suit. Trump is revealed: {self.trump_suit}")
+        if not self.trump_revealed and self.led_card is not None:
+            if not player.hand_mask & SUIT_MASKS[self.led_card >> 3]:
+                self.trump_revealed = revealed_now = True
+                if self.event_log.enabled:
+                    self.event_log.record((events.TRUMP_REVEALED, player_id, self.trump_suit))
 
         # Normal card play
         card = action
-        player.hand.remove(card)
+        player.play_card(card)
+        card_index = CARD_INDEX[card]
+        if self.allow_step_back:
+            self._journal.append((_PLAY, player_id, card_index, revealed_now))
+            self._key_journal.append(self._public_key)
+        slot = len(self.trick)
+        if revealed_now:
+            self._public_key |= infoset.REVEALED_BIT
+        if slot == 0:
+            self._public_key |= player_id << infoset.LEADER_SHIFT
+        if slot < 3:
+            self._public_key += infoset.TRICK_SIZE_ONE + infoset.trick_card_key(slot, card_index)
         self.trick.append((player_id, card))
+        self.trick_mask |= CARD_BITS[card_index]
+        self.played_mask |= CARD_BITS[card_index]
+        if self.led_card is None:
+            self.led_card = card_index
 
         if len(self.trick) == 4:
             winner_id = self._resolve_trick()
-            self.log(f"Trick: {[f'P{p}:{c}' for p, c in self.trick]} -> Winner: P{winner_id}")
+            points = mask_points(self.trick_mask)
+            self.team_points[winner_id % 2] += points
+            self.trick_history.append((tuple(self.trick), winner_id, points))
+            if self.event_log.enabled:
+                self.event_log.record((events.TRICK, self.trick, winner_id))
             self.players[winner_id].taken_tricks.append([c for _, c in self.trick])
+            self._public_key = ((self._public_key & ~infoset.TRICK_FIELDS)
+                                | self.trick_mask << infoset.PLAYED_SHIFT)
             self.trick = []
+            self.trick_mask = 0
+            self.led_card = None
             self.trick_leader = winner_id
             self.current_player = winner_id
         else:
             self.current_player = (self.current_player + 1) % self.num_players
 
-        if all(len(p.hand) == 0 for p in self.players):
+        if self.played_mask == FULL_MASK:
             self.phase = 'end'
             self._update_match_scores()
 
-        return self.get_state(self.current_player), self.current_player
-
     def _update_match_scores(self):
         if self.bid_winner is None:
-            self.log("Round ended before a bid was made. No score change.")
+            if self.event_log.enabled:
+                self.event_log.record((events.NO_BID,))
             return
             
-        team_points = [0, 0]
-        for i, p in enumerate(self.players):
-            for trick in p.taken_tricks:
-                for card in trick:
-                    team_points[i % 2] += self._card_points(card)
-
+        team_points = self.team_points
         bidding_team_id = self.bid_winner % 2
         defending_team_id = 1 - bidding_team_id
         
@@ -166,37 +263,135 @@ class TwentyNineGame:
 
         if bid_successful:
             self.match_scores[bidding_team_id] += game_point_value
-            self.log(f"Team {bidding_team_id} fulfilled their bid of {self.bid_value} (target {bid_target}) by scoring {team_points[bidding_team_id]}. They WIN {game_point_value} point(s).")
         else:
             self.match_scores[bidding_team_id] -= game_point_value
-            self.log(f"Team {bidding_team_id} FAILED their bid of {self.bid_value} (target {bid_target}) by scoring {team_points[bidding_team_id]}. They LOSE {game_point_value} point(s).")
+        if self.event_log.enabled:
+            self.event_log.record((events.BID_RESULT, bidding_team_id, self.bid_value, bid_target,
+                                   team_points[bidding_team_id], bid_successful, game_point_value))
+
+    def step_back(self):
+        """
+        Undoes the last step of the current round from the undo journal.
+        Returns False if there is nothing to undo.
+        """
+        if not self._journal:
+            return False
+        entry = self._journal.pop()
+        kind, player_id = entry[0], entry[1]
+        self._public_key = self._key_journal.pop()
+
+        if kind == _PLAY:
+            self._undo_play(player_id, entry[2], entry[3])
+        elif kind == _BID:
+            self.bid_history.pop()
+            self.bid_value, self.bid_winner = entry[2], entry[3]
+            self.phase = 'bidding'
+        elif kind == _TRUMP:
+            self.dealer.undeal(self.players, 4)
+            self.trump_suit = self.trump_index = None
+            self.phase = 'trump_selection'
+        else: # _REDEAL
+            _, _, self.dealer_id, self.dealer.deck, self.dealer.top, hands, self.bid_history = entry
+            for player, hand_mask in zip(self.players, hands):
+                player.hand_mask = hand_mask
+            self.bid_history.pop()
+            self.bid_value = 15
+            self.bid_winner = None
+            self.trick_leader = (self.dealer_id + 1) % self.num_players
+        self.current_player = player_id
+        return True
+
+    def _undo_play(self, player_id, card_index, revealed_now):
+        if self.phase == 'end':
+            self.phase = 'play'
+            self._round_summary = None
+            if self.bid_winner is not None:
+                bidding_team_id = self.bid_winner % 2
+                bid_successful = self.team_points[bidding_team_id] >= self.bid_value
+                self.match_scores[bidding_team_id] -= 1 if bid_successful else -1
+
+        bit = CARD_BITS[card_index]
+        if not self.trick: # This card completed the last trick
+            trick, winner_id, points = self.trick_history.pop()
+            self.team_points[winner_id % 2] -= points
+            self.players[winner_id].taken_tricks.pop()
+            self.trick = list(trick[:-1])
+            self.trick_mask = cards_to_mask(card for _, card in self.trick)
+            self.led_card = CARD_INDEX[trick[0][1]]
+            self.trick_leader = trick[0][0]
+        else:
+            self.trick.pop()
+            self.trick_mask ^= bit
+            if not self.trick:
+                self.led_card = None
+        self.played_mask ^= bit
+        self.players[player_id].hand_mask |= bit
+        if revealed_now:
+            self.trump_revealed = False
+
+    def snapshot(self):
+        """
+        Returns the round and match state as a fixed-size tuple of immutable values,
+        without the event log or the undo journal. Load it back with restore().
+        """
+        return (tuple([p.hand_mask for p in self.players]), self.dealer.deck, self.dealer.top,
+                self.dealer_id, tuple(self.match_scores), tuple(self.bid_history), self.bid_value,
+                self.bid_winner, self.trump_suit, self.trump_revealed, self.phase, self.current_player,
+                tuple(self.trick), self.trick_leader, tuple(self.trick_history), self.played_mask,
+                tuple(self.team_points))
+
+    def restore(self, snapshot):
+        """Loads a state returned by snapshot(). The undo journal starts empty."""
+        (hands, self.dealer.deck, self.dealer.top, self.dealer_id, match_scores, bid_history,
+         self.bid_value, self.bid_winner, trump_suit, self.trump_revealed, self.phase,
+         self.current_player, trick, self.trick_leader, trick_history, self.played_mask,
+         team_points) = snapshot
+        for player, hand_mask in zip(self.players, hands):
+            player.hand_mask = hand_mask
+            player.taken_tricks = []
+        for past_trick, winner_id, _ in trick_history:
+            self.players[winner_id].taken_tricks.append([c for _, c in past_trick])
+        self.match_scores = list(match_scores)
+        self.bid_history = list(bid_history)
+        self.trump_suit = trump_suit
+        self.trump_index = None if trump_suit is None else SUIT_INDEX[trump_suit]
+        self.trick = list(trick)
+        self.trick_mask = cards_to_mask(c for _, c in trick)
+        self.led_card = CARD_INDEX[trick[0][1]] if trick else None
+        self.trick_history = list(trick_history)
+        self.team_points = list(team_points)
+        self._round_summary = None
+        self._journal = []
+        self._key_journal = []
+        self._public_key = infoset.public_key(self.bid_history, self.played_mask ^ self.trick_mask,
+                                              self.trump_revealed, self.trick_leader,
+                                              [CARD_INDEX[c] for _, c in self.trick])
+
+    def clone(self, np_random=None):
+        """
+        Returns an independent copy of the game built from snapshot(), with logging off.
+        The copy deals any redeal from np_random, by default a new generator seeded from this
+        game's, so it never advances this game's deal stream.
+        """
+        if np_random is None:
+            np_random = np.random.RandomState(self.np_random.randint(2 ** 31))
+        game = TwentyNineGame(allow_step_back=self.allow_step_back, event_log=events.NullEventLog(),
+                              np_random=np_random)
+        game.restore(self.snapshot())
+        return game
 
     def _resolve_trick(self):
-        led_suit = self.trick[0][1][0]
-        highest_card_info = self.trick[0]
-
-        for (player_id, card) in self.trick[1:]:
-            # Current highest is trump
-            if self.trump_revealed and highest_card_info[1][0] == self.trump_suit:
-                if card[0] == self.trump_suit and self._card_rank(card) < self._card_rank(highest_card_info[1]):
-                    highest_card_info = (player_id, card)
-            # Current highest is not trump, but new card is
-            elif self.trump_revealed and card[0] == self.trump_suit:
-                highest_card_info = (player_id, card)
-            # Neither are trump, but same suit as led
-            elif card[0] == led_suit and highest_card_info[1][0] != self.trump_suit:
-                 if self._card_rank(card) < self._card_rank(highest_card_info[1]):
-                    highest_card_info = (player_id, card)
-        
-        return highest_card_info[0]
+        winning_card = CARD_NAMES[trick_winning_card(
+            self.trick_mask, self.led_card, self.trump_index, self.trump_revealed)]
+        for player_id, card in self.trick:
+            if card == winning_card:
+                return player_id
     
     def _card_rank(self, card):
-        order = ['J', '9', 'A', '10', 'K', 'Q', '8', '7']
-        return order.index(card[1:])
+        return CARD_INDEX[card] & 7
 
     def _card_points(self, card):
-        points = {'J': 3, '9': 2, 'A': 1, '10': 1, 'K': 0, 'Q': 0, '8': 0, '7': 0}
-        return points[card[1:]]
+        return CARD_POINTS_BY_INDEX[CARD_INDEX[card]]
 
     def get_state(self, player_id):
         player = self.players[player_id]
@@ -209,14 +404,28 @@ class TwentyNineGame:
             'bid_winner': self.bid_winner,
             'bid_history': self.bid_history,
             'trick': self.trick,
+            'trick_history': self.trick_history,
             'trump_suit': self.trump_suit if self.trump_revealed else None,
+            'own_trump': self.trump_suit if player_id == self.bid_winner else None, # Known to the bid winner
             'match_scores': self.match_scores,
         }
         return state
 
+    def infoset_key(self, player_id=None):
+        """
+        Return a player's information set packed into a 128-bit integer (see infoset.py).
+        Not part of get_state(); callers that need the key ask for it.
+        """
+        if player_id is None:
+            player_id = self.current_player
+        knows_trump = self.trump_revealed or player_id == self.bid_winner
+        return self._public_key | infoset.private_key(
+            self.players[player_id].hand_mask, player_id, self.dealer_id, self.phase,
+            self.trump_index if knows_trump else None, self.current_player)
+
     def get_legal_actions(self):
-        player_id = self.current_player
-        player = self.players[player_id]
+        if self.phase == 'play':
+            return mask_to_cards(self.get_legal_card_mask())
 
         if self.phase == 'bidding':
             actions = ['pass']
@@ -227,29 +436,31 @@ class TwentyNineGame:
         if self.phase == 'trump_selection':
             return ['S', 'H', 'D', 'C']
 
-        if self.phase == 'play':
-            actions = []
-            if self.bid_winner is None: return [] # Safeguard
-            # Card play logic
-            if not self.trick:  # Player is leading the trick
-                actions.extend(player.hand)
-                return actions
-
-            led_suit = self.trick[0][1][0]
-            if any(card[0] == led_suit for card in player.hand): # Must follow suit
-                actions.extend([c for c in player.hand if c[0] == led_suit])
-            else: # Cannot follow suit
-                if self.trump_revealed:
-                    trumps_in_hand = [c for c in player.hand if c[0] == self.trump_suit]
-                    if trumps_in_hand:
-                        actions.extend(trumps_in_hand)
-                    else:
-                        actions.extend(player.hand)
-                else:
-                    actions.extend(player.hand)
-            return list(set(actions))
         return []
 
+    def get_legal_card_mask(self):
+        """Return the cards the current player may play as a card mask (0 outside the play phase)."""
+        if self.phase != 'play' or self.bid_winner is None: # Safeguard
+            return 0
+        led_suit = None if self.led_card is None else self.led_card >> 3
+        return legal_play_mask(self.players[self.current_player].hand_mask, led_suit,
+                               self.trump_index, self.trump_revealed)
+
+    def get_legal_action_mask(self):
+        """Return the legal actions of the current player as a bitmask over the env's 51 action ids."""
+        if self.phase == 'play':
+            return self.get_legal_card_mask()
+        if self.phase == 'bidding':
+            min_bid_action = self.bid_value + 1 + BID_ACTION_OFFSET
+            return (1 << PASS_ACTION) | ((1 << PASS_ACTION) - (1 << min(min_bid_action, PASS_ACTION)))
+        if self.phase == 'trump_selection':
+            return 0b1111 << TRUMP_ACTION_OFFSET
+        return 0
+
+    def get_legal_action_ids(self):
+        """Return the legal action ids of the current player as an int array."""
+        return np.array(action_mask_to_ids(self.get_legal_action_mask()), dtype=np.int64)
+
     def is_over(self):
         return self.phase == 'end'
         
@@ -268,14 +479,8 @@ class TwentyNineGame:
         payoffs = [0, 0, 0, 0]
         
         # Determine winning team based on the bid result
-        team_points = [0, 0]
-        for i, p in enumerate(self.players):
-            for trick in p.taken_tricks:
-                for card in trick:
-                    team_points[i % 2] += self._card_points(card)
-        
         bid_target = self.bid_value # Simplified for this context
-        bid_successful = team_points[bidding_team_id] >= bid_target
+        bid_successful = self.team_points[bidding_team_id] >= bid_target
 
         if bid_successful:
             for i in range(4): payoffs[i] = 1 if i % 2 == bidding_team_id else -1
@@ -287,7 +492,12 @@ class TwentyNineGame:
     def get_round_summary(self):
         """
         Returns a dictionary with a summary of the completed round.
+        The summary of a finished round is computed once; callers get their own copy.
         """
+        if self._round_summary is not None:
+            summary = self._round_summary
+            return dict(summary, team_points=list(summary['team_points']))
+
         summary = {
             'bid_value': self.bid_value,
             'bid_winner': self.bid_winner,
@@ -297,21 +507,16 @@ class TwentyNineGame:
             'team_points': [0, 0],
         }
 
-        if self.bid_winner is None:
-            return summary # Not enough info for a full summary
-
-        bidding_team_id = self.bid_winner % 2
-        summary['bidding_team_id'] = bidding_team_id
+        if self.bid_winner is not None:
+            bidding_team_id = self.bid_winner % 2
+            summary['bidding_team_id'] = bidding_team_id
+            summary['team_points'] = list(self.team_points)
 
-        team_points = [0, 0]
-        for i, p in enumerate(self.players):
-            for trick in p.taken_tricks:
-                for card in trick:
-                    team_points[i % 2] += self._card_points(card)
-        summary['team_points'] = team_points
+            bid_target = self.bid_value
+            summary['bid_successful'] = self.team_points[bidding_team_id] >= bid_target
 
-        bid_target = self.bid_value
-        summary['bid_successful'] = team_points[bidding_team_id] >= bid_target
+        if self.phase == 'end':
+            self._round_summary = dict(summary, team_points=list(summary['team_points']))
         return summary
 
     def get_num_players(self):
@@ -324,4 +529,5 @@ class TwentyNineGame:
         return self.current_player
 
     def get_game_log(self):
-        return self.logs 
\ No newline at end of file
+        """Returns the recorded events formatted as log messages."""
+        return self.event_log.get_log() 
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+File: rlcard29/games/twenty_nine/hand_strength.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Precomputed bidding hand strength for the 29 card game.
+# Bidding sees only the first 4 cards, so there are C(32, 4) = 35,960 opening hands.
+# For every opening hand and trump suit the table stores the distribution of card points
+# (0-28) the bidder's team takes, estimated with random-play rollouts in VectorTwentyNineGame.
+# Hands that are the same up to a suit permutation fixing the trump share one rollout batch.
+#
+# Build once (the output is a .npy file, loaded memory-mapped):
+#   python -m rlcard29.games.twenty_nine.hand_strength --samples 256 --workers 8
+
+import argparse
+import os
+from itertools import combinations
+from multiprocessing import Pool
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import NUM_CARDS, SUIT_INDEX, cards_to_mask
+from rlcard29.games.twenty_nine.canonical import BINOMIAL, hand_rank
+from rlcard29.games.twenty_nine.encoding import NUM_ACTIONS
+from rlcard29.games.twenty_nine.utils import SUITS
+from rlcard29.games.twenty_nine.vector_game import VectorTwentyNineGame
+
+OPENING_CARDS = 4
+NUM_HANDS = BINOMIAL[NUM_CARDS][OPENING_CARDS]
+MAX_POINTS = 28
+NUM_POINT_BINS = MAX_POINTS + 1
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'models', 'hand_strength_4card.npy')
+
+_CARD_SHIFTS = np.arange(NUM_CARDS, dtype=np.int64)
+
+def opening_hands():
+    """Return every opening hand mask as an int64 array indexed by hand_rank()."""
+    hands = np.zeros(NUM_HANDS, dtype=np.int64)
+    for cards in combinations(range(NUM_CARDS), OPENING_CARDS):
+        mask = (1 << cards[0]) | (1 << cards[1]) | (1 << cards[2]) | (1 << cards[3])
+        hands[hand_rank(mask)] = mask
+    return hands
+
+def trump_classes(hands):
+    """
+    Group (hand, trump) pairs by suit isomorphism.
+    The canonical form moves the trump byte to suit 0 and sorts the other three bytes.
+    Returns (classes, representatives): classes[rank, trump] indexes representatives,
+    whose masks all have trump suit 0.
+    """
+    suit_bytes = np.stack([(hands >> (8 * s)) & 0xFF for s in range(4)], axis=1)
+    keys = np.zeros((len(hands), 4), dtype=np.int64)
+    for trump in range(4):
+        others = np.delete(suit_bytes, trump, axis=1)
+        others = -np.sort(-others, axis=1)
+        keys[:, trump] = suit_bytes[:, trump] | others[:, 0] << 8 | others[:, 1] << 16 | others[:, 2] << 24
+    representatives, classes = np.unique(keys.ravel(), return_inverse=True)
+    return classes.reshape(len(hands), 4).astype(np.int32), representatives
+
+def simulate_points(opening_masks, num_samples, seed=None):
+    """
+    Estimate the point distribution of the bidder's team for each opening hand, with trump suit 0.
+    The bidder sits at seat 0, the other 28 cards are dealt uniformly at random, the opening
+    leader is a uniformly random seat and every player picks uniformly among legal moves.
+
+    Returns:
+        (np.ndarray): (len(opening_masks), 29) float32 probabilities of taking 0..28 points
+    """
+    rng = np.random.default_rng(seed)
+    opening_masks = np.asarray(opening_masks, dtype=np.int64)
+    num_hands = len(opening_masks)
+    num_games = num_hands * num_samples
+    openings = np.repeat(opening_masks, num_samples)
+
+    # Shuffle the unseen cards of every game: held cards sort last
+    keys = rng.random((num_games, NUM_CARDS))
+    keys[(openings[:, None] >> _CARD_SHIFTS) & 1 == 1] = 2.0
+    order = np.argsort(keys, axis=1)[:, :NUM_CARDS - OPENING_CARDS]
+    card_bits = np.int64(1) << order
+    hands = np.empty((num_games, 4), dtype=np.int64)
+    hands[:, 0] = openings | np.bitwise_or.reduce(card_bits[:, 0:4], axis=1)
+    for seat in range(1, 4):
+        hands[:, seat] = np.bitwise_or.reduce(card_bits[:, 8 * seat - 4:8 * seat + 4], axis=1)
+
+    game = VectorTwentyNineGame(num_games, np_random=np.random.RandomState(rng.integers(2 ** 31)))
+    game.reset()
+    _, legal_mask, _ = game.start_play(hands, trump_suit=0, bid_winner=0, bid_value=16,
+                                       leader=rng.integers(4, size=num_games))
+    for _ in range(NUM_CARDS):
+        actions = np.argmax(rng.random((num_games, NUM_ACTIONS)) * legal_mask, axis=1)
+        _, legal_mask, _, _, _ = game.step(actions)
+
+    points = game.final_team_points[:, 0].reshape(num_hands, num_samples)
+    counts = np.zeros((num_hands, NUM_POINT_BINS), dtype=np.int64)
+    np.add.at(counts, (np.repeat(np.arange(num_hands), num_samples), points.ravel()), 1)
+    return (counts / num_samples).astype(np.float32)
+
+def _simulate_chunk(args):
+    chunk_id, opening_masks, num_samples, seed = args
+    return chunk_id, simulate_points(opening_masks, num_samples, seed)
+
+def build_table(path=DEFAULT_PATH, num_samples=256, num_workers=None, chunk_size=64, seed=0):
+    """
+    Simulate every (opening hand, trump) class and write the (35960, 4, 29) float32 table to path.
+    Classes are split into chunks of chunk_size rollout batches spread over num_workers processes.
+    """
+    hands = opening_hands()
+    classes, representatives = trump_classes(hands)
+    seeds = np.random.SeedSequence(seed).spawn((len(representatives) + chunk_size - 1) // chunk_size)
+    tasks = [(i, representatives[start:start + chunk_size], num_samples, seeds[i])
+             for i, start in enumerate(range(0, len(representatives), chunk_size))]
+
+    distributions = np.zeros((len(representatives), NUM_POINT_BINS), dtype=np.float32)
+    with Pool(num_workers) as pool:
+        for chunk_id, result in pool.imap_unordered(_simulate_chunk, tasks):
+            start = chunk_id * chunk_size
+            distributions[start:start + len(result)] = result
+
+    table = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32,
+                                      shape=(NUM_HANDS, len(SUITS), NUM_POINT_BINS))
+    table[:] = distributions[classes]
+    table.flush()
+    return path
+
+class HandStrengthTable:
+    """
+    O(1) lookup into a table written by build_table(). The file is memory-mapped, so
+    many processes can share one copy.
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        self.table = np.load(path, mmap_mode='r')
+        self._points = np.arange(NUM_POINT_BINS, dtype=np.float32)
+
+    def distribution(self, hand, trump):
+        """
+        Return the 29-long point distribution for an opening hand.
+
+        Args:
+            hand: 4-card hand as a card mask (int or NumPy integer) or a list of card strings
+            trump: trump suit as 'S', 'H', 'D', 'C' or its index
+        """
+        if isinstance(hand, (int, np.integer)):
+            hand = int(hand)
+        else:
+            hand = cards_to_mask(hand)
+        if isinstance(trump, str):
+            trump = SUIT_INDEX[trump]
+        return self.table[hand_rank(hand), trump]
+
+    def expected_points(self, hand, trump):
+        """Return the mean points the bidder's team takes."""
+        return float(self.distribution(hand, trump) @ self._points)
+
+    def prob_at_least(self, hand, trump, bid):
+        """Return the probability that the bidder's team takes at least bid points."""
+        return float(self.distribution(hand, trump)[min(bid, NUM_POINT_BINS):].sum())
+
+    def best_trump(self, hand):
+        """Return (trump suit, expected points) for the suit that maximises expected points."""
+        expected = [self.expected_points(hand, trump) for trump in range(len(SUITS))]
+        best = int(np.argmax(expected))
+        return SUITS[best], expected[best]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the 29 opening-hand strength table.')
+    parser.add_argument('--out', default=DEFAULT_PATH)
+    parser.add_argument('--samples', type=int, default=256, help='rollouts per (hand, trump) class')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(build_table(args.out, args.samples, args.workers, args.chunk_size, args.seed))
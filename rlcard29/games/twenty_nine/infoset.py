@@ -0,0 +1,143 @@
+"""
+File: rlcard29/games/twenty_nine/infoset.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Compact information-set keys for the 29 card game.
+# A player's view of a round packs into one 128-bit integer (bits from the lowest):
+#   [0:32]    own hand mask
+#   [32:64]   cards of completed tricks
+#   [64:97]   bid table: base-5 digit per bid value 16..29, 0 if nobody bid it, else bidder + 1
+#   [97:99]   dealer id (the first bidder is the next seat, so the table gives the bid history)
+#   [99:101]  player id
+#   [101:103] phase: bidding, trump_selection, play, end
+#   [103:106] trump suit as the player knows it: 0 unknown, else suit index + 1
+#   [106]     trump revealed
+#   [107:109] leader of the current trick
+#   [109:111] cards in the current trick (0-3)
+#   [111:126] current trick cards, 5 bits each in play order
+#   [126:128] current player
+# TwentyNineGame keeps the public part (completed tricks, bids, reveal, current trick)
+# up to date as it steps and ORs in the private part in infoset_key().
+
+HAND_SHIFT = 0
+PLAYED_SHIFT = 32
+BIDS_SHIFT = 64
+DEALER_SHIFT = 97
+PLAYER_SHIFT = 99
+PHASE_SHIFT = 101
+TRUMP_SHIFT = 103
+REVEALED_SHIFT = 106
+LEADER_SHIFT = 107
+TRICK_SIZE_SHIFT = 109
+TRICK_SHIFT = 111
+CURRENT_SHIFT = 126
+KEY_BITS = 128
+KEY_BYTES = KEY_BITS // 8
+
+MIN_BID = 16
+MAX_BID = 29
+PHASES = ('bidding', 'trump_selection', 'play', 'end')
+PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+
+# Contribution of "seat bid value" to the key: BID_KEYS[value][seat]
+BID_KEYS = {value: tuple((seat + 1) * 5 ** (value - MIN_BID) << BIDS_SHIFT for seat in range(4))
+            for value in range(MIN_BID, MAX_BID + 1)}
+REVEALED_BIT = 1 << REVEALED_SHIFT
+TRICK_SIZE_ONE = 1 << TRICK_SIZE_SHIFT
+# Mask of the current-trick fields (leader, size, cards)
+TRICK_FIELDS = ((1 << (CURRENT_SHIFT - LEADER_SHIFT)) - 1) << LEADER_SHIFT
+
+def trick_card_key(slot, card_index):
+    """Key bits of the card played in position slot (0-2) of the current trick."""
+    return card_index << (TRICK_SHIFT + 5 * slot)
+
+def public_key(bid_history, played_mask, trump_revealed, trick_leader, trick_cards):
+    """
+    Build the public part of a key from scratch.
+    bid_history holds (player_id, bid or 'pass'); played_mask covers completed tricks only;
+    trick_cards are the card indices of the current trick in play order.
+    """
+    key = played_mask << PLAYED_SHIFT
+    for player_id, bid in bid_history:
+        if bid != 'pass':
+            key += BID_KEYS[int(bid)][player_id]
+    if trump_revealed:
+        key |= REVEALED_BIT
+    if trick_cards:
+        key |= trick_leader << LEADER_SHIFT | len(trick_cards) << TRICK_SIZE_SHIFT
+        for slot, card_index in enumerate(trick_cards[:3]):
+            key |= trick_card_key(slot, card_index)
+    return key
+
+def private_key(hand_mask, player_id, dealer_id, phase, trump_index, current_player):
+    """Key bits that are not kept incrementally; trump_index is None unless the player knows it."""
+    key = (hand_mask | dealer_id << DEALER_SHIFT | player_id << PLAYER_SHIFT
+           | PHASE_CODES[phase] << PHASE_SHIFT | current_player << CURRENT_SHIFT)
+    if trump_index is not None:
+        key |= (trump_index + 1) << TRUMP_SHIFT
+    return key
+
+def key_to_bytes(key):
+    """Fixed-length 16-byte little-endian form of a key."""
+    return key.to_bytes(KEY_BYTES, 'little')
+
+def key_from_bytes(data):
+    return int.from_bytes(data, 'little')
+
+def unpack_bids(key):
+    """Return the bids recorded in a key as (bid value, player_id) pairs in increasing order."""
+    table = (key >> BIDS_SHIFT) & ((1 << (DEALER_SHIFT - BIDS_SHIFT)) - 1)
+    bids = []
+    for value in range(MIN_BID, MAX_BID + 1):
+        table, digit = divmod(table, 5)
+        if digit:
+            bids.append((value, digit - 1))
+    return bids
+
+def unpack_bid_history(key):
+    """
+    Rebuild the bid history (player_id, bid or 'pass') from a key.
+    Between two bids only passes can happen, so the seats pin the passes down; trailing
+    passes come from the current player while bidding.
+    """
+    dealer_id = (key >> DEALER_SHIFT) & 3
+    history = []
+    player_id = (dealer_id + 1) % 4
+    for value, bidder in unpack_bids(key):
+        while player_id != bidder:
+            history.append((player_id, 'pass'))
+            player_id = (player_id + 1) % 4
+        history.append((bidder, value))
+        player_id = (player_id + 1) % 4
+    if PHASES[(key >> PHASE_SHIFT) & 3] == 'bidding':
+        current_player = (key >> CURRENT_SHIFT) & 3
+        while player_id != current_player:
+            history.append((player_id, 'pass'))
+            player_id = (player_id + 1) % 4
+    elif history:
+        # Bidding ended with three passes after the last bid
+        for _ in range(3):
+            history.append((player_id, 'pass'))
+            player_id = (player_id + 1) % 4
+    return history
+
+def unpack_infoset_key(key):
+    """Unpack a key into a dict of its fields."""
+    trick_size = (key >> TRICK_SIZE_SHIFT) & 3
+    trump = (key >> TRUMP_SHIFT) & 7
+    return {
+        'hand_mask': key & 0xFFFFFFFF,
+        'played_mask': (key >> PLAYED_SHIFT) & 0xFFFFFFFF,
+        'bids': unpack_bids(key),
+        'bid_history': unpack_bid_history(key),
+        'dealer_id': (key >> DEALER_SHIFT) & 3,
+        'player_id': (key >> PLAYER_SHIFT) & 3,
+        'phase': PHASES[(key >> PHASE_SHIFT) & 3],
+        'trump_index': trump - 1 if trump else None,
+        'trump_revealed': bool(key >> REVEALED_SHIFT & 1),
+        'trick_leader': (key >> LEADER_SHIFT) & 3 if trick_size else None,
+        'trick': [(key >> (TRICK_SHIFT + 5 * slot)) & 31 for slot in range(trick_size)],
+        'current_player': (key >> CURRENT_SHIFT) & 3,
+    }
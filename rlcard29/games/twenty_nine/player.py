@@ -4,7 +4,7 @@ Author: Arnob Das
 Date: 2025-06-28
 """
     
-from rlcard29.games.twenty_nine.utils import encode_card, decode_card
+from rlcard29.games.twenty_nine.bitboard import CARD_BITS, CARD_INDEX, cards_to_mask, mask_to_cards
 
 class Player:
     """
@@ -13,22 +13,31 @@ class Player:
     """
     def __init__(self, player_id):
         self.player_id = player_id
-        self.hand = []  # List of card strings, e.g., ['SJ', 'H9', ...]
+        self.hand_mask = 0  # Bit i set if the card encode_card() maps to i is held
         self.taken_tricks = []  # List of lists of cards won in tricks
         # TODO: Add more player state as needed
 
+    @property
+    def hand(self):
+        """List of card strings, e.g., ['SJ', 'H9', ...]."""
+        return mask_to_cards(self.hand_mask)
+
     def receive_cards(self, cards):
-        self.hand.extend(cards)
+        self.hand_mask |= cards_to_mask(cards)
+
+    def receive_mask(self, mask):
+        self.hand_mask |= mask
 
     def play_card(self, card):
         """Play a card from hand."""
-        if card in self.hand:
-            self.hand.remove(card)
+        index = CARD_INDEX.get(card)
+        if index is not None and self.hand_mask & CARD_BITS[index]:
+            self.hand_mask ^= CARD_BITS[index]
             return card
         raise ValueError(f"Card {card} not in hand")
 
     def reset(self):
-        self.hand = []
+        self.hand_mask = 0
         self.taken_tricks = []
 
     def set(self):
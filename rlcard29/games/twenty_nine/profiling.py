@@ -0,0 +1,111 @@
+"""
+File: rlcard29/games/twenty_nine/profiling.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Opt-in step profiling for TwentyNineGame and TwentyNineEnv.
+# StepProfiler shadows the profiled methods of one game/env instance with timing wrappers, so
+# the engine itself carries no checks and an unprofiled instance runs at full speed. Every call
+# is counted under (phase at the start of the call, operation); times are wall-clock and
+# inclusive, e.g. 'step' contains the 'state_building' it triggers.
+
+import time
+
+# Profiled methods and the operation they are reported as
+GAME_OPERATIONS = (
+    ('step', 'step'),
+    ('apply', 'apply'),
+    ('get_legal_actions', 'legal_actions'),
+    ('get_legal_action_mask', 'legal_actions'),
+    ('get_state', 'state_building'),
+    ('_resolve_trick', 'trick_resolution'),
+)
+ENV_OPERATIONS = (
+    ('step', 'env_step'),
+    ('_extract_state', 'extract_state'),
+)
+ENCODER_OPERATIONS = (
+    ('encode', 'encoding'),
+    ('encode_game', 'encoding'),
+)
+
+class StepProfiler:
+    """Call counts and cumulative wall time per phase and operation of the attached instances."""
+    def __init__(self):
+        self._stats = {}  # (phase, operation) -> [calls, seconds]
+        self._attached = []
+
+    def attach_game(self, game):
+        for name, operation in GAME_OPERATIONS:
+            self._wrap(game, name, operation, game)
+        return self
+
+    def attach_env(self, env):
+        """Profile env.step, _extract_state, its encoder and its game."""
+        for name, operation in ENV_OPERATIONS:
+            self._wrap(env, name, operation, env.game)
+        for name, operation in ENCODER_OPERATIONS:
+            self._wrap(env.encoder, name, operation, env.game)
+        return self.attach_game(env.game)
+
+    def _wrap(self, obj, name, operation, game):
+        if any(attached is obj and attached_name == name for attached, attached_name in self._attached):
+            return
+        method = getattr(obj, name)
+        stats = self._stats
+        timer = time.perf_counter
+
+        def timed(*args, **kwargs):
+            key = (game.phase, operation)
+            start = timer()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = timer() - start
+                entry = stats.get(key)
+                if entry is None:
+                    stats[key] = [1, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+        setattr(obj, name, timed)
+        self._attached.append((obj, name))
+
+    def detach(self):
+        """Remove the wrappers; the instances go back to their unprofiled methods."""
+        for obj, name in reversed(self._attached):
+            delattr(obj, name)
+        self._attached = []
+
+    def reset(self):
+        self._stats.clear()
+
+    def snapshot(self):
+        """
+        Return {'phases': {phase: {operation: stats}}, 'totals': {operation: stats}} where stats
+        holds 'calls', 'seconds' and 'mean_us'.
+        """
+        phases, totals = {}, {}
+        for (phase, operation), (calls, seconds) in self._stats.items():
+            phases.setdefault(phase, {})[operation] = _stats_entry(calls, seconds)
+            total = totals.setdefault(operation, [0, 0.0])
+            total[0] += calls
+            total[1] += seconds
+        return {
+            'phases': phases,
+            'totals': {operation: _stats_entry(calls, seconds) for operation, (calls, seconds) in totals.items()},
+        }
+
+def _stats_entry(calls, seconds):
+    return {'calls': calls, 'seconds': seconds, 'mean_us': 1e6 * seconds / calls}
+
+def format_snapshot(snapshot):
+    """Table lines of a StepProfiler snapshot, slowest operations first within each phase."""
+    lines = [f"{'phase':16s} {'operation':18s} {'calls':>10s} {'seconds':>10s} {'mean us':>10s}"]
+    sections = list(snapshot['phases'].items()) + [('total', snapshot['totals'])]
+    for phase, operations in sections:
+        for operation, stats in sorted(operations.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{phase:16s} {operation:18s} {stats['calls']:10d} {stats['seconds']:10.4f} "
+                         f"{stats['mean_us']:10.2f}")
+    return lines
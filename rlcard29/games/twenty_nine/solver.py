@@ -0,0 +1,253 @@
+"""
+File: rlcard29/games/twenty_nine/solver.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# Double-dummy solver for the play phase of the 29 card game.
+# With every hand known, alpha-beta search finds the most card points the bidding team can
+# take against best defence. Tricks are resolved with trick_winning_card() and the trump is
+# revealed by the first player who cannot follow suit, exactly as in TwentyNineGame._step_play.
+#
+# Speed-ups:
+#   - transposition table at trick boundaries, keyed by an incremental Zobrist hash and
+#     storing lower/upper bounds plus the best lead
+#   - equivalent-card pruning: cards of one hand and suit that touch in RANKS once the
+#     cards of finished tricks are removed, and score the same points, are searched once
+#   - move ordering: table move first, then winning cards / discards by points
+
+import random
+from rlcard29.games.twenty_nine.bitboard import (
+    CARD_BITS, CARD_INDEX, CARD_POINTS_BY_INDEX, FULL_MASK, SUIT_MASKS, legal_play_mask, lowest_card,
+    mask_points, mask_to_indices, trick_winning_card,
+)
+
+def _equivalent_byte(hand_byte, gone_byte):
+    """Keep the highest card of every group of touching, equal-point cards in one suit byte."""
+    kept = 0
+    group_points = None
+    for rank in range(8):
+        bit = 1 << rank
+        if gone_byte & bit:
+            continue
+        if hand_byte & bit:
+            points = CARD_POINTS_BY_INDEX[rank]
+            if points != group_points:
+                kept |= bit
+                group_points = points
+        else:
+            group_points = None
+    return kept
+
+_EQUIVALENT = {}
+
+def equivalent_cards(moves, gone):
+    """Drop moves that are equivalent to a higher move of the same suit; gone are finished-trick cards."""
+    kept = 0
+    for shift in (0, 8, 16, 24):
+        hand_byte = (moves >> shift) & 0xFF
+        if hand_byte:
+            key = hand_byte | ((gone >> shift) & 0xFF) << 8
+            byte = _EQUIVALENT.get(key)
+            if byte is None:
+                byte = _EQUIVALENT[key] = _equivalent_byte(hand_byte, (gone >> shift) & 0xFF)
+            kept |= byte << shift
+    return kept
+
+class DoubleDummySolver:
+    """
+    Alpha-beta solver for fully known play-phase positions. The transposition table is
+    kept between calls, so solving many positions of one deal reuses earlier work.
+    """
+    def __init__(self, max_table_size=1 << 21, seed=29):
+        rng = random.Random(seed)
+        self._card_keys = tuple(tuple(rng.getrandbits(64) for _ in range(32)) for _ in range(4))
+        self._leader_keys = tuple(rng.getrandbits(64) for _ in range(4))
+        self._trump_keys = tuple(rng.getrandbits(64) for _ in range(4))
+        self._team_keys = tuple(rng.getrandbits(64) for _ in range(2))
+        self._revealed_key = rng.getrandbits(64)
+        self.max_table_size = max_table_size
+        self.table = {}
+        self.nodes = 0
+
+    def clear(self):
+        self.table.clear()
+
+    def solve(self, hands, trump_suit, bidding_team, leader, trick=(), trump_revealed=False):
+        """
+        Return the most card points the bidding team can still take.
+
+        Args:
+            hands: four card masks, indexed by player id
+            trump_suit (int): trump suit index
+            bidding_team (int): 0 for players 0 and 2, 1 for players 1 and 3
+            leader (int): player who led (or is to lead) the current trick
+            trick: card indices already played to the current trick, in play order
+            trump_revealed (bool): whether the trump is already revealed
+        """
+        self._trump = trump_suit
+        self._team = bidding_team
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+        hands = list(hands)
+        key = self._trump_keys[trump_suit] ^ self._team_keys[bidding_team]
+        for player_id, hand_mask in enumerate(hands):
+            for card_index in mask_to_indices(hand_mask):
+                key ^= self._card_keys[player_id][card_index]
+        trick_mask = 0
+        for card_index in trick:
+            trick_mask |= CARD_BITS[card_index]
+        gone = FULL_MASK ^ trick_mask ^ hands[0] ^ hands[1] ^ hands[2] ^ hands[3]
+        if not trick_mask and not gone ^ FULL_MASK:
+            return 0
+        # MTD(f): null-window searches narrowing [lower, upper] on the value
+        trick = list(trick)
+        lower, upper = 0, mask_points(FULL_MASK ^ gone)
+        value = upper // 2
+        while lower < upper:
+            beta = value + 1 if value == lower else value
+            value = self._search(hands, leader, trick, trick_mask, trump_revealed, gone, key, beta - 1, beta)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        return lower
+
+    def solve_game(self, game):
+        """Return the most card points the bidding team of a TwentyNineGame can take in total."""
+        if game.bid_winner is None:
+            raise ValueError("The round has no bidding team")
+        team = game.bid_winner % 2
+        if game.phase == 'end':
+            return game.team_points[team]
+        if game.phase != 'play':
+            raise ValueError("Positions can only be solved during the play phase")
+        trick = [CARD_INDEX[card] for _, card in game.trick]
+        return game.team_points[team] + self.solve(
+            [player.hand_mask for player in game.players], game.trump_index, team,
+            game.trick_leader, trick, game.trump_revealed)
+
+    def _search(self, hands, leader, trick, trick_mask, revealed, gone, key, alpha, beta):
+        self.nodes += 1
+        num_played = len(trick)
+        trump = self._trump
+
+        if num_played == 4:
+            winning_card = trick_winning_card(trick_mask, trick[0], trump, revealed)
+            winner = (leader + trick.index(winning_card)) % 4
+            points = mask_points(trick_mask) if winner % 2 == self._team else 0
+            if not hands[winner]:
+                return points
+            return points + self._search(hands, winner, [], 0, revealed, gone | trick_mask, key,
+                                         alpha - points, beta - points)
+
+        if num_played == 0:
+            remaining = FULL_MASK ^ gone
+            if not hands[leader] & (hands[leader] - 1):
+                return self._last_trick(hands, leader, remaining, revealed)
+            upper_limit = mask_points(remaining)
+            table_key = key ^ self._leader_keys[leader] ^ (self._revealed_key if revealed else 0)
+            entry = self.table.get(table_key)
+            best_move = None
+            if entry is not None:
+                lower, upper, best_move = entry
+                if lower >= beta or lower == upper:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha_in, beta_in = max(alpha, lower), min(beta, upper)
+            else:
+                lower, upper = 0, upper_limit
+                alpha_in, beta_in = alpha, beta
+            if upper_limit <= alpha_in or beta_in <= 0:
+                return upper_limit if upper_limit <= alpha_in else 0
+            value, best = self._expand(hands, leader, leader, trick, trick_mask, revealed, gone, key,
+                                       alpha_in, beta_in, best_move)
+            if value <= alpha_in:
+                upper = value
+            elif value >= beta_in:
+                lower = value
+            else:
+                lower = upper = value
+            self.table[table_key] = (lower, upper, best)
+            return value
+
+        player_id = (leader + num_played) % 4
+        return self._expand(hands, leader, player_id, trick, trick_mask, revealed, gone, key,
+                            alpha, beta, None)[0]
+
+    def _last_trick(self, hands, leader, remaining, revealed):
+        # One card each: the play is forced
+        led_card = lowest_card(hands[leader])
+        if not revealed:
+            led_suit_mask = SUIT_MASKS[led_card >> 3]
+            revealed = not (hands[0] & led_suit_mask and hands[1] & led_suit_mask
+                            and hands[2] & led_suit_mask and hands[3] & led_suit_mask)
+        winning_bit = CARD_BITS[trick_winning_card(remaining, led_card, self._trump, revealed)]
+        winner = 0
+        while not hands[winner] & winning_bit:
+            winner += 1
+        return mask_points(remaining) if winner % 2 == self._team else 0
+
+    def _expand(self, hands, leader, player_id, trick, trick_mask, revealed, gone, key, alpha, beta, first):
+        hand_mask = hands[player_id]
+        trump = self._trump
+        if trick:
+            led_suit = trick[0] >> 3
+            reveals = not revealed and not hand_mask & SUIT_MASKS[led_suit]
+        else:
+            led_suit = None
+            reveals = False
+        moves = equivalent_cards(legal_play_mask(hand_mask, led_suit, trump, revealed), gone)
+        candidates = mask_to_indices(moves)
+        if len(candidates) > 1:
+            candidates = self._order(candidates, player_id, leader, trick, trick_mask,
+                                     revealed or reveals, first)
+
+        maximizing = player_id % 2 == self._team
+        card_keys = self._card_keys[player_id]
+        best_value = -1 if maximizing else 29
+        best_card = candidates[0]
+        for card_index in candidates:
+            bit = CARD_BITS[card_index]
+            hands[player_id] = hand_mask ^ bit
+            trick.append(card_index)
+            value = self._search(hands, leader, trick, trick_mask | bit, revealed or reveals, gone,
+                                 key ^ card_keys[card_index], alpha, beta)
+            trick.pop()
+            if maximizing:
+                if value > best_value:
+                    best_value, best_card = value, card_index
+                    if value > alpha:
+                        alpha = value
+            elif value < best_value:
+                best_value, best_card = value, card_index
+                if value < beta:
+                    beta = value
+            if alpha >= beta:
+                break
+        hands[player_id] = hand_mask
+        return best_value, best_card
+
+    def _order(self, candidates, player_id, leader, trick, trick_mask, revealed, first):
+        if not trick:
+            # Lead high cards first, then by points
+            ordered = sorted(candidates, key=lambda c: (c & 7, -CARD_POINTS_BY_INDEX[c]))
+        else:
+            trump = self._trump
+            winning_card = trick_winning_card(trick_mask, trick[0], trump, revealed)
+            partner_winning = (leader + trick.index(winning_card)) % 2 == player_id % 2
+            if partner_winning:
+                # Feed points to the partner
+                ordered = sorted(candidates, key=lambda c: -CARD_POINTS_BY_INDEX[c])
+            else:
+                def priority(card_index):
+                    wins = trick_winning_card(trick_mask | CARD_BITS[card_index], trick[0], trump,
+                                              revealed) == card_index
+                    points = CARD_POINTS_BY_INDEX[card_index]
+                    return (0, -points) if wins else (1, points)
+                ordered = sorted(candidates, key=priority)
+        if first is not None and first in ordered:
+            ordered.remove(first)
+            ordered.insert(0, first)
+        return ordered
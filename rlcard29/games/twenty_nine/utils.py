@@ -6,6 +6,8 @@ Date: 2025-06-28
     
 # Utility functions for the 29 card game
 
+import numpy as np
+
 SUITS = ['S', 'H', 'D', 'C']  # Spades, Hearts, Diamonds, Clubs
 RANKS = ['J', '9', 'A', '10', 'K', 'Q', '8', '7']  # High to low
 CARD_POINTS = {'J': 3, '9': 2, 'A': 1, '10': 1, 'K': 0, 'Q': 0, '8': 0, '7': 0}
@@ -29,4 +31,8 @@ def get_card_points(card):
 
 def get_deck():
     """Return a list of all 32 cards as strings."""
-    return [s + r for s in SUITS for r in RANKS] 
\ No newline at end of file
+    return [s + r for s in SUITS for r in RANKS] 
+
+def worker_seed(seed, worker_id):
+    """Derive an independent seed for one parallel worker from a base seed."""
+    return int(np.random.SeedSequence(seed, spawn_key=(worker_id,)).generate_state(1)[0])
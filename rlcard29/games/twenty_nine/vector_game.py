@@ -0,0 +1,291 @@
+"""
+File: rlcard29/games/twenty_nine/vector_game.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import CARD_POINTS_BY_INDEX, NUM_CARDS
+from rlcard29.games.twenty_nine.dealer import shuffled_decks
+from rlcard29.games.twenty_nine.encoding import (
+    BID_ACTION_OFFSET, BID_OFFSET, LEGAL_OFFSET, NUM_ACTIONS, OBS_SIZE, PASS_ACTION, TRUMP_ACTION_OFFSET,
+)
+
+# Phase codes
+BIDDING, TRUMP_SELECTION, PLAY, END = 0, 1, 2, 3
+
+_ACTION_IDS = np.arange(NUM_ACTIONS)
+_CARD_SHIFTS = np.arange(NUM_CARDS, dtype=np.int64)
+_CARD_POINTS = np.array(CARD_POINTS_BY_INDEX, dtype=np.int64)
+_SUIT_MASKS = np.array([0xFF << (8 * s) for s in range(4)], dtype=np.int64)
+_NOT_ELIGIBLE = NUM_CARDS
+
+class VectorTwentyNineGame:
+    """
+    Lockstep engine for N independent 29 games (Bangladeshi variant).
+    Every game is a row of NumPy arrays (hands as card masks, bids, trump, trick slots,
+    phase codes) and one call to step() advances all of them. Rules match TwentyNineGame;
+    finished rounds are scored and a new round is dealt in place.
+    """
+    def __init__(self, num_games, seed=None, np_random=None):
+        self.num_games = num_games
+        self.num_players = 4
+        self.num_actions = NUM_ACTIONS
+        self.np_random = np_random if np_random is not None else np.random.RandomState(seed)
+
+        n = num_games
+        self.dealer_id = np.full(n, 3, dtype=np.int64) # Start with Player 3 as dealer
+        self.match_scores = np.zeros((n, 2), dtype=np.int64)
+        self.deck = np.zeros((n, NUM_CARDS), dtype=np.int64)
+        self.hands = np.zeros((n, 4), dtype=np.int64)
+        self.phase = np.full(n, END, dtype=np.int64)
+        self.current_player = np.zeros(n, dtype=np.int64)
+        self.bid_value = np.full(n, 15, dtype=np.int64)
+        self.bid_winner = np.full(n, -1, dtype=np.int64)
+        self.num_bid_actions = np.zeros(n, dtype=np.int64)
+        self.passes_since_bid = np.zeros(n, dtype=np.int64)
+        self.trump_suit = np.full(n, -1, dtype=np.int64)
+        self.trump_revealed = np.zeros(n, dtype=bool)
+        self.trick_cards = np.full((n, 4), -1, dtype=np.int64)
+        self.trick_size = np.zeros(n, dtype=np.int64)
+        self.trick_leader = np.zeros(n, dtype=np.int64)
+        self.tricks_played = np.zeros(n, dtype=np.int64)
+        self.team_points = np.zeros((n, 2), dtype=np.int64)
+        self.final_team_points = np.zeros((n, 2), dtype=np.int64) # Card points of the last finished round
+        self._legal_mask = np.zeros((n, NUM_ACTIONS), dtype=bool) # Legal mask of the current state
+
+    def reset(self):
+        """
+        Start a new round in every game.
+        Returns (obs, legal_mask, player_id) for the first decision of each game.
+        """
+        self._new_rounds(np.arange(self.num_games))
+        legal_mask = self._legal_mask = self.get_legal_mask()
+        return self.get_observations(legal_mask), legal_mask, self.current_player.copy()
+
+    def start_play(self, hands, trump_suit, bid_winner, bid_value, leader):
+        """
+        Put every game straight into the play phase, e.g. to roll out deals sampled elsewhere.
+        hands is an (N, 4) array of 8-card hand masks; the other arguments are scalars or (N,) arrays.
+        Returns (obs, legal_mask, player_id) like reset().
+        """
+        self.hands[:] = hands
+        self.phase[:] = PLAY
+        self.bid_winner[:] = bid_winner
+        self.bid_value[:] = bid_value
+        self.trump_suit[:] = trump_suit
+        self.trump_revealed[:] = False
+        self.trick_cards[:] = -1
+        self.trick_size[:] = 0
+        self.tricks_played[:] = 0
+        self.team_points[:] = 0
+        self.trick_leader[:] = leader
+        self.current_player[:] = leader
+        legal_mask = self._legal_mask = self.get_legal_mask()
+        return self.get_observations(legal_mask), legal_mask, self.current_player.copy()
+
+    def step(self, actions):
+        """
+        Apply one action id per game for its current player.
+
+        Returns:
+            obs (np.ndarray): (N, 128) observations of the next player of each game
+            legal_mask (np.ndarray): (N, 51) legal-action masks of the next player
+            player_id (np.ndarray): (N,) id of the next player
+            payoffs (np.ndarray): (N, 4) payoffs of rounds that finished on this step, else 0
+            done (np.ndarray): (N,) True where a round finished; those games were redealt
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        is_legal = self._legal_mask[np.arange(self.num_games), actions]
+        if not is_legal.all():
+            bad = np.flatnonzero(~is_legal)
+            raise ValueError(f"Illegal actions {actions[bad].tolist()} in games {bad.tolist()}")
+
+        phase = self.phase.copy()
+        bid_value = self.bid_value.copy()
+        for code, step_phase in ((BIDDING, self._step_bidding),
+                                 (TRUMP_SELECTION, self._step_trump_selection),
+                                 (PLAY, self._step_play)):
+            idx = np.flatnonzero(phase == code)
+            if idx.size:
+                step_phase(idx, actions[idx])
+
+        done = self.phase == END
+        payoffs = np.zeros((self.num_games, 4), dtype=np.int64)
+        finished = np.flatnonzero(done)
+        if finished.size:
+            payoffs[finished] = self._score_rounds(finished)
+            self.final_team_points[finished] = self.team_points[finished]
+            self._new_rounds(finished)
+        # A bidding mask only depends on the bid value, so passes (and four-pass redeals) keep it
+        changed = np.flatnonzero((self.phase != phase) | (self.bid_value != bid_value) | (self.phase == PLAY))
+        legal_mask = self._legal_mask.copy()
+        legal_mask[changed] = self._legal_rows(changed)
+        self._legal_mask = legal_mask
+        return (self.get_observations(legal_mask), legal_mask, self.current_player.copy(),
+                payoffs, done)
+
+    def _new_rounds(self, idx):
+        """Rotate the dealer, shuffle and deal the first 4 cards of each listed game."""
+        k = idx.size
+        self.dealer_id[idx] = (self.dealer_id[idx] + 1) % 4
+        self.deck[idx] = shuffled_decks(self.np_random, k)
+        self.hands[idx] = 0
+        self._deal(idx, NUM_CARDS)
+
+        self.phase[idx] = BIDDING
+        self.bid_value[idx] = 15
+        self.bid_winner[idx] = -1
+        self.num_bid_actions[idx] = 0
+        self.passes_since_bid[idx] = 0
+        self.trump_suit[idx] = -1
+        self.trump_revealed[idx] = False
+        self.trick_cards[idx] = -1
+        self.trick_size[idx] = 0
+        self.tricks_played[idx] = 0
+        self.team_points[idx] = 0
+        self.current_player[idx] = (self.dealer_id[idx] + 1) % 4
+        self.trick_leader[idx] = self.current_player[idx]
+
+    def _deal(self, idx, deck_top):
+        """Deal 4 cards to each player of the listed games, popping from deck[:deck_top] like Dealer."""
+        for p in range(4):
+            cols = deck_top - 1 - 4 * p - np.arange(4)
+            cards = self.deck[idx][:, cols]
+            self.hands[idx, p] |= np.bitwise_or.reduce(np.left_shift(1, cards), axis=1)
+
+    def _step_bidding(self, idx, actions):
+        is_pass = actions == PASS_ACTION
+        bids = ~is_pass
+        bid_idx = idx[bids]
+        self.bid_value[bid_idx] = actions[bids] - BID_ACTION_OFFSET
+        self.bid_winner[bid_idx] = self.current_player[bid_idx]
+        self.passes_since_bid[bid_idx] = 0
+        self.passes_since_bid[idx[is_pass]] += 1
+        self.num_bid_actions[idx] += 1
+
+        # All players passed: redeal for a new round
+        redeal = (self.num_bid_actions[idx] == 4) & (self.bid_winner[idx] < 0)
+        finished = (self.passes_since_bid[idx] == 3) & (self.bid_winner[idx] >= 0)
+        ongoing = idx[~redeal & ~finished]
+        self.current_player[ongoing] = (self.current_player[ongoing] + 1) % 4
+
+        won = idx[finished]
+        self.phase[won] = TRUMP_SELECTION
+        self.current_player[won] = self.bid_winner[won]
+        if redeal.any():
+            self._new_rounds(idx[redeal])
+
+    def _step_trump_selection(self, idx, actions):
+        self.trump_suit[idx] = actions - TRUMP_ACTION_OFFSET
+        self._deal(idx, NUM_CARDS // 2) # Deal remaining cards
+        self.phase[idx] = PLAY
+        self.current_player[idx] = self.trick_leader[idx]
+
+    def _step_play(self, idx, actions):
+        players = self.current_player[idx]
+        hands = self.hands[idx, players]
+        sizes = self.trick_size[idx]
+
+        # A player who cannot follow the led suit reveals the trump
+        led_cards = self.trick_cards[idx, 0]
+        following = sizes > 0
+        led_mask = _SUIT_MASKS[np.where(following, led_cards, 0) >> 3]
+        reveal = following & ~self.trump_revealed[idx] & ((hands & led_mask) == 0)
+        self.trump_revealed[idx[reveal]] = True
+
+        self.hands[idx, players] = hands & ~np.left_shift(1, actions)
+        self.trick_cards[idx, sizes] = actions
+        self.trick_size[idx] = sizes + 1
+
+        complete = sizes == 3
+        self.current_player[idx[~complete]] = (players[~complete] + 1) % 4
+        if complete.any():
+            self._resolve_tricks(idx[complete])
+
+    def _resolve_tricks(self, idx):
+        cards = self.trick_cards[idx]
+        suits = cards >> 3
+        led_suits = suits[:, 0]
+        trumps = self.trump_suit[idx]
+        revealed = self.trump_revealed[idx]
+
+        # Once revealed the highest trump wins, otherwise the highest card of the led suit;
+        # an unrevealed trump lead cannot be beaten (same rule as TwentyNineGame)
+        is_trump = suits == trumps[:, None]
+        trumped = revealed & is_trump.any(axis=1)
+        eligible = np.where(trumped[:, None], is_trump, suits == led_suits[:, None])
+        leader_keeps = ~revealed & (led_suits == trumps)
+        eligible[leader_keeps, 1:] = False
+        slot = np.argmin(np.where(eligible, cards, _NOT_ELIGIBLE), axis=1)
+
+        winners = (self.trick_leader[idx] + slot) % 4
+        points = _CARD_POINTS[cards].sum(axis=1)
+        self.team_points[idx, winners % 2] += points
+        self.trick_cards[idx] = -1
+        self.trick_size[idx] = 0
+        self.trick_leader[idx] = winners
+        self.current_player[idx] = winners
+        self.tricks_played[idx] += 1
+        self.phase[idx[self.tricks_played[idx] == 8]] = END
+
+    def _score_rounds(self, idx):
+        """Update match scores of the listed finished games and return their (k, 4) payoffs."""
+        bidding_team = self.bid_winner[idx] % 2
+        rows = np.arange(idx.size)
+        successful = self.team_points[idx][rows, bidding_team] >= self.bid_value[idx]
+        sign = np.where(successful, 1, -1)
+        self.match_scores[idx, bidding_team] += sign
+        seat_team = np.arange(4)[None, :] % 2
+        return np.where(seat_team == bidding_team[:, None], sign[:, None], -sign[:, None])
+
+    def get_legal_mask(self):
+        """Return the (N, 51) legal-action masks of the current players."""
+        return self._legal_rows(np.arange(self.num_games))
+
+    def _legal_rows(self, idx):
+        """Legal-action masks of the listed games."""
+        mask = np.zeros((idx.size, NUM_ACTIONS), dtype=bool)
+        phase = self.phase[idx]
+
+        bidding = phase == BIDDING
+        min_bid_action = self.bid_value[idx] + 1 + BID_ACTION_OFFSET
+        mask[bidding] = ((_ACTION_IDS >= min_bid_action[bidding, None]) & (_ACTION_IDS < PASS_ACTION)) \
+            | (_ACTION_IDS == PASS_ACTION)
+        mask[phase == TRUMP_SELECTION, TRUMP_ACTION_OFFSET:] = True
+
+        play = np.flatnonzero(phase == PLAY)
+        if play.size:
+            mask[play, :NUM_CARDS] = self._card_bits(self._legal_card_masks(idx[play]))
+        return mask
+
+    def _legal_card_masks(self, idx):
+        hands = self.hands[idx, self.current_player[idx]]
+        following = self.trick_size[idx] > 0
+        led_mask = np.where(following, _SUIT_MASKS[np.maximum(self.trick_cards[idx, 0], 0) >> 3], 0)
+        follow = hands & led_mask
+        trump_mask = np.where(self.trump_revealed[idx], _SUIT_MASKS[np.maximum(self.trump_suit[idx], 0)], 0)
+        trumps = hands & trump_mask
+        return np.where(~following, hands,
+                        np.where(follow != 0, follow, np.where(trumps != 0, trumps, hands)))
+
+    @staticmethod
+    def _card_bits(masks):
+        return ((masks[:, None] >> _CARD_SHIFTS) & 1).astype(bool)
+
+    def get_observations(self, legal_mask=None):
+        """Return the (N, 128) observations of the current players, laid out like TwentyNineEnv."""
+        if legal_mask is None:
+            legal_mask = self.get_legal_mask()
+        obs = np.zeros((self.num_games, OBS_SIZE), dtype=np.int64)
+        hands = self.hands[np.arange(self.num_games), self.current_player]
+        obs[:, :NUM_CARDS] = self._card_bits(hands)
+        obs[:, LEGAL_OFFSET:BID_OFFSET] = legal_mask
+        obs[:, BID_OFFSET] = self.bid_value
+        return obs
+
+    def get_num_players(self):
+        return self.num_players
+
+    def get_num_actions(self):
+        return self.num_actions
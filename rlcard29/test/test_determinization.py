@@ -0,0 +1,113 @@
+"""
+File: rlcard29/test/test_determinization.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# DeterminizationSampler deals must agree with everything the observer has seen (own hand,
+# cards played, voids shown by not following suit) and be uniform over the consistent deals.
+
+from itertools import combinations
+import numpy as np
+from rlcard29.games.twenty_nine.bitboard import CARD_INDEX, FULL_MASK, SUIT_INDEX, SUIT_MASKS
+from rlcard29.games.twenty_nine.determinization import DeterminizationSampler
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+
+def _play_positions(num_positions, seed, min_cards_left=0, max_cards_left=32):
+    """Random rounds stopped somewhere in the play phase, with min..max cards still in hand."""
+    rng = np.random.RandomState(seed)
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(seed))
+    positions = 0
+    while positions < num_positions:
+        game.init_game()
+        cards_left = rng.randint(min_cards_left, max_cards_left + 1)
+        while not game.is_over() and (game.phase != 'play' or bin(game.played_mask).count('1') < 32 - cards_left):
+            game.apply(ACTION_LIST[rng.choice(game.get_legal_action_ids())])
+        if game.phase == 'play':
+            positions += 1
+            yield game
+
+def _voids(game):
+    """Suits each seat has shown void in, worked out from the round's tricks."""
+    voids = [0] * 4
+    revealed = False
+    trump = SUIT_INDEX[game.trump_suit]
+    tricks = [trick for trick, _, _ in game.trick_history] + [game.trick]
+    for trick in tricks:
+        if not trick:
+            continue
+        led_suit = CARD_INDEX[trick[0][1]] >> 3
+        for player_id, card in trick[1:]:
+            suit = CARD_INDEX[card] >> 3
+            if suit != led_suit:
+                voids[player_id] |= 1 << led_suit
+                # After the reveal a seat that cannot follow must trump if it can
+                if revealed and suit != trump:
+                    voids[player_id] |= 1 << trump
+                revealed = True
+    return voids
+
+def _suit_bits(hand_mask):
+    return sum(1 << s for s in range(4) if hand_mask & SUIT_MASKS[s])
+
+def test_samples_agree_with_observations():
+    for game in _play_positions(200, seed=0):
+        observer = game.current_player
+        sampler = DeterminizationSampler.from_game(game, observer, np.random.RandomState(0))
+        hands, trumps = sampler.sample(100)
+        voids = _voids(game)
+        true_hands = [player.hand_mask for player in game.players]
+        # The real deal is one of the consistent ones
+        assert all(_suit_bits(true_hands[p]) & voids[p] == 0 for p in range(4))
+        for row, trump in zip(hands.tolist(), trumps.tolist()):
+            assert row[observer] == true_hands[observer]
+            union = 0
+            for player_id, hand_mask in enumerate(row):
+                assert hand_mask & game.played_mask == 0
+                assert hand_mask & union == 0
+                assert bin(hand_mask).count('1') == bin(true_hands[player_id]).count('1')
+                assert _suit_bits(hand_mask) & voids[player_id] == 0
+                union |= hand_mask
+            assert union | game.played_mask == FULL_MASK
+            if game.trump_revealed or observer == game.bid_winner:
+                assert trump == game.trump_index
+
+def _consistent_deals(game, observer, voids):
+    """Every assignment of the observer's unseen cards that respects the counts and voids."""
+    unknown = [c for c in range(32) if (FULL_MASK & ~game.played_mask & ~game.players[observer].hand_mask) >> c & 1]
+    seats = [p for p in range(4) if p != observer]
+    needs = [bin(game.players[p].hand_mask).count('1') for p in seats]
+
+    def assign(cards, i):
+        if i == len(seats):
+            yield ()
+            return
+        for chosen in combinations(cards, needs[i]):
+            hand_mask = sum(1 << c for c in chosen)
+            if _suit_bits(hand_mask) & voids[seats[i]]:
+                continue
+            rest = [c for c in cards if not hand_mask >> c & 1]
+            for tail in assign(rest, i + 1):
+                yield ((seats[i], hand_mask),) + tail
+    return list(assign(unknown, 0))
+
+def test_samples_are_uniform_over_consistent_deals():
+    num_samples = 20000
+    for game in _play_positions(5, seed=1, min_cards_left=8, max_cards_left=12):
+        observer = game.current_player
+        deals = _consistent_deals(game, observer, _voids(game))
+        # Exact probability that each seat holds each card
+        expected = np.zeros((4, 32))
+        for deal in deals:
+            for player_id, hand_mask in deal:
+                for card_index in range(32):
+                    expected[player_id, card_index] += hand_mask >> card_index & 1
+        expected /= len(deals)
+
+        sampler = DeterminizationSampler.from_game(game, observer, np.random.RandomState(1))
+        hands, _ = sampler.sample(num_samples)
+        observed = ((hands[:, :, None] >> np.arange(32)) & 1).mean(axis=0)
+        observed[observer] = 0
+        assert np.abs(observed - expected).max() < 0.02
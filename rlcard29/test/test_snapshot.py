@@ -0,0 +1,80 @@
+"""
+File: rlcard29/test/test_snapshot.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# TwentyNineGame.restore(snapshot()) must reproduce the game exactly, and clone() must not
+# share the deal stream of the game it was cloned from. Round summaries are handed out as copies.
+
+import copy
+import numpy as np
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, PASS_ACTION, ObservationEncoder
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+
+def _random_action(game, rng):
+    action_ids = game.get_legal_action_ids()
+    if PASS_ACTION in action_ids and rng.random_sample() < 0.6:
+        return ACTION_LIST[PASS_ACTION]
+    return ACTION_LIST[rng.choice(action_ids)]
+
+def _assert_same(game, other, encoder):
+    assert other.snapshot() == game.snapshot()
+    assert other.get_legal_action_mask() == game.get_legal_action_mask()
+    assert other.get_round_summary() == game.get_round_summary()
+    for player_id in range(game.num_players):
+        assert other.infoset_key(player_id) == game.infoset_key(player_id)
+        obs, _, _ = encoder.encode(game.get_state(player_id))
+        other_obs, _, _ = encoder.encode(other.get_state(player_id))
+        assert (other_obs == obs).all()
+
+def test_restore_reproduces_game():
+    rng = np.random.RandomState(0)
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(0))
+    encoder = ObservationEncoder()
+    for _ in range(100):
+        game.init_game()
+        restore_at = rng.randint(40)
+        steps = 0
+        restored = None
+        while not game.is_over():
+            if steps == restore_at:
+                restored = TwentyNineGame(event_log=NullEventLog(), np_random=copy.deepcopy(game.np_random))
+                restored.restore(game.snapshot())
+                _assert_same(game, restored, encoder)
+            action = _random_action(game, rng)
+            game.apply(action)
+            if restored is not None:
+                restored.apply(action)
+                _assert_same(game, restored, encoder)
+            steps += 1
+        if restored is not None:
+            assert restored.get_payoffs() == game.get_payoffs()
+            assert restored.trick_history == game.trick_history
+
+def test_clone_has_its_own_generator():
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(0))
+    game.init_game()
+    clone = game.clone()
+    assert clone.np_random is not game.np_random
+    assert clone.snapshot() == game.snapshot()
+
+    # Four passes redeal the clone; the game's next deal must not move
+    expected = copy.deepcopy(game.np_random).permutation(32).tolist()
+    for _ in range(4):
+        clone.apply('pass')
+    assert clone.snapshot() != game.snapshot()
+    assert game.np_random.permutation(32).tolist() == expected
+
+def test_round_summary_is_a_copy():
+    game = TwentyNineGame(event_log=NullEventLog(), np_random=np.random.RandomState(0))
+    game.init_game()
+    rng = np.random.RandomState(0)
+    while not game.is_over():
+        game.apply(_random_action(game, rng))
+    summary = game.get_round_summary()
+    expected = copy.deepcopy(summary)
+    summary['bid_successful'] = not summary['bid_successful']
+    summary['team_points'][0] += 1
+    assert game.get_round_summary() == expected
@@ -0,0 +1,59 @@
+"""
+File: rlcard29/test/test_solver.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# DoubleDummySolver (transposition table, MTD(f), equivalent-card pruning) must agree with
+# plain minimax over TwentyNineGame itself on small endgames.
+
+import numpy as np
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+from rlcard29.games.twenty_nine.solver import DoubleDummySolver
+
+def _minimax(game, team):
+    """Card points the team ends with under best play, by trying every legal card."""
+    if game.is_over():
+        return game.team_points[team]
+    maximizing = game.current_player % 2 == team
+    best = None
+    for action_id in game.get_legal_action_ids():
+        game.apply(ACTION_LIST[action_id])
+        value = _minimax(game, team)
+        game.step_back()
+        if best is None or (value > best if maximizing else value < best):
+            best = value
+    return best
+
+def _endgames(num_positions, seed, unrevealed_only=False):
+    """Random rounds played until 8 to 12 cards (2 to 3 tricks) are left."""
+    rng = np.random.RandomState(seed)
+    game = TwentyNineGame(allow_step_back=True, event_log=NullEventLog(), np_random=np.random.RandomState(seed))
+    positions = 0
+    while positions < num_positions:
+        game.init_game()
+        cards_left = rng.randint(8, 13)
+        while not game.is_over() and (game.phase != 'play' or bin(game.played_mask).count('1') < 32 - cards_left):
+            action_ids = game.get_legal_action_ids()
+            game.apply(ACTION_LIST[rng.choice(action_ids)])
+        if game.phase == 'play' and not (unrevealed_only and game.trump_revealed):
+            positions += 1
+            yield game
+
+def test_solver_matches_minimax():
+    # One solver for every position, so table entries of earlier positions are in play
+    solver = DoubleDummySolver()
+    for game in _endgames(150, seed=0):
+        assert solver.solve_game(game) == _minimax(game, game.bid_winner % 2)
+
+def test_fresh_solver_matches_minimax():
+    for game in _endgames(50, seed=1):
+        assert DoubleDummySolver().solve_game(game) == _minimax(game, game.bid_winner % 2)
+
+def test_solver_matches_minimax_before_reveal():
+    # Rare in random play: the trump is still hidden with three tricks or fewer to go
+    solver = DoubleDummySolver()
+    for game in _endgames(20, seed=2, unrevealed_only=True):
+        assert solver.solve_game(game) == _minimax(game, game.bid_winner % 2)
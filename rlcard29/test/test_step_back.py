@@ -0,0 +1,53 @@
+"""
+File: rlcard29/test/test_step_back.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# TwentyNineGame.step_back must undo a whole round: stepping back from the end to the first
+# decision has to restore snapshot(), the observation and the infoset key of every step.
+
+import numpy as np
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, PASS_ACTION, ObservationEncoder
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+
+def _view(game, encoder):
+    obs, _, _ = encoder.encode(game.get_state(game.current_player))
+    return game.snapshot(), obs, game.infoset_key()
+
+def test_step_back_round_trip():
+    rng = np.random.RandomState(0)
+    game = TwentyNineGame(allow_step_back=True, event_log=NullEventLog(), np_random=np.random.RandomState(0))
+    encoder = ObservationEncoder()
+    redeals = 0
+    for _ in range(100):
+        game.init_game()
+        history = []
+        while not game.is_over():
+            history.append(_view(game, encoder))
+            action_ids = game.get_legal_action_ids()
+            # Pass often so that some rounds are redealt after four passes
+            if PASS_ACTION in action_ids and rng.random_sample() < 0.6:
+                action_id = PASS_ACTION
+            else:
+                action_id = rng.choice(action_ids)
+            if action_id == PASS_ACTION and len(game.bid_history) == 3 and game.bid_winner is None:
+                redeals += 1
+            game.apply(ACTION_LIST[action_id])
+        end_view = _view(game, encoder)
+        match_scores = list(game.match_scores)
+
+        # Back across every trick resolution, the second 4+4 deal and any redeal
+        for snapshot, obs, key in reversed(history):
+            assert game.step_back()
+            now_snapshot, now_obs, now_key = _view(game, encoder)
+            assert now_snapshot == snapshot
+            assert (now_obs == obs).all()
+            assert now_key == key
+        assert not game.step_back()
+
+        # Return to the end of the round before dealing the next one
+        game.restore(end_view[0])
+        assert game.match_scores == match_scores
+    assert redeals > 0
@@ -0,0 +1,85 @@
+"""
+File: rlcard29/test/test_twenty_nine_env.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+import copy
+import numpy as np
+import pytest
+from rlcard29.envs.twenty_nine import TwentyNineEnv
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, PASS_ACTION, action_mask_to_ids
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+
+OPPONENTS = {1: 'random', 2: 'random', 3: 'random'}
+
+def _deals(env, learner_rng, num_rounds):
+    decks = []
+    for _ in range(num_rounds):
+        state, _ = env.reset()
+        decks.append(env.game.dealer.deck)
+        while not env.is_over():
+            action_ids = list(state['legal_actions'])
+            # Always pass, so bidding (and with it the number of redeals) does not depend on the learner
+            action = PASS_ACTION if PASS_ACTION in action_ids else learner_rng.choice(action_ids)
+            state, _ = env.step(action)
+    return decks
+
+def test_learner_play_does_not_change_deals():
+    config = {'seed': 3, 'game_log_mode': 'off', 'fixed_policies': OPPONENTS}
+    first = _deals(TwentyNineEnv(dict(config)), np.random.RandomState(0), 50)
+    second = _deals(TwentyNineEnv(dict(config)), np.random.RandomState(1), 50)
+    assert first == second
+
+def _passing_policy(game, np_random):
+    """Random play that passes often, so that some rounds are redealt after four passes."""
+    action_ids = action_mask_to_ids(game.get_legal_action_mask())
+    if PASS_ACTION in action_ids and np_random.random_sample() < 0.7:
+        return PASS_ACTION
+    return action_ids[np_random.randint(len(action_ids))]
+
+def _match_env(seed, allow_step_back=False):
+    return TwentyNineEnv({'seed': seed, 'game_log_mode': 'off', 'episode': 'match',
+                          'allow_step_back': allow_step_back,
+                          'fixed_policies': {seat: _passing_policy for seat in range(4)}})
+
+def test_match_episode_matches_manual_loop():
+    total_redeals = 0
+    for seed in range(10):
+        env = _match_env(seed)
+        game = TwentyNineGame(event_log=NullEventLog(), np_random=copy.deepcopy(env.game.np_random))
+        policy_rng = copy.deepcopy(env.policy_rng)
+        env.reset()
+
+        # The same match played by hand: one init_game per round until get_match_winner() decides
+        game.init_match()
+        num_rounds = 0
+        while game.get_match_winner() is None:
+            game.init_game()
+            while not game.is_over():
+                action_id = _passing_policy(game, policy_rng)
+                if action_id == PASS_ACTION and len(game.bid_history) == 3 and game.bid_winner is None:
+                    total_redeals += 1
+                game.apply(ACTION_LIST[action_id])
+            num_rounds += 1
+
+        assert env.is_over()
+        assert env.num_rounds == num_rounds
+        assert env.game.snapshot() == game.snapshot()
+        winner = game.get_match_winner()
+        assert env.get_payoffs() == [1 if player_id % 2 == winner else -1 for player_id in range(4)]
+    assert total_redeals > 0
+
+def test_match_step_back_stops_loudly_at_round_start():
+    env = _match_env(0, allow_step_back=True)
+    env.reset()
+    num_rounds = env.num_rounds
+    assert num_rounds > 1
+    # Undoing the last card reopens the final round
+    assert env.step_back() is not False
+    assert env.num_rounds == num_rounds - 1
+    while env.game._journal:
+        env.step_back()
+    with pytest.raises(RuntimeError):
+        env.step_back()
@@ -0,0 +1,71 @@
+"""
+File: rlcard29/test/test_vector_game.py
+Author: Arnob Das
+Date: 2026-10-18
+"""
+
+# VectorTwentyNineGame must follow the rules of TwentyNineGame: both engines are fed the same
+# decks and the same random actions, and every legal mask, current player and payoff must agree.
+
+import numpy as np
+from rlcard29.games.twenty_nine.encoding import ACTION_LIST, NUM_ACTIONS, PASS_ACTION
+from rlcard29.games.twenty_nine.events import NullEventLog
+from rlcard29.games.twenty_nine.game import TwentyNineGame
+from rlcard29.games.twenty_nine.vector_game import VectorTwentyNineGame
+
+class _VectorDeck:
+    """Stands in for a Dealer generator: every shuffle deals the deck row the vector game dealt last."""
+    def __init__(self, vector_game, game_id):
+        self.vector_game = vector_game
+        self.game_id = game_id
+
+    def permutation(self, num_cards):
+        return self.vector_game.deck[self.game_id].copy()
+
+def _mask_bits(mask):
+    return np.array([(mask >> action_id) & 1 for action_id in range(NUM_ACTIONS)], dtype=bool)
+
+def _run_lockstep(num_games, num_rounds, seed):
+    vector = VectorTwentyNineGame(num_games, seed=seed)
+    games = [TwentyNineGame(event_log=NullEventLog(), np_random=_VectorDeck(vector, i)) for i in range(num_games)]
+    _, legal_mask, player_id = vector.reset()
+    for game in games:
+        game.init_game()
+    rng = np.random.RandomState(seed)
+    rounds = redeals = 0
+    while rounds < num_rounds:
+        for i, game in enumerate(games):
+            assert game.current_player == player_id[i]
+            assert (_mask_bits(game.get_legal_action_mask()) == legal_mask[i]).all()
+        # Pass often so that four-pass redeals come up
+        actions = np.array([PASS_ACTION if mask[PASS_ACTION] and rng.random_sample() < 0.6
+                            else rng.choice(np.flatnonzero(mask)) for mask in legal_mask])
+        for i, game in enumerate(games):
+            if actions[i] == PASS_ACTION and len(game.bid_history) == 3 and game.bid_winner is None:
+                redeals += 1
+        _, legal_mask, player_id, payoffs, done = vector.step(actions)
+        for i, game in enumerate(games):
+            game.apply(ACTION_LIST[actions[i]])
+            assert game.is_over() == done[i]
+            if done[i]:
+                assert game.get_payoffs() == payoffs[i].tolist()
+                assert game.match_scores == vector.match_scores[i].tolist()
+                assert game.team_points == vector.final_team_points[i].tolist()
+                game.init_game()
+                rounds += 1
+    return redeals
+
+def test_matches_scalar_game():
+    assert _run_lockstep(num_games=1, num_rounds=300, seed=0) > 0
+
+def test_lockstep_batch_matches_scalar_games():
+    assert _run_lockstep(num_games=8, num_rounds=300, seed=1) > 0
+
+def test_illegal_action_raises():
+    vector = VectorTwentyNineGame(2, seed=0)
+    vector.reset()
+    try:
+        vector.step([PASS_ACTION, 0])
+    except ValueError:
+        return
+    raise AssertionError("illegal card during bidding was accepted")
@@ -3,21 +3,35 @@ File: rlcard29/trainer/cfr_agent_trainer_twenty_nine/run_twenty_nine_cfr.py
 Author: Arnob Das
 Date: 2025-06-28
 """
-    
+
+import os
+import rlcard
 import rlcard29
 from rlcard.agents.random_agent import RandomAgent
-from rlcard29.envs.twenty_nine import TwentyNineEnv
-from rlcard.envs.registration import register
-register('twenty_nine', TwentyNineEnv)
-
-from rlcard.agents.cfr_agent import CFRAgent
+from rlcard29.agents.mccfr_agent_twenty_nine.mccfr_agent import MCCFRTrainer, MCCFRAgent
 
 if __name__ == '__main__':
-    env = rlcard29.make('twenty_nine')
-    agents = [CFRAgent(env)] + [RandomAgent(num_actions=env.num_actions) for _ in range(3)]
-    env.set_agents(agents)
-    for episode in range(1, 10001):
-        trajectories, payoffs = env.run(is_training=True)
-        if episode % 100 == 0:
-            print(f"Episode {episode}: Payoff={payoffs[0]}")
-    print('Training finished.') 
\ No newline at end of file
+    save_dir = "rlcard29/models/mccfr_model_twenty_nine"
+    num_workers = os.cpu_count() or 1
+
+    # External-sampling MCCFR over bidding and trump selection, resumed from the last checkpoint
+    trainer = MCCFRTrainer(seed=42)
+    if os.path.exists(os.path.join(save_dir, 'meta.json')):
+        trainer.load(save_dir)
+    trainer.train(1000000, num_workers=num_workers, epoch_iterations=20000, checkpoint_dir=save_dir,
+                  verbose=True)
+
+    env = rlcard.make('twenty_nine', config={'game_log_mode': 'off'})
+    cfr_agent = MCCFRAgent(env.num_actions, save_dir)
+    random_agent = RandomAgent(num_actions=env.num_actions)
+    env.set_agents([cfr_agent, random_agent, cfr_agent, random_agent])
+    total = 0
+    for episode in range(1, 1001):
+        env.reset()
+        while not env.is_over():
+            player_id = env.get_player_id()
+            action, _ = env.agents[player_id].eval_step(env.get_state(player_id))
+            env.step(action)
+        total += env.get_payoffs()[0]
+    print(f"Average payoff vs random over 1000 rounds: {total / 1000}")
+    print('Training finished.')
@@ -13,6 +13,7 @@ from datetime import datetime
 import torch
 import numpy as np
 import rlcard29
+from rlcard29.games.twenty_nine.encoding import ENCODING_VERSION
 
 class Logger:
     def __init__(self, log_dir, file_name):
@@ -45,8 +46,11 @@ if __name__ == '__main__':
     device = get_device()
     print(f"Using device: {device}")
 
-    env = rlcard.make('twenty_nine')
-    eval_env = rlcard.make('twenty_nine')
+    # Seats 1-3 and the DQN agent's forced moves are played inside the env,
+    # so the loop below only sees the DQN agent's real decisions
+    env = rlcard.make('twenty_nine', config={'game_log_mode': 'off', 'auto_forced_moves': True,
+                                             'fixed_policies': {1: 'random', 2: 'random', 3: 'random'}})
+    eval_env = rlcard.make('twenty_nine', config={'game_log_mode': 'off'})
 
     hidden_layers = [128,128,128,128,128]
 
@@ -58,7 +62,6 @@ if __name__ == '__main__':
         device=device
     )
     random_agent = RandomAgent(num_actions=env.action_num)
-    env.set_agents([dqn_agent, random_agent, random_agent, random_agent])
     eval_env.set_agents([dqn_agent, random_agent, random_agent, random_agent])
 
     print_header("DQN Training on 29 (5 layers, 100 episodes)")
@@ -70,18 +73,15 @@ if __name__ == '__main__':
         state, player_id = env.reset()
         
         while True:
-            action = env.agents[player_id].step(state)
-            next_state, next_player_id = env.step(action)
+            action = dqn_agent.step(state)
+            next_state, player_id = env.step(action)
             done = env.is_over()
             
-            # Reorganize the trajectory for the DQN agent
-            if player_id == 0 :# If it was the DQN agent's turn
-                reward = env.get_payoffs()[player_id]
-                transition = (state, action, reward, next_state, done)
-                dqn_agent.feed(transition)
+            # next_state is the DQN agent's next decision (or the end of the round); the payoff is the only reward
+            reward = env.get_payoffs()[0] if done else 0
+            dqn_agent.feed((state, action, reward, next_state, done))
 
             state = next_state
-            player_id = next_player_id
 
             if done:
                 break
@@ -94,5 +94,7 @@ if __name__ == '__main__':
 
     # Save the trained model
     os.makedirs(save_dir, exist_ok=True)
-    dqn_agent.save_checkpoint(save_dir)
+    checkpoint = dqn_agent.checkpoint_attributes()
+    checkpoint['encoding_version'] = ENCODING_VERSION # Loaders refuse checkpoints of another observation layout
+    torch.save(checkpoint, os.path.join(save_dir, 'checkpoint_dqn.pt'))
     print(f"Model saved to {save_dir}") 
\ No newline at end of file
@@ -8,6 +8,7 @@ import torch
 import numpy as np
 import matplotlib.pyplot as plt
 import rlcard29
+from rlcard29.games.twenty_nine.encoding import ENCODING_VERSION
 
 class Logger:
     def __init__(self, log_dir, file_name):
@@ -155,5 +156,7 @@ if __name__ == '__main__':
 
     # Save the trained model
     os.makedirs(save_dir, exist_ok=True)
-    dqn_agent.save_checkpoint(save_dir)
+    checkpoint = dqn_agent.checkpoint_attributes()
+    checkpoint['encoding_version'] = ENCODING_VERSION # Loaders refuse checkpoints of another observation layout
+    torch.save(checkpoint, os.path.join(save_dir, 'checkpoint_dqn.pt'))
     print(f"Model saved to {save_dir}")
\ No newline at end of file